@@ -2,51 +2,45 @@ import random
 from bots.strategy_base import (
     RangeBot,
     normalize_hand_key,
+    evaluate_hand,
+)
+from bots.utils.preflop import (
+    range_bits,
+    in_range,
     pair_range,
     suited_plus,
     offsuit_plus,
     suited_range,
-    evaluate_hand,
+    PREMIUM,
+    BUTTON_FLAT,
 )
 
-BUTTON_OPEN_RANGE = set()
-BUTTON_OPEN_RANGE |= pair_range("2")
-BUTTON_OPEN_RANGE |= suited_plus("A", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("A", "5")
-BUTTON_OPEN_RANGE |= suited_plus("K", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("K", "8")
-BUTTON_OPEN_RANGE |= suited_plus("Q", "5")
-BUTTON_OPEN_RANGE |= offsuit_plus("Q", "8")
-BUTTON_OPEN_RANGE |= suited_plus("J", "6")
-BUTTON_OPEN_RANGE |= offsuit_plus("J", "8")
-BUTTON_OPEN_RANGE |= suited_plus("T", "6")
-BUTTON_OPEN_RANGE |= offsuit_plus("T", "8")
-BUTTON_OPEN_RANGE |= suited_range("9", "5", "5")
-BUTTON_OPEN_RANGE |= suited_range("8", "5", "5")
-BUTTON_OPEN_RANGE |= suited_range("7", "4", "4")
-BUTTON_OPEN_RANGE |= suited_range("6", "4", "4")
-
-AGGRO_3BET_VALUE = set()
-AGGRO_3BET_VALUE |= pair_range("J")
-AGGRO_3BET_VALUE |= {"AQs", "AQo", "AKs", "AKo"}
-
-AGGRO_3BET_BLUFF = {
+# Ranges are class bitsets (see bots/utils/preflop.py)
+BUTTON_OPEN_RANGE = range_bits(
+    pair_range("2"),
+    suited_plus("A", "2"), offsuit_plus("A", "5"),
+    suited_plus("K", "2"), offsuit_plus("K", "8"),
+    suited_plus("Q", "5"), offsuit_plus("Q", "8"),
+    suited_plus("J", "6"), offsuit_plus("J", "8"),
+    suited_plus("T", "6"), offsuit_plus("T", "8"),
+    suited_range("9", "5", "5"), suited_range("8", "5", "5"),
+    suited_range("7", "4", "4"), suited_range("6", "4", "4"),
+)
+
+AGGRO_3BET_VALUE = range_bits(pair_range("J"), {"AQs", "AQo", "AKs", "AKo"})
+
+AGGRO_3BET_BLUFF = range_bits({
     "A5s", "A4s", "A3s", "A2s",
     "K9s", "K8s", "K7s",
     "Q9s", "Q8s",
     "J9s", "J8s",
     "T9s", "T8s",
     "98s", "87s", "76s", "65s",
-}
+})
 
-AGGRO_4BET_VALUE = {"QQ", "KK", "AA", "AKs", "AKo"}
-AGGRO_4BET_BLUFF = {"ATo", "A9s", "A8s", "A7s", "A6s"}
-AGGRO_FLAT_RANGE = {
-    "JJ", "TT", "99", "88",
-    "AQs", "AQo", "AJs", "AJo", "ATs",
-    "KQs", "KQo", "KJs", "KJo", "KTs",
-    "QJs", "QTs", "JTs",
-}
+AGGRO_4BET_VALUE = PREMIUM
+AGGRO_4BET_BLUFF = range_bits({"ATo", "A9s", "A8s", "A7s", "A6s"})
+AGGRO_FLAT_RANGE = BUTTON_FLAT
 
 
 class Bot(RangeBot):
@@ -68,16 +62,16 @@ class Bot(RangeBot):
         raises = context["raises"]
 
         if context["facing_4bet"]:
-            if hand_key in AGGRO_4BET_VALUE:
+            if in_range(AGGRO_4BET_VALUE, hole_card):
                 if self._call_amount(valid_actions) > 0:
                     return self._call(valid_actions)
                 return self._raise_amount(valid_actions, prefer_max=True)
             return self._fold(valid_actions)
 
         if context["facing_3bet"] and is_button:
-            if hand_key in AGGRO_4BET_VALUE or hand_key in AGGRO_4BET_BLUFF:
+            if in_range(AGGRO_4BET_VALUE, hole_card) or in_range(AGGRO_4BET_BLUFF, hole_card):
                 return self._raise_amount(valid_actions)
-            if hand_key in AGGRO_FLAT_RANGE:
+            if in_range(AGGRO_FLAT_RANGE, hole_card):
                 return self._call(valid_actions)
             return self._fold(valid_actions)
 
@@ -85,14 +79,14 @@ class Bot(RangeBot):
             raiser_uuid = raises[-1].get("uuid") if raises else None
             raiser_index = self._seat_index(seats, raiser_uuid)
             if raiser_index == dealer_btn:
-                if hand_key in AGGRO_3BET_VALUE or hand_key in AGGRO_3BET_BLUFF:
+                if in_range(AGGRO_3BET_VALUE, hole_card) or in_range(AGGRO_3BET_BLUFF, hole_card):
                     return self._raise_amount(valid_actions)
-                if hand_key in AGGRO_FLAT_RANGE:
+                if in_range(AGGRO_FLAT_RANGE, hole_card):
                     return self._call(valid_actions)
                 return self._fold(valid_actions)
 
         if context["unopened"] and is_button:
-            if hand_key in BUTTON_OPEN_RANGE:
+            if in_range(BUTTON_OPEN_RANGE, hole_card):
                 return self._raise_amount(valid_actions)
             return self._fold(valid_actions)
 
@@ -1,21 +1,63 @@
 from pypokerengine.players import BasePokerPlayer
 from typing import final
+import numpy as np
 import pandas as pd
+from bots.utils.action_stats import ActionStats
+
+# Columns of game_history_df, in the order they have always appeared
+HISTORY_COLUMNS = [
+    "bot_name", "round_state", "valid_actions", "action_taken",
+    "street", "player_uuid", "action", "amount",
+    "total_raises", "total_folds", "total_calls"
+]
+HISTORY_BASE_COLUMNS = HISTORY_COLUMNS[:4]
+HISTORY_FLOAT_COLUMNS = ("amount", "total_raises", "total_folds", "total_calls")
 
 
 class CountingBot(BasePokerPlayer):
 
+    # Set to False in a subclass to store None instead of the full
+    # round_state snapshot in each history row (saves memory on long matches)
+    keep_round_state = True
+
     def __init__(self, bot_name):
         self.bot_name = bot_name
         self.wins = 0
         self.stack = 0
         self.in_game = True
         self.game_history = []
-        self.game_history_df = pd.DataFrame(columns=[
-            "bot_name", "round_state",
-            "valid_actions", "action_taken"
-        ])  # Initialize DataFrame
+        # Append-only columnar log; game_history_df is built from it on demand
+        self._history = {column: [] for column in HISTORY_COLUMNS}
+        self._history_df = pd.DataFrame(columns=HISTORY_BASE_COLUMNS)
+        self._history_df_rows = 0  # Rows of _history already in _history_df
         self.hole_cards_log = []
+        # Running counts over the current round; subclasses read it in declare_action
+        self.action_stats = ActionStats()
+
+    @property
+    def game_history_df(self):
+        pending = len(self._history["action"]) - self._history_df_rows
+        if pending:
+            new_rows = {}
+            for column, values in self._history.items():
+                values = values[self._history_df_rows:]
+                if column in HISTORY_FLOAT_COLUMNS:
+                    values = np.asarray(values, dtype=float)
+                elif column in HISTORY_BASE_COLUMNS:
+                    values = pd.Series(values, dtype=object)
+                new_rows[column] = values
+            new_df = pd.DataFrame(new_rows, columns=HISTORY_COLUMNS)
+            if len(self._history_df):
+                new_df = pd.concat([self._history_df, new_df], ignore_index=True)
+            self._history_df = new_df
+            self._history_df_rows += pending
+        return self._history_df
+
+    @game_history_df.setter
+    def game_history_df(self, value):
+        # Bots may replace or trim the DataFrame; later rows are appended to it
+        self._history_df = value
+        self._history_df_rows = len(self._history["action"])
 
     def declare_action(self, valid_actions, hole_card, round_state):
         # Implement your bot's logic here
@@ -30,18 +72,21 @@ class CountingBot(BasePokerPlayer):
         for player in seats:
             if player['uuid'] == self.uuid:
                 self.hole_cards_log.append(hole_card)
+        self.action_stats.start_round(seats)
 
     def receive_street_start_message(self, street, round_state):
-        pass
+        self.action_stats.start_street(street, round_state)
 
     def receive_game_update_message(self, new_action, round_state):
-        # Log the action for analysis
+        self.action_stats.update(new_action, round_state)
+        # Log the action for analysis; the round's counts so far are filled
+        # in at the end of the round
         self.game_history.append({
             'street': round_state.get('street'),
             'player_uuid': new_action.get('player_uuid'),
             'action': new_action.get('action'),
             'amount': new_action.get('amount'),
-            'round_state': round_state  # Full state for deeper analysis
+            'round_state': round_state,  # Full state for deeper analysis
         })
         # Avoid printing action observations to stdout to prevent duplicate output
 
@@ -53,13 +98,23 @@ class CountingBot(BasePokerPlayer):
             if player["uuid"] == self.uuid:
                 self.stack = player["stack"]
 
-        # Append game history to the DataFrame
+        # Running raise/fold/call counts after each action, as the engine applied them
+        totals = dict.fromkeys(("raise", "fold", "call"), 0)
+        for entry, action in zip(self.game_history, self.action_stats.actions):
+            if action in totals:
+                totals[action] += 1
+            entry['total_raises'] = totals['raise']
+            entry['total_folds'] = totals['fold']
+            entry['total_calls'] = totals['call']
+
+        # Append game history to the columnar log (game_history_df reads it lazily)
+        history = self._history
         for entry in self.game_history:
             entry["bot_name"] = self.bot_name
-            # Add summary of actions observed
-            action_histories = entry.get('round_state', {}).get('action_histories', {})
-            entry['total_raises'] = sum(len(actions) for actions in action_histories.values() if isinstance(actions, list) for action in actions if action.get('action') == 'raise')
-            entry['total_folds'] = sum(len(actions) for actions in action_histories.values() if isinstance(actions, list) for action in actions if action.get('action') == 'fold')
-            entry['total_calls'] = sum(len(actions) for actions in action_histories.values() if isinstance(actions, list) for action in actions if action.get('action') == 'call')
-            self.game_history_df = pd.concat([self.game_history_df, pd.DataFrame([entry])], ignore_index=True)
+            history["bot_name"].append(entry["bot_name"])
+            history["round_state"].append(entry.get('round_state') if self.keep_round_state else None)
+            history["valid_actions"].append(np.nan)
+            history["action_taken"].append(np.nan)
+            for column in ("street", "player_uuid", "action", "amount", "total_raises", "total_folds", "total_calls"):
+                history[column].append(entry.get(column))
         self.game_history = []  # Reset the game history for the next round
\ No newline at end of file
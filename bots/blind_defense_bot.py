@@ -1,50 +1,15 @@
 from bots.strategy_base import (
     RangeBot,
     normalize_hand_key,
-    pair_range,
-    suited_plus,
-    offsuit_plus,
-    suited_range,
     evaluate_hand,
 )
+from bots.utils.preflop import in_range, BUTTON_OPEN, OOP_VALUE, OOP_FLAT, OOP_3BET_AIR
 
-BUTTON_OPEN_RANGE = set()
-BUTTON_OPEN_RANGE |= pair_range("2")
-BUTTON_OPEN_RANGE |= suited_plus("A", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("A", "7")
-BUTTON_OPEN_RANGE |= suited_plus("K", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("K", "9")
-BUTTON_OPEN_RANGE |= suited_plus("Q", "6")
-BUTTON_OPEN_RANGE |= offsuit_plus("Q", "9")
-BUTTON_OPEN_RANGE |= suited_plus("J", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("J", "9")
-BUTTON_OPEN_RANGE |= suited_plus("T", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("T", "9")
-BUTTON_OPEN_RANGE |= suited_range("9", "6", "6")
-BUTTON_OPEN_RANGE |= suited_range("8", "6", "6")
-BUTTON_OPEN_RANGE |= suited_range("7", "5", "5")
-BUTTON_OPEN_RANGE |= suited_range("6", "5", "5")
-
-OOP_VALUE_RANGE = set()
-OOP_VALUE_RANGE |= pair_range("T")
-OOP_VALUE_RANGE |= {"AQs", "AQo", "AKs", "AKo"}
-
-OOP_FLAT_RANGE = {
-    "99", "88", "77",
-    "AJs", "ATs", "AJo",
-    "KTs", "KJs", "KQs", "KQo",
-    "QJs", "JTs",
-}
-
-OOP_3BET_AIR_RANGE = {
-    "66", "55", "44", "33", "22",
-    "A9s", "A8s", "A7s", "A6s",
-    "K9s", "K8s",
-    "QTs", "Q9s",
-    "J9s", "J8s",
-    "97s", "98s", "9Ts",
-    "87s", "76s", "65s",
-}
+# Ranges are class bitsets (see bots/utils/preflop.py)
+BUTTON_OPEN_RANGE = BUTTON_OPEN
+OOP_VALUE_RANGE = OOP_VALUE
+OOP_FLAT_RANGE = OOP_FLAT
+OOP_3BET_AIR_RANGE = OOP_3BET_AIR
 
 
 class Bot(RangeBot):
@@ -68,7 +33,7 @@ class Bot(RangeBot):
         raises = context["raises"]
 
         if context["facing_4bet"] and (is_sb or is_bb):
-            if hand_key in OOP_VALUE_RANGE:
+            if in_range(OOP_VALUE_RANGE, hole_card):
                 return self._raise_amount(valid_actions, prefer_max=True)
             return self._fold(valid_actions)
 
@@ -76,14 +41,14 @@ class Bot(RangeBot):
             raiser_uuid = raises[-1].get("uuid") if raises else None
             raiser_index = self._seat_index(seats, raiser_uuid)
             if raiser_index == dealer_btn:
-                if hand_key in OOP_VALUE_RANGE or hand_key in OOP_3BET_AIR_RANGE:
+                if in_range(OOP_VALUE_RANGE, hole_card) or in_range(OOP_3BET_AIR_RANGE, hole_card):
                     return self._raise_amount(valid_actions)
-                if hand_key in OOP_FLAT_RANGE:
+                if in_range(OOP_FLAT_RANGE, hole_card):
                     return self._call(valid_actions)
                 return self._fold(valid_actions)
 
         if context["unopened"] and is_button:
-            if hand_key in BUTTON_OPEN_RANGE:
+            if in_range(BUTTON_OPEN_RANGE, hole_card):
                 return self._raise_amount(valid_actions)
             return self._fold(valid_actions)
 
@@ -1,38 +1,16 @@
 from bots.strategy_base import (
     RangeBot,
     normalize_hand_key,
-    pair_range,
-    suited_plus,
-    offsuit_plus,
-    suited_range,
     evaluate_hand,
 )
+from bots.utils import preflop
+from bots.utils.preflop import in_range
 
-BUTTON_OPEN_RANGE = set()
-BUTTON_OPEN_RANGE |= pair_range("2")
-BUTTON_OPEN_RANGE |= suited_plus("A", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("A", "7")
-BUTTON_OPEN_RANGE |= suited_plus("K", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("K", "9")
-BUTTON_OPEN_RANGE |= suited_plus("Q", "6")
-BUTTON_OPEN_RANGE |= offsuit_plus("Q", "9")
-BUTTON_OPEN_RANGE |= suited_plus("J", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("J", "9")
-BUTTON_OPEN_RANGE |= suited_plus("T", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("T", "9")
-BUTTON_OPEN_RANGE |= suited_range("9", "6", "6")
-BUTTON_OPEN_RANGE |= suited_range("8", "6", "6")
-BUTTON_OPEN_RANGE |= suited_range("7", "5", "5")
-BUTTON_OPEN_RANGE |= suited_range("6", "5", "5")
-
-BUTTON_4BET_VALUE = {"QQ", "KK", "AA", "AKs", "AKo"}
-BUTTON_4BET_BLUFF = {"ATo", "A9s", "A8s", "A7s"}
-BUTTON_FLAT_RANGE = {
-    "JJ", "TT", "99", "88",
-    "AQs", "AQo", "AJs", "AJo", "ATs",
-    "KQs", "KQo", "KJs", "KJo", "KTs",
-    "QJs", "QTs", "JTs",
-}
+# Ranges are class bitsets (see bots/utils/preflop.py)
+BUTTON_OPEN_RANGE = preflop.BUTTON_OPEN
+BUTTON_4BET_VALUE = preflop.PREMIUM
+BUTTON_4BET_BLUFF = preflop.BUTTON_4BET_BLUFF
+BUTTON_FLAT_RANGE = preflop.BUTTON_FLAT
 
 
 class Bot(RangeBot):
@@ -50,21 +28,21 @@ class Bot(RangeBot):
         context = self._preflop_context(round_state)
 
         if context["facing_4bet"] and is_button:
-            if hand_key in BUTTON_4BET_VALUE:
+            if in_range(BUTTON_4BET_VALUE, hole_card):
                 if self._call_amount(valid_actions) > 0:
                     return self._call(valid_actions)
                 return self._raise_amount(valid_actions, prefer_max=True)
             return self._fold(valid_actions)
 
         if context["facing_3bet"] and is_button:
-            if hand_key in BUTTON_4BET_VALUE or hand_key in BUTTON_4BET_BLUFF:
+            if in_range(BUTTON_4BET_VALUE, hole_card) or in_range(BUTTON_4BET_BLUFF, hole_card):
                 return self._raise_amount(valid_actions)
-            if hand_key in BUTTON_FLAT_RANGE:
+            if in_range(BUTTON_FLAT_RANGE, hole_card):
                 return self._call(valid_actions)
             return self._fold(valid_actions)
 
         if context["unopened"] and is_button:
-            if hand_key in BUTTON_OPEN_RANGE:
+            if in_range(BUTTON_OPEN_RANGE, hole_card):
                 return self._raise_amount(valid_actions)
             return self._fold(valid_actions)
 
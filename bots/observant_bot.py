@@ -4,12 +4,11 @@ Observant heuristic bot — greedy but opponent-aware.
 Features:
 - Uses `bots.utils.hand_evaluator.HandEvaluator` for hand strength.
 - Considers action history (folds, raises) to compute opponent aggression.
-- Estimates pot from action history and uses a simple pot-odds check.
+- Reads the pot from the round's action stats and uses a simple pot-odds check.
 - Adjusts willingness-to-call based on number of active players and opponent aggression.
 """
 from bots.base import CountingBot
 from bots.utils.hand_evaluator import HandEvaluator
-from collections import defaultdict
 
 
 class Bot(CountingBot):
@@ -28,9 +27,8 @@ class Bot(CountingBot):
             # Basic evaluation
             hand_strength = HandEvaluator.evaluate_hole_cards(hole_card, community_cards)
 
-            # Action history analysis
-            action_histories = round_state.get('action_histories', {})
-            stats = self._analyze_actions(action_histories)
+            # Action history analysis (kept up to date by CountingBot)
+            stats = self._analyze_actions()
 
             # Players still active (not folded)
             players_active = stats['players_active']
@@ -38,7 +36,7 @@ class Bot(CountingBot):
             # Opponent aggression metric (normalized)
             opp_aggr = stats['avg_raises_per_player']
 
-            # Estimate pot from actions
+            # Pot so far
             pot = stats['pot']
 
             # Current call amount and our stack
@@ -94,44 +92,16 @@ class Bot(CountingBot):
         except Exception:
             return self._execute_call(valid_actions)
 
-    def _analyze_actions(self, action_histories):
-        """Produce simple stats: pot size estimate, raises per player, active players."""
-        pot = 0
-        raises_by_player = defaultdict(int)
-        last_action_by_player = {}
-        players_seen = set()
-
-        for street in ['preflop', 'flop', 'turn', 'river']:
-            for a in action_histories.get(street, []) or []:
-                # Support different keys used by round_state
-                name = a.get('player_uuid') or a.get('name') or a.get('player') or a.get('player_name')
-                act = a.get('action') or a.get('type')
-                amount = a.get('amount', 0)
-                try:
-                    amount = int(amount)
-                except Exception:
-                    amount = 0
-
-                if name:
-                    players_seen.add(name)
-                    last_action_by_player[name] = act
-                if act in ('raise', 'bet'):
-                    raises_by_player[name] += 1
-                    pot += amount
-                elif act in ('call', 'check'):
-                    pot += amount
-                elif act == 'fold':
-                    # fold doesn't add to pot
-                    pass
-
-        # players active = those seen who didn't fold as last action
-        players_active = sum(1 for p in players_seen if last_action_by_player.get(p) != 'fold')
-        total_raises = sum(raises_by_player.values())
+    def _analyze_actions(self):
+        """Produce simple stats: pot size, raises per player, active players."""
+        stats = self.action_stats
+        players_active = stats.players_active()
+        total_raises = sum(stats.raises_by_player.values())
         avg_raises = (total_raises / players_active) if players_active > 0 else 0.0
 
         return {
-            'pot': pot,
-            'raises_by_player': dict(raises_by_player),
+            'pot': stats.pot,
+            'raises_by_player': dict(stats.raises_by_player),
             'avg_raises_per_player': avg_raises,
             'players_active': max(1, players_active)
         }
@@ -3,16 +3,12 @@ from bots.base import CountingBot
 
 class Bot(CountingBot):
     def declare_action(self, valid_actions, hole_card, round_state):
-        # Extract action history for adaptive randomness
-        action_histories = round_state.get('action_histories', {})
+        # Actions so far in the current street, for adaptive randomness
         current_street = round_state.get('street', 'preflop')
-        
-        # Analyze actions in current street
-        street_actions = action_histories.get(current_street, [])
-        raise_count = sum(1 for action in street_actions if action['action'] == 'raise')
-        fold_count = sum(1 for action in street_actions if action['action'] == 'fold')
-        call_count = sum(1 for action in street_actions if action['action'] == 'call')
-        total_actions = len(street_actions)
+        counts = self.action_stats.street_counts.get(current_street, {})
+        raise_count = counts.get('raise', 0)
+        fold_count = counts.get('fold', 0)
+        call_count = counts.get('call', 0)
         
         # Adaptive weights: favor actions that are less common to balance
         weights = []
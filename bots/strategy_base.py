@@ -1,17 +1,22 @@
 import random
-from collections import Counter
 from bots.base import CountingBot
+from bots.utils import cards, preflop
+# Range builders (hand-key sets); preflop.range_bits turns them into bitsets
+from bots.utils.preflop import pair_range, suited_range, offsuit_range, suited_plus, offsuit_plus
 
 RANK_ORDER = "23456789TJQKA"
 
 
 def rank_index(rank):
-    return RANK_ORDER.index(rank)
+    return cards.RANK_INDEX[rank]
 
 
 def normalize_hand_key(hole_card):
     if len(hole_card) != 2:
         return None
+    key = preflop.hand_key(hole_card)  # O(1) table lookup for real cards
+    if key is not None:
+        return key
     card_a, card_b = hole_card
     rank_a, rank_b = card_a[1], card_b[1]
     suited = card_a[0] == card_b[0]
@@ -22,68 +27,8 @@ def normalize_hand_key(hole_card):
     return f"{rank_a}{rank_b}{'s' if suited else 'o'}"
 
 
-def pair_range(start_rank):
-    start_idx = rank_index(start_rank)
-    return {f"{RANK_ORDER[i]}{RANK_ORDER[i]}" for i in range(start_idx, len(RANK_ORDER))}
-
-
-def suited_range(high_rank, low_start, low_end):
-    start_idx = rank_index(low_end)
-    end_idx = rank_index(low_start)
-    return {
-        f"{high_rank}{RANK_ORDER[i]}s"
-        for i in range(start_idx, end_idx + 1)
-        if rank_index(high_rank) > i
-    }
-
-
-def offsuit_range(high_rank, low_start, low_end):
-    start_idx = rank_index(low_end)
-    end_idx = rank_index(low_start)
-    return {
-        f"{high_rank}{RANK_ORDER[i]}o"
-        for i in range(start_idx, end_idx + 1)
-        if rank_index(high_rank) > i
-    }
-
-
-def suited_plus(high_rank, low_start):
-    return suited_range(high_rank, low_start, RANK_ORDER[rank_index(high_rank) - 1])
-
-
-def offsuit_plus(high_rank, low_start):
-    return offsuit_range(high_rank, low_start, RANK_ORDER[rank_index(high_rank) - 1])
-
-
-def _card_rank_value(rank):
-    return rank_index(rank) + 2
-
-
-def _is_straight(ranks):
-    unique = sorted(set(ranks))
-    if 14 in unique:
-        unique.insert(0, 1)
-    for i in range(len(unique) - 4):
-        window = unique[i:i + 5]
-        if window[-1] - window[0] == 4 and len(window) == 5:
-            return True
-    return False
-
-
-def _has_straight_draw(ranks):
-    unique = sorted(set(ranks))
-    if 14 in unique:
-        unique.insert(0, 1)
-    for start in range(1, 11):
-        count = sum(1 for rank in unique if start <= rank <= start + 4)
-        if count >= 4:
-            return True
-    return False
-
-
 def evaluate_hand(hole_cards, community_cards):
-    cards = list(hole_cards) + list(community_cards)
-    if not cards:
+    if not hole_cards and not community_cards:
         return {
             "category": "none",
             "strong": False,
@@ -91,40 +36,53 @@ def evaluate_hand(hole_cards, community_cards):
             "draw": False,
         }
 
-    ranks = [_card_rank_value(card[1]) for card in cards]
-    suits = [card[0] for card in cards]
-    rank_counts = Counter(ranks)
-    counts = sorted(rank_counts.values(), reverse=True)
-    is_flush = max(Counter(suits).values()) >= 5
-    is_straight = _is_straight(ranks)
+    # Single pass over interned cards: rank counts, suit counts, rank mask
+    rank_counts = [0] * 13
+    suit_counts = [0, 0, 0, 0]
+    mask = 0
+    for card in cards.to_ints(hole_cards) + cards.to_ints(community_cards):
+        rank_counts[cards.CARD_RANK[card]] += 1
+        suit_counts[cards.CARD_SUIT[card]] += 1
+        mask |= cards.CARD_BIT[card]
+    has_quads = has_trips = False
+    num_pairs = 0
+    for count in rank_counts:
+        if count == 4:
+            has_quads = True
+        elif count == 3:
+            has_trips = True
+        elif count == 2:
+            num_pairs += 1
+    max_suit = max(suit_counts)
+    is_flush = max_suit >= 5
+    is_straight = cards.has_straight(mask)
 
     if is_flush and is_straight:
         category = "straight_flush"
-    elif 4 in counts:
+    elif has_quads:
         category = "quads"
-    elif 3 in counts and 2 in counts:
+    elif has_trips and num_pairs:
         category = "full_house"
     elif is_flush:
         category = "flush"
     elif is_straight:
         category = "straight"
-    elif 3 in counts:
+    elif has_trips:
         category = "trips"
-    elif counts.count(2) >= 2:
+    elif num_pairs >= 2:
         category = "two_pair"
-    elif 2 in counts:
+    elif num_pairs:
         category = "pair"
     else:
         category = "high_card"
 
-    board_ranks = [_card_rank_value(card[1]) for card in community_cards]
-    top_board = max(board_ranks) if board_ranks else None
-    hole_ranks = [_card_rank_value(card[1]) for card in hole_cards]
+    top_board = max((cards.RANK_VALUE[card[1]] for card in community_cards), default=None)
+    hole_ranks = [cards.RANK_VALUE[card[1]] for card in hole_cards]
     overpair = len(hole_ranks) == 2 and hole_ranks[0] == hole_ranks[1] and top_board
     overpair = bool(overpair and hole_ranks[0] > top_board)
     top_pair = top_board in hole_ranks if top_board else False
 
-    draw = _has_straight_draw(ranks) or max(Counter(suits).values()) == 4
+    draw = cards.has_straight_draw(mask) or max_suit == 4
 
     strong = category in {"straight_flush", "quads", "full_house", "flush", "straight", "trips", "two_pair"}
     medium = category == "pair" and (top_pair or overpair)
@@ -156,21 +114,15 @@ class RangeBot(CountingBot):
                 return index
         return None
 
-    def _last_raiser_uuid(self, actions):
-        for action in reversed(actions):
-            if action.get("action") == "raise":
-                return action.get("uuid")
-        return None
+    def _last_raiser_uuid(self, street="preflop"):
+        raises = self.action_stats.street_raises[street]
+        return raises[-1]["uuid"] if raises else None
 
     def _preflop_context(self, round_state):
-        actions = round_state.get("action_histories", {}).get("preflop", [])
-        raises = [action for action in actions if action.get("action") == "raise"]
-        our_raised = any(
-            action.get("uuid") == self.uuid and action.get("action") == "raise"
-            for action in actions
-        )
+        # Preflop raises ({"uuid", "amount"}, in order) as counted by action_stats
+        raises = self.action_stats.street_raises["preflop"]
+        our_raised = self.action_stats.raised(self.uuid, "preflop")
         return {
-            "actions": actions,
             "raises": raises,
             "our_raised": our_raised,
             "facing_open": (not our_raised) and len(raises) == 1,
@@ -1,38 +1,38 @@
 from bots.strategy_base import (
     RangeBot,
     normalize_hand_key,
+    evaluate_hand,
+)
+from bots.utils.preflop import (
+    range_bits,
+    in_range,
     pair_range,
     suited_plus,
     offsuit_plus,
     suited_range,
-    evaluate_hand,
+    PREMIUM,
+)
+
+# Ranges are class bitsets (see bots/utils/preflop.py)
+BUTTON_OPEN_RANGE = range_bits(
+    pair_range("2"),
+    suited_plus("A", "2"), offsuit_plus("A", "8"),
+    suited_plus("K", "4"), offsuit_plus("K", "9"),
+    suited_plus("Q", "7"), offsuit_plus("Q", "9"),
+    suited_plus("J", "7"), offsuit_plus("J", "9"),
+    suited_plus("T", "7"), offsuit_plus("T", "9"),
+    suited_range("9", "6", "6"), suited_range("8", "6", "6"),
+    suited_range("7", "5", "5"), suited_range("6", "5", "5"),
 )
 
-BUTTON_OPEN_RANGE = set()
-BUTTON_OPEN_RANGE |= pair_range("2")
-BUTTON_OPEN_RANGE |= suited_plus("A", "2")
-BUTTON_OPEN_RANGE |= offsuit_plus("A", "8")
-BUTTON_OPEN_RANGE |= suited_plus("K", "4")
-BUTTON_OPEN_RANGE |= offsuit_plus("K", "9")
-BUTTON_OPEN_RANGE |= suited_plus("Q", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("Q", "9")
-BUTTON_OPEN_RANGE |= suited_plus("J", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("J", "9")
-BUTTON_OPEN_RANGE |= suited_plus("T", "7")
-BUTTON_OPEN_RANGE |= offsuit_plus("T", "9")
-BUTTON_OPEN_RANGE |= suited_range("9", "6", "6")
-BUTTON_OPEN_RANGE |= suited_range("8", "6", "6")
-BUTTON_OPEN_RANGE |= suited_range("7", "5", "5")
-BUTTON_OPEN_RANGE |= suited_range("6", "5", "5")
-
-TRAP_3BET_VALUE = {"QQ", "KK", "AA", "AKs", "AKo"}
-TRAP_FLAT_RANGE = {
+TRAP_3BET_VALUE = PREMIUM
+TRAP_FLAT_RANGE = range_bits({
     "JJ", "TT", "99", "88", "77", "66", "55", "44", "33", "22",
     "AQs", "AQo", "AJs", "AJo", "ATs", "A9s",
     "KQs", "KQo", "KJs", "KJo", "KTs",
     "QJs", "QTs", "JTs",
     "T9s", "98s", "87s", "76s", "65s",
-}
+})
 
 
 class Bot(RangeBot):
@@ -54,16 +54,16 @@ class Bot(RangeBot):
         raises = context["raises"]
 
         if context["facing_4bet"]:
-            if hand_key in TRAP_3BET_VALUE:
+            if in_range(TRAP_3BET_VALUE, hole_card):
                 if self._call_amount(valid_actions) > 0:
                     return self._call(valid_actions)
                 return self._raise_amount(valid_actions, prefer_max=True)
             return self._fold(valid_actions)
 
         if context["facing_3bet"] and is_button:
-            if hand_key in TRAP_3BET_VALUE:
+            if in_range(TRAP_3BET_VALUE, hole_card):
                 return self._raise_amount(valid_actions)
-            if hand_key in TRAP_FLAT_RANGE:
+            if in_range(TRAP_FLAT_RANGE, hole_card):
                 return self._call(valid_actions)
             return self._fold(valid_actions)
 
@@ -71,14 +71,14 @@ class Bot(RangeBot):
             raiser_uuid = raises[-1].get("uuid") if raises else None
             raiser_index = self._seat_index(seats, raiser_uuid)
             if raiser_index == dealer_btn:
-                if hand_key in TRAP_3BET_VALUE:
+                if in_range(TRAP_3BET_VALUE, hole_card):
                     return self._raise_amount(valid_actions)
-                if hand_key in TRAP_FLAT_RANGE:
+                if in_range(TRAP_FLAT_RANGE, hole_card):
                     return self._call(valid_actions)
                 return self._fold(valid_actions)
 
         if context["unopened"] and is_button:
-            if hand_key in BUTTON_OPEN_RANGE:
+            if in_range(BUTTON_OPEN_RANGE, hole_card):
                 return self._raise_amount(valid_actions)
             return self._fold(valid_actions)
 
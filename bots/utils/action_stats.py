@@ -0,0 +1,136 @@
+"""
+Running statistics over the current round's actions.
+
+Every CountingBot keeps an ActionStats in `self.action_stats` and feeds it
+the round start, street start and game update messages as they arrive. An
+update only queues the message's action payload; the queue is applied when
+a stat is read, so each event costs O(1) and nothing is recounted from
+round_state["action_histories"]. round_state's seats and pot are only
+built (see RoundStateView in poker/engine.py) when a bot reads the stats:
+
+- pot                 chips in the pot (main + side pots) after the last event
+- active              uuids of players who have not folded this round
+- raises_by_player    {uuid: raises this round}
+- street_counts       {street: {"raise", "call", "fold", "actions"}}
+- street_raises       {street: [{"uuid", "amount"}, ...]} in order
+- totals              {"raise", "call", "fold"} over the round
+- last_raiser         uuid of the round's latest raise, or None
+- actions             the applied action of every update this round, in order
+
+Actions are counted as the engine applied them: a call or raise with an
+illegal amount, which the engine turns into a fold, counts as a fold. Update
+messages carry the declared action, so that is read off the latest seats: a
+player's last queued action was turned into a fold if they are folded now
+(folded players don't act again).
+Forced bets (blinds, antes) are not actions, but they are in the pot.
+"""
+STREETS = ("preflop", "flop", "turn", "river")
+COUNTED = ("raise", "call", "fold")
+
+
+def pot_total(pot):
+    return pot["main"]["amount"] + sum(side["amount"] for side in pot["side"])
+
+
+class ActionStats:
+    def __init__(self):
+        self.start_round([])
+
+    def start_round(self, seats):
+        self.seat_index = {seat["uuid"]: index for index, seat in enumerate(seats)}
+        self._active = {seat["uuid"] for seat in seats if seat["state"] != "folded"}
+        self._raises_by_player = {}
+        self._street_counts = {street: dict.fromkeys(COUNTED + ("actions",), 0) for street in STREETS}
+        self._street_raises = {street: [] for street in STREETS}
+        self._street_raisers = {street: set() for street in STREETS}
+        self._totals = dict.fromkeys(COUNTED, 0)
+        self._last_raiser = None
+        self._actions = []
+        self._pending = []  # (uuid, declared action, amount, street) not applied yet
+        self._round_state = None  # Latest round_state seen
+        self._pot = 0
+        self._pot_state = None  # round_state self._pot was read from
+
+    def start_street(self, street, round_state):
+        self._round_state = round_state
+
+    def update(self, new_action, round_state):
+        self._pending.append((new_action["player_uuid"], new_action["action"],
+                              new_action["amount"], round_state["street"]))
+        self._round_state = round_state
+
+    def _apply_pending(self):
+        pending = self._pending
+        if not pending:
+            return
+        seats = self._round_state["seats"]
+        last = {uuid: i for i, (uuid, _, _, _) in enumerate(pending)}
+        for i, (uuid, action, amount, street) in enumerate(pending):
+            index = self.seat_index.get(uuid)
+            if (action != "fold" and last[uuid] == i and index is not None
+                    and seats[index]["state"] == "folded"):
+                action = "fold"  # Folded by the engine, whatever was declared
+            self._actions.append(action)
+            counts = self._street_counts.get(street)
+            if counts is None or action not in self._totals:
+                continue
+            counts[action] += 1
+            counts["actions"] += 1
+            self._totals[action] += 1
+            if action == "raise":
+                self._raises_by_player[uuid] = self._raises_by_player.get(uuid, 0) + 1
+                self._street_raises[street].append({"uuid": uuid, "amount": amount})
+                self._street_raisers[street].add(uuid)
+                self._last_raiser = uuid
+            elif action == "fold":
+                self._active.discard(uuid)
+        self._pending = []
+
+    @property
+    def pot(self):
+        if self._round_state is not None and self._pot_state is not self._round_state:
+            self._pot = pot_total(self._round_state["pot"])
+            self._pot_state = self._round_state
+        return self._pot
+
+    @property
+    def active(self):
+        self._apply_pending()
+        return self._active
+
+    @property
+    def raises_by_player(self):
+        self._apply_pending()
+        return self._raises_by_player
+
+    @property
+    def street_counts(self):
+        self._apply_pending()
+        return self._street_counts
+
+    @property
+    def street_raises(self):
+        self._apply_pending()
+        return self._street_raises
+
+    @property
+    def totals(self):
+        self._apply_pending()
+        return self._totals
+
+    @property
+    def last_raiser(self):
+        self._apply_pending()
+        return self._last_raiser
+
+    @property
+    def actions(self):
+        self._apply_pending()
+        return self._actions
+
+    def players_active(self):
+        return len(self.active)
+
+    def raised(self, uuid, street):
+        self._apply_pending()
+        return uuid in self._street_raisers[street]
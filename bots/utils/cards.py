@@ -0,0 +1,89 @@
+"""
+Integer card encoding shared by the bot utilities.
+
+Every card string the engine uses ('SA', 'H7', ...) is interned to a small
+int, card = rank * 4 + suit, with rank 0..12 for 2..A and suit 0..3 for
+C, D, H, S. Per-card rank, suit, value and bit arrays are precomputed, so
+code working on ints never re-parses strings.
+
+Rank masks put rank r at bit r (2 = bit 0 ... A = bit 12); `straight_high`
+and friends work on those masks, and a suit's rank mask with 5+ bits is a
+flush.
+"""
+
+RANKS = "23456789TJQKA"
+SUITS = "CDHS"
+
+CARD_TO_INT = {suit + rank: r * 4 + s for s, suit in enumerate(SUITS) for r, rank in enumerate(RANKS)}
+INT_TO_CARD = {value: card for card, value in CARD_TO_INT.items()}
+
+RANK_INDEX = {rank: r for r, rank in enumerate(RANKS)}        # '2' -> 0 ... 'A' -> 12
+RANK_VALUE = {rank: r + 2 for r, rank in enumerate(RANKS)}    # '2' -> 2 ... 'A' -> 14
+
+CARD_RANK = [card >> 2 for card in range(52)]
+CARD_SUIT = [card & 3 for card in range(52)]
+CARD_VALUE = [(card >> 2) + 2 for card in range(52)]
+CARD_BIT = [1 << (card >> 2) for card in range(52)]
+
+WHEEL_MASK = 0b1000000001111  # A, 2, 3, 4, 5
+ROYAL_MASK = 0b1111100000000  # T, J, Q, K, A
+# Straight masks from ace-high down to the wheel, with the rank of the top card
+STRAIGHTS = [(0b11111 << low, low + 4) for low in range(8, -1, -1)] + [(WHEEL_MASK, 3)]
+
+
+def card_to_int(card_str):
+    """'SA' -> int, or None for anything that is not a real card."""
+    return CARD_TO_INT.get(card_str)
+
+
+def to_ints(cards):
+    """Card strings -> ints; raises ValueError on an unknown card."""
+    try:
+        return [CARD_TO_INT[card] for card in cards]
+    except KeyError as e:
+        raise ValueError(f"Invalid card: {e.args[0]!r}")
+
+
+def rank_mask(card_ints):
+    mask = 0
+    for card in card_ints:
+        mask |= CARD_BIT[card]
+    return mask
+
+
+def suit_masks(card_ints):
+    """Rank mask per suit (C, D, H, S)."""
+    masks = [0, 0, 0, 0]
+    for card in card_ints:
+        masks[card & 3] |= CARD_BIT[card]
+    return masks
+
+
+def max_suit_count(card_ints):
+    counts = [0, 0, 0, 0]
+    for card in card_ints:
+        counts[card & 3] += 1
+    return max(counts)
+
+
+def straight_high(mask):
+    """Rank of the top card of the best straight in a rank mask, or -1."""
+    for straight, high in STRAIGHTS:
+        if mask & straight == straight:
+            return high
+    return -1
+
+
+def has_straight(mask):
+    # Shift in the ace below the 2 so the wheel is five consecutive bits
+    low = (mask << 1) | (mask >> 12 & 1)
+    return bool(low & (low >> 1) & (low >> 2) & (low >> 3) & (low >> 4))
+
+
+def has_straight_draw(mask):
+    """Four of the five ranks of some straight (open-ended or gutshot)."""
+    low = (mask << 1) | (mask >> 12 & 1)
+    for start in range(10):
+        if bin(low & (0b11111 << start)).count("1") >= 4:
+            return True
+    return False
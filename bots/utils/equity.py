@@ -0,0 +1,173 @@
+"""
+Batched Monte Carlo equity for bots.
+
+Deals thousands of runouts at once as NumPy arrays and scores them with the
+lookup tables from `lookup_evaluator`, vectorized:
+
+    from bots.utils.equity import estimate_equity
+
+    equity = estimate_equity(hole_card, community_cards, num_opponents=3,
+                             time_budget=0.05)
+
+    # Opponents restricted to ranges (None = any two cards)
+    equity = estimate_equity(hole_card, community_cards, 2,
+                             opponent_ranges=[preflop.BUTTON_OPEN, None], seed=7)
+
+Equity is the expected share of the pot: a win counts 1 and an n-way tie
+counts 1/n. Work is done in batches until `samples` runouts are scored or
+`time_budget` seconds have passed (at least one batch always runs). Passing
+`seed` makes the result reproducible. Preflop against random hands
+(no board, no ranges) is read from the precomputed preflop tables instead.
+"""
+import time
+import numpy as np
+from bots.utils import lookup_evaluator as lookup
+from bots.utils.cards import RANK_INDEX, CARD_BIT, to_ints
+from bots.utils import preflop
+
+_CARD_BIT = np.array(CARD_BIT, dtype=np.int64)
+_CARD_RANK_KEY = np.array(lookup.CARD_RANK_KEY, dtype=np.int64)
+_FLUSH_TABLE = np.array(lookup.FLUSH_TABLE, dtype=np.int64)
+_NONFLUSH_KEYS = np.array(sorted(lookup.NONFLUSH_TABLE), dtype=np.int64)
+_NONFLUSH_VALUES = np.array([lookup.NONFLUSH_TABLE[key] for key in _NONFLUSH_KEYS.tolist()], dtype=np.int64)
+
+_range_cache = {}
+
+
+def evaluate_batch(cards):
+    """Hand values (as in lookup_evaluator.evaluate) for an (N, 5..7) int array."""
+    cards = np.asarray(cards, dtype=np.int64)
+    bits = _CARD_BIT[cards]
+    suits = cards & 3
+    best_flush = np.zeros(len(cards), dtype=np.int64)
+    for suit in range(4):
+        mask = np.where(suits == suit, bits, 0).sum(axis=1)
+        np.maximum(best_flush, _FLUSH_TABLE[mask], out=best_flush)
+    keys = _CARD_RANK_KEY[cards].sum(axis=1)
+    plain = _NONFLUSH_VALUES[np.searchsorted(_NONFLUSH_KEYS, keys)]
+    return np.where(best_flush > 0, best_flush, plain)
+
+
+def range_combos(hand_keys):
+    """
+    All two-card combos (int pairs) for a set of hand keys such as
+    {"AA", "AKs", "KQo"}, or for a preflop range bitset.
+    """
+    if isinstance(hand_keys, int):
+        hand_keys = preflop.range_keys(hand_keys)
+    cache_key = frozenset(hand_keys)
+    combos = _range_cache.get(cache_key)
+    if combos is not None:
+        return combos
+    pairs = []
+    for key in cache_key:
+        r1, r2 = RANK_INDEX[key[0]], RANK_INDEX[key[1]]
+        kind = key[2] if len(key) > 2 else ""
+        for s1 in range(4):
+            for s2 in range(4):
+                if r1 == r2 and s2 <= s1:
+                    continue  # each pair combo once
+                if kind == "s" and s1 != s2:
+                    continue
+                if kind == "o" and s1 == s2:
+                    continue
+                pairs.append((r1 * 4 + s1, r2 * 4 + s2))
+    combos = _range_cache[cache_key] = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    return combos
+
+
+def estimate_equity(hole_card, community_cards, num_opponents, opponent_ranges=None,
+                    samples=2000, time_budget=None, seed=None, batch_size=500, use_tables=True):
+    """
+    Monte Carlo equity of `hole_card` against `num_opponents` opponents.
+
+    opponent_ranges: optional list (one entry per opponent) of hand-key sets
+    or preflop range bitsets,
+    or None entries for opponents holding any two cards.
+    time_budget: optional limit in seconds for this call.
+    seed: fix the random stream (same inputs + seed -> same equity).
+    use_tables: answer from the precomputed preflop tables when they cover the
+    spot (no board, no ranges); False always simulates.
+    """
+    hero = to_ints(hole_card)
+    board = to_ints(community_cards)
+    if num_opponents < 1:
+        return 1.0
+    dead = hero + board
+    if len(set(dead)) != len(dead):
+        raise ValueError("Duplicate cards in hole cards / board")
+    if (use_tables and not board and not any(opponent_ranges or [])
+            and num_opponents <= preflop.tables().max_opponents):
+        return preflop.preflop_equity(hole_card, num_opponents)
+
+    rng = np.random.default_rng(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    board_needed = 5 - len(board)
+
+    # Range opponents draw from their live combos; the rest get random cards
+    ranged = []
+    opponent_ranges = list(opponent_ranges or [])
+    dead_set = set(dead)
+    for hand_keys in opponent_ranges[:num_opponents]:
+        if not hand_keys:
+            continue
+        combos = range_combos(hand_keys)
+        live = np.array([c1 not in dead_set and c2 not in dead_set for c1, c2 in combos.tolist()], dtype=bool)
+        if live.any():
+            ranged.append(combos[live])
+    num_random = num_opponents - len(ranged)
+    random_needed = 2 * num_random + board_needed
+
+    dead_mask = np.zeros(52, dtype=bool)
+    dead_mask[dead] = True
+    hero_row = np.array(dead, dtype=np.int64)
+
+    scored = 0
+    share_total = 0.0
+    attempts = 0
+    while scored < samples:
+        size = min(batch_size, samples - scored)
+        used = np.broadcast_to(dead_mask, (size, 52)).copy()
+        valid = np.ones(size, dtype=bool)
+        rows = np.arange(size)
+
+        ranged_hands = []
+        for combos in ranged:
+            hand = combos[rng.integers(len(combos), size=size)]
+            # Reject deals where two range opponents share a card
+            valid &= ~used[rows, hand[:, 0]] & ~used[rows, hand[:, 1]]
+            used[rows, hand[:, 0]] = True
+            used[rows, hand[:, 1]] = True
+            ranged_hands.append(hand)
+
+        # Random cards: sort random keys with used cards pushed to the end
+        keys = rng.random((size, 52))
+        keys[used] = 2.0
+        drawn = np.argsort(keys, axis=1)[:, :random_needed]
+
+        runout = np.concatenate([np.broadcast_to(np.array(board, dtype=np.int64), (size, len(board))),
+                                 drawn[:, :board_needed]], axis=1)
+        hero_cards = np.concatenate([np.broadcast_to(hero_row[:2], (size, 2)), runout], axis=1)
+        values = [evaluate_batch(hero_cards)]
+        for hand in ranged_hands:
+            values.append(evaluate_batch(np.concatenate([hand, runout], axis=1)))
+        for i in range(num_random):
+            hand = drawn[:, board_needed + 2 * i:board_needed + 2 * i + 2]
+            values.append(evaluate_batch(np.concatenate([hand, runout], axis=1)))
+
+        values = np.stack(values, axis=1)[valid]
+        best = values.max(axis=1)
+        winners = values == best[:, None]
+        hero_share = np.where(winners[:, 0], 1.0 / winners.sum(axis=1), 0.0)
+        share_total += hero_share.sum()
+        scored += len(hero_share)
+
+        attempts += 1
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if attempts > 50 and scored == 0:
+            break  # Ranges that (almost) never fit together
+
+    if scored == 0:
+        return 0.0
+    return share_total / scored
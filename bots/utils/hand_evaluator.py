@@ -4,6 +4,7 @@ Evaluates hand strength using poker ranking logic.
 """
 from itertools import combinations
 from collections import Counter
+from bots.utils import cards, lookup_evaluator
 
 
 class HandEvaluator:
@@ -22,10 +23,7 @@ class HandEvaluator:
     ROYAL_FLUSH = 10
     
     # Card value mapping
-    CARD_VALUES = {
-        '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
-        'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-    }
+    CARD_VALUES = cards.RANK_VALUE
     
     @staticmethod
     def parse_card(card_str):
@@ -94,6 +92,22 @@ class HandEvaluator:
         Returns:
             float: Hand strength 0-1
         """
+        all_cards = hole_card + community_cards
+        if 5 <= len(all_cards) <= 7:
+            card_ints = [cards.CARD_TO_INT.get(card) for card in all_cards]
+            if None not in card_ints and len(set(card_ints)) == len(card_ints):
+                rank, kicker = lookup_evaluator.compat_rank_kicker(card_ints)
+                return HandEvaluator._rank_to_strength(rank, kicker)
+        # Preflop, unusual card strings or duplicates: use the reference loop
+        return HandEvaluator.evaluate_hole_cards_reference(hole_card, community_cards)
+
+    @staticmethod
+    def evaluate_hole_cards_reference(hole_card, community_cards):
+        """
+        Reference implementation of evaluate_hole_cards: scores every 5-card
+        combination. Kept for preflop/odd inputs and to check the lookup
+        tables against (scripts/check_hand_evaluator.py).
+        """
         # Parse cards
         all_cards = hole_card + community_cards
         card_values = []
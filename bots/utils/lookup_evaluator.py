@@ -0,0 +1,211 @@
+"""
+Lookup-table poker hand evaluator for 5, 6 and 7 cards.
+
+Cards are the small integers from `bots.utils.cards` (rank * 4 + suit).
+
+Two tables, read at import from the bundled binary `hand_tables.bin` (built
+by scripts/build_hand_tables.py), so a process pays a few milliseconds
+instead of building them:
+
+- FLUSH_TABLE: indexed by the 13-bit rank mask of one suit. Non-zero only for
+  masks with 5+ ranks, holding the best flush / straight flush value. With at
+  most 7 cards, a flush can never be beaten by quads or a full house, so a
+  suit with 5+ cards settles the hand.
+- NONFLUSH_TABLE: indexed by the rank-count key (3 bits per rank, sum of
+  RANK_KEY over the cards), holding the best hand made from that rank
+  multiset.
+
+`evaluate(cards)` returns an int where a higher value is a better hand:
+category << 20 followed by up to five 4-bit tiebreak ranks.
+
+File layout (little-endian):
+    header   "HET1", version u32, flush entries u32 (8192), non-flush entries u32
+    flush    8192 u32, FLUSH_TABLE by rank mask
+    keys     non-flush entries u64, rank-count keys in ascending order
+    values   non-flush entries u32, NONFLUSH_TABLE value of each key
+"""
+import os
+import struct
+from bots.utils.cards import INT_TO_CARD, CARD_BIT, WHEEL_MASK, ROYAL_MASK, straight_high
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hand_tables.bin")
+MAGIC = b"HET1"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+
+# Hand categories (same numbering as HandEvaluator)
+HIGH_CARD = 1
+ONE_PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10  # Only reported by compat_rank_kicker
+
+RANK_KEY = [1 << (3 * r) for r in range(13)]
+CARD_RANK_KEY = [RANK_KEY[card >> 2] for card in range(52)]
+
+
+def _value(category, ranks=()):
+    value = category
+    for i in range(5):
+        value = (value << 4) | (ranks[i] if i < len(ranks) else 0)
+    return value
+
+
+def _top_ranks(mask, count, exclude=()):
+    ranks = []
+    for r in range(12, -1, -1):
+        if mask >> r & 1 and r not in exclude:
+            ranks.append(r)
+            if len(ranks) == count:
+                break
+    return ranks
+
+
+def build_flush_table():
+    table = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count("1") < 5:
+            continue
+        high = straight_high(mask)
+        if high >= 0:
+            table[mask] = _value(STRAIGHT_FLUSH, (high,))
+        else:
+            table[mask] = _value(FLUSH, _top_ranks(mask, 5))
+    return table
+
+
+def _best_nonflush(counts):
+    """Best hand for a rank multiset (counts[r] = copies of rank r), ignoring suits."""
+    mask = 0
+    quads, trips, pairs = [], [], []
+    for r in range(12, -1, -1):
+        n = counts[r]
+        if n:
+            mask |= 1 << r
+            if n == 4:
+                quads.append(r)
+            elif n == 3:
+                trips.append(r)
+            elif n == 2:
+                pairs.append(r)
+
+    if quads:
+        return _value(FOUR_OF_A_KIND, [quads[0]] + _top_ranks(mask, 1, (quads[0],)))
+    if trips and (len(trips) > 1 or pairs):
+        return _value(FULL_HOUSE, (trips[0], max(trips[1:] + pairs)))
+    high = straight_high(mask)
+    if high >= 0:
+        return _value(STRAIGHT, (high,))
+    if trips:
+        return _value(THREE_OF_A_KIND, [trips[0]] + _top_ranks(mask, 2, (trips[0],)))
+    if len(pairs) >= 2:
+        top = pairs[:2]
+        return _value(TWO_PAIR, top + _top_ranks(mask, 1, top))
+    if pairs:
+        return _value(ONE_PAIR, [pairs[0]] + _top_ranks(mask, 3, (pairs[0],)))
+    return _value(HIGH_CARD, _top_ranks(mask, 5))
+
+
+def build_nonflush_table():
+    table = {}
+    counts = [0] * 13
+
+    # Every multiset of 5..7 ranks with at most 4 copies of each rank
+    def fill(rank, cards, key):
+        if rank == 13:
+            if cards >= 5:
+                table[key] = _best_nonflush(counts)
+            return
+        for n in range(min(4, 7 - cards) + 1):
+            counts[rank] = n
+            fill(rank + 1, cards + n, key + n * RANK_KEY[rank])
+        counts[rank] = 0
+
+    fill(0, 0, 0)
+    return table
+
+
+def load_tables(path=TABLE_PATH):
+    """(FLUSH_TABLE, NONFLUSH_TABLE) from a table file."""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, flush_entries, nonflush_entries = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or flush_entries != 1 << 13:
+        raise ValueError(f"{path} is not a version {VERSION} hand table")
+    view = memoryview(data)
+    offset = HEADER.size
+    flush = view[offset:offset + 4 * flush_entries].cast("I").tolist()
+    offset += 4 * flush_entries
+    keys = view[offset:offset + 8 * nonflush_entries].cast("Q")
+    offset += 8 * nonflush_entries
+    values = view[offset:offset + 4 * nonflush_entries].cast("I")
+    return flush, dict(zip(keys, values))
+
+
+try:
+    FLUSH_TABLE, NONFLUSH_TABLE = load_tables()
+except FileNotFoundError:
+    # Not built yet (scripts/build_hand_tables.py builds it from these)
+    FLUSH_TABLE, NONFLUSH_TABLE = build_flush_table(), build_nonflush_table()
+
+
+def evaluate(cards):
+    """Value of the best 5-card hand among 5-7 distinct integer cards."""
+    suit_masks = [0, 0, 0, 0]
+    key = 0
+    for card in cards:
+        suit_masks[card & 3] |= CARD_BIT[card]
+        key += CARD_RANK_KEY[card]
+    for mask in suit_masks:
+        value = FLUSH_TABLE[mask]
+        if value:
+            return value
+    return NONFLUSH_TABLE[key]
+
+
+def category(value):
+    return value >> 20
+
+
+def compat_rank_kicker(cards):
+    """
+    (rank, kicker) exactly as HandEvaluator's combination loop scores them:
+    the best category over all 5-card subsets (straight flushes to the ace
+    counted as ROYAL_FLUSH), and the highest card value (2..14) found in any
+    subset of that category. A wheel counts its ace as the kicker.
+    """
+    suit_masks = [0, 0, 0, 0]
+    key = 0
+    for card in cards:
+        suit_masks[card & 3] |= CARD_BIT[card]
+        key += CARD_RANK_KEY[card]
+
+    for mask in suit_masks:
+        value = FLUSH_TABLE[mask]
+        if value:
+            if value >> 20 == FLUSH:
+                return FLUSH, mask.bit_length() + 1
+            if mask & ROYAL_MASK == ROYAL_MASK:
+                return ROYAL_FLUSH, 14
+            if mask & WHEEL_MASK == WHEEL_MASK:
+                return STRAIGHT_FLUSH, 14
+            return STRAIGHT_FLUSH, (value >> 16 & 15) + 2
+
+    value = NONFLUSH_TABLE[key]
+    rank = value >> 20
+    all_ranks = suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]
+    if rank == STRAIGHT:
+        if all_ranks & WHEEL_MASK == WHEEL_MASK:
+            return STRAIGHT, 14
+        return STRAIGHT, (value >> 16 & 15) + 2
+    if rank == FULL_HOUSE:
+        # Any rank with 2+ copies can be part of some full house
+        for r in range(12, -1, -1):
+            if (key >> (3 * r)) & 7 >= 2:
+                return FULL_HOUSE, r + 2
+    return rank, all_ranks.bit_length() + 1
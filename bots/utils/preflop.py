@@ -0,0 +1,209 @@
+"""
+Precomputed preflop tables shared by all bots.
+
+The tables live in the bundled binary `preflop_tables.bin` (built by
+scripts/build_preflop_tables.py) and are memory-mapped, so importing this
+module costs next to nothing and every process shares the same pages:
+
+- the 169 starting-hand classes ("AA", "AKs", "AKo", ...) and, for every
+  ordered pair of the 52 cards, the class it belongs to
+- preflop all-in equity of each class against 1..MAX_OPPONENTS random hands
+
+Ranges are bitsets over the class index, built once at import
+(`range_bits`), so `in_range` is a table lookup plus a shift and mask. The
+ranges several range bots share (BUTTON_OPEN, OOP_VALUE, ...) live here;
+bot-specific ranges are built the same way in the bot module.
+
+File layout (little-endian):
+    header   "PFT1", version u32, classes u32, max_opponents u32
+    classes  52 * 52 u8, class index of (card_a, card_b), 255 for a = b
+    equity   classes * max_opponents f32, row per class
+"""
+import mmap
+import os
+import struct
+from bots.utils.cards import RANKS, RANK_INDEX, CARD_TO_INT
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_tables.bin")
+MAGIC = b"PFT1"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+
+NUM_CLASSES = 169
+NO_CLASS = 255
+
+
+def class_index(rank_a, rank_b, suited):
+    """Index into the 13x13 grid: pairs on the diagonal, suited above it, offsuit below."""
+    high, low = (rank_a, rank_b) if rank_a >= rank_b else (rank_b, rank_a)
+    if high == low or suited:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def _class_key(index):
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return RANKS[row] + RANKS[col] + "s"
+    return RANKS[col] + RANKS[row] + "o"
+
+
+HAND_KEYS = [_class_key(index) for index in range(NUM_CLASSES)]
+KEY_TO_CLASS = {key: index for index, key in enumerate(HAND_KEYS)}
+
+
+class PreflopTables:
+    def __init__(self, path=TABLE_PATH):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, classes, max_opponents = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or classes != NUM_CLASSES:
+            raise ValueError(f"{path} is not a version {VERSION} preflop table")
+        self.max_opponents = max_opponents
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        self.combo_class = view[offset:offset + 52 * 52]
+        offset += 52 * 52
+        self.equity = view[offset:offset + 4 * classes * max_opponents].cast("f")
+
+        # Card strings straight to class index, for O(1) lookups from hole_card
+        combo_class = self.combo_class
+        self.pair_class = {
+            (card_a, card_b): combo_class[a * 52 + b]
+            for card_a, a in CARD_TO_INT.items()
+            for card_b, b in CARD_TO_INT.items()
+            if a != b
+        }
+
+
+_tables = None
+
+
+def tables():
+    global _tables
+    if _tables is None:
+        _tables = PreflopTables()
+    return _tables
+
+
+def hand_class(hole_card):
+    """Class index 0..168 of two hole cards like ['SA', 'HK'], or None."""
+    if len(hole_card) != 2:
+        return None
+    return tables().pair_class.get((hole_card[0], hole_card[1]))
+
+
+def hand_key(hole_card):
+    """'AKs' / 'AKo' / 'AA' for two hole cards, or None."""
+    index = hand_class(hole_card)
+    return None if index is None else HAND_KEYS[index]
+
+
+def preflop_equity(hole_card, num_opponents):
+    """All-in equity (ties split) against `num_opponents` random hands."""
+    index = hand_class(hole_card)
+    if index is None:
+        raise ValueError(f"Invalid hole cards: {hole_card!r}")
+    data = tables()
+    num_opponents = max(1, min(num_opponents, data.max_opponents))
+    return data.equity[index * data.max_opponents + num_opponents - 1]
+
+
+def range_bits(*hand_key_sets):
+    """Bitset over class indexes for the union of sets of hand keys ({'AA', 'AKs', ...})."""
+    bits = 0
+    for hand_keys in hand_key_sets:
+        for key in hand_keys:
+            bits |= 1 << KEY_TO_CLASS[key]
+    return bits
+
+
+def range_keys(bits):
+    """The hand keys in a range bitset."""
+    return {key for index, key in enumerate(HAND_KEYS) if bits >> index & 1}
+
+
+def in_range(bits, hole_card):
+    index = hand_class(hole_card)
+    return index is not None and bool(bits >> index & 1)
+
+
+# Range building, in hand keys --------------------------------------------------
+
+def pair_range(start_rank):
+    """Pairs from start_rank up: pair_range("T") is TT..AA."""
+    start = RANK_INDEX[start_rank]
+    return {RANKS[i] * 2 for i in range(start, len(RANKS))}
+
+
+def suited_range(high_rank, low_start, low_end):
+    """Suited hands high_rank + low_end..low_start, e.g. suited_range("9", "6", "6") is 96s."""
+    high = RANK_INDEX[high_rank]
+    return {
+        f"{high_rank}{RANKS[i]}s"
+        for i in range(RANK_INDEX[low_end], RANK_INDEX[low_start] + 1)
+        if high > i
+    }
+
+
+def offsuit_range(high_rank, low_start, low_end):
+    high = RANK_INDEX[high_rank]
+    return {
+        f"{high_rank}{RANKS[i]}o"
+        for i in range(RANK_INDEX[low_end], RANK_INDEX[low_start] + 1)
+        if high > i
+    }
+
+
+def suited_plus(high_rank, low_start):
+    """suited_plus("A", "7") is A7s..AKs."""
+    return suited_range(high_rank, low_start, RANKS[RANK_INDEX[high_rank] - 1])
+
+
+def offsuit_plus(high_rank, low_start):
+    return offsuit_range(high_rank, low_start, RANKS[RANK_INDEX[high_rank] - 1])
+
+
+# Shared ranges -----------------------------------------------------------------
+
+BUTTON_OPEN = range_bits(
+    pair_range("2"),
+    suited_plus("A", "2"), offsuit_plus("A", "7"),
+    suited_plus("K", "2"), offsuit_plus("K", "9"),
+    suited_plus("Q", "6"), offsuit_plus("Q", "9"),
+    suited_plus("J", "7"), offsuit_plus("J", "9"),
+    suited_plus("T", "7"), offsuit_plus("T", "9"),
+    suited_range("9", "6", "6"), suited_range("8", "6", "6"),
+    suited_range("7", "5", "5"), suited_range("6", "5", "5"),
+)
+
+BUTTON_FLAT = range_bits({
+    "JJ", "TT", "99", "88",
+    "AQs", "AQo", "AJs", "AJo", "ATs",
+    "KQs", "KQo", "KJs", "KJo", "KTs",
+    "QJs", "QTs", "JTs",
+})
+
+PREMIUM = range_bits({"QQ", "KK", "AA", "AKs", "AKo"})
+BUTTON_4BET_BLUFF = range_bits({"ATo", "A9s", "A8s", "A7s"})
+
+OOP_VALUE = range_bits(pair_range("T"), {"AQs", "AQo", "AKs", "AKo"})
+
+OOP_FLAT = range_bits({
+    "99", "88", "77",
+    "AJs", "ATs", "AJo",
+    "KTs", "KJs", "KQs", "KQo",
+    "QJs", "JTs",
+})
+
+OOP_3BET_AIR = range_bits({
+    "66", "55", "44", "33", "22",
+    "A9s", "A8s", "A7s", "A6s",
+    "K9s", "K8s",
+    "QTs", "Q9s",
+    "J9s", "J8s",
+    "97s", "98s",
+    "87s", "76s", "65s",
+})
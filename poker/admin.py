@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User,Bot,Match,TestMatch,TestBot
+from .models import User,Bot,Match,TestMatch,TestBot,TestRunJob
 
 
 # Register your models here.
@@ -43,3 +43,8 @@ admin.site.register(TestMatch, TestMatchAdmin)
 @admin.register(TestBot)
 class BotAdmin(admin.ModelAdmin):
     list_display = ('name', 'user')
+
+@admin.register(TestRunJob)
+class TestRunJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'test_bot', 'user', 'status', 'progress', 'iterations', 'created_at')
+    list_filter = ('status',)
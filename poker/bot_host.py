@@ -0,0 +1,345 @@
+"""
+Long-lived bot host processes.
+
+Uploaded bots can run outside the engine's process. A host is a separate
+interpreter (`python -m poker.bot_host <bot file>`) that loads one bot file
+once and serves any number of matches. The engine seats a RemotePlayer, a
+BasePokerPlayer proxy that forwards calls to the host over the host's
+stdin/stdout pipes:
+
+    engine -> host   u32 length + marshal((op, session, data))
+                     'new'   data = (name, seed); replies status
+                     'uuid'  data = seat uuid; no reply
+                     'ask'   data = respond_to_ask message; replies action
+                     'note'  data = notification message; no reply
+                     'close' no reply
+    host -> engine   u32 length + reply. An action reply is struct '<Bdd':
+                     action code, amount, host CPU seconds. A status reply
+                     is one status byte plus a UTF-8 error text.
+
+Notifications are not acknowledged, so an action costs one round trip and a
+match costs no process spawn. The engine never unpickles anything from a
+host; replies are fixed binary records.
+
+Hosts run with rlimits (address space BOT_HOST_MEMORY_MB, no file writes,
+no core dumps) and with stdout/stdin detached from the protocol pipes. They
+start in an empty temporary directory with a minimal environment (no
+settings or secrets from the web process), so relative paths reach no
+project files. With BOT_HOST_USER set, the host also runs as that account,
+which should have no access to the project's .env, database or media
+beyond the bot files. This contains crashes and runaway memory. It is not
+a full security sandbox. A host whose call is interrupted (see poker/watchdog.py) or that
+dies is killed and replaced on next use. Each engine process keeps at most
+BOT_HOST_LIMIT hosts and closes the least recently used one beyond that;
+run_tournament also closes the tested bot's hosts once it is done.
+"""
+import marshal
+import os
+import select
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pypokerengine.players import BasePokerPlayer
+from .engine import plain_message
+from .watchdog import ActionTimeout
+
+LENGTH = struct.Struct('<I')
+ACTION_REPLY = struct.Struct('<Bdd')
+ACTIONS = ('fold', 'call', 'raise')
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+UNKNOWN_ACTION = 254
+ERROR = 255
+STATUS_OK = 0
+
+
+class BotHostError(Exception):
+    """A host failed to load its bot, the bot raised, or the host died."""
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError()
+    return data
+
+
+def _read_frame(stream):
+    (size,) = LENGTH.unpack(_read_exactly(stream, LENGTH.size))
+    return _read_exactly(stream, size)
+
+
+def _write_frame(stream, payload):
+    stream.write(LENGTH.pack(len(payload)) + payload)
+    stream.flush()
+
+
+# Host side --------------------------------------------------------------------
+
+def _sandbox(memory_mb):
+    import resource
+    import signal
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    # Writes fail with an error instead of killing the host
+    signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def serve(bot_path, memory_mb=0):
+    # Keep the protocol pipes away from the bot's print()/input()
+    proto_in = os.fdopen(os.dup(0), 'rb')
+    proto_out = os.fdopen(os.dup(1), 'wb')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdout = open(os.devnull, 'w')
+    _sandbox(memory_mb)
+
+    from .utils import load_bot_class
+    from .rng import PrivateRandomPlayer
+    bot_class, ok = load_bot_class(bot_path)
+    sessions = {}
+    pending_error = None  # From a notification, reported with the next reply
+
+    while True:
+        try:
+            op, session, data = marshal.loads(_read_frame(proto_in))
+        except EOFError:
+            return
+
+        if op == 'new':
+            try:
+                if not ok:
+                    raise BotHostError(bot_class)
+                name, seed = data
+                sessions[session] = PrivateRandomPlayer(bot_class(bot_name=name), seed)
+                _write_frame(proto_out, bytes([STATUS_OK]))
+            except Exception as e:
+                _write_frame(proto_out, bytes([ERROR]) + str(e).encode())
+        elif op == 'ask':
+            try:
+                if pending_error:
+                    raise BotHostError(pending_error)
+                action, amount = sessions[session].respond_to_ask(data)
+                code = ACTION_CODES.get(action, UNKNOWN_ACTION)
+                reply = ACTION_REPLY.pack(code, float(amount or 0), time.process_time())
+            except Exception as e:
+                reply = bytes([ERROR]) + str(e).encode()
+            pending_error = None
+            _write_frame(proto_out, reply)
+        elif op == 'uuid':
+            sessions[session].set_uuid(data)
+        elif op == 'note':
+            try:
+                sessions[session].receive_notification(data)
+            except Exception as e:
+                pending_error = pending_error or str(e)
+        elif op == 'close':
+            sessions.pop(session, None)
+
+
+# Engine side ------------------------------------------------------------------
+
+def _host_env(home):
+    """Environment of a host: only what Python and the bots need."""
+    from django.conf import settings
+    python_path = [str(settings.BASE_DIR)]  # For `-m poker.bot_host` and `import bots...`
+    if os.environ.get('PYTHONPATH'):
+        python_path.append(os.environ['PYTHONPATH'])
+    return {
+        'PATH': os.defpath,
+        'PYTHONPATH': os.pathsep.join(python_path),
+        'HOME': home,
+        'TMPDIR': home,
+        'LANG': 'C.UTF-8',
+        # One BLAS thread keeps numpy inside the address-space limit
+        'OPENBLAS_NUM_THREADS': '1',
+        'OMP_NUM_THREADS': '1',
+    }
+
+
+def _host_user():
+    """Popen user/group/extra_groups kwargs for settings.BOT_HOST_USER, if set."""
+    from django.conf import settings
+    user = getattr(settings, 'BOT_HOST_USER', '')
+    if not user:
+        return {}
+    import pwd
+    entry = pwd.getpwuid(int(user)) if str(user).isdigit() else pwd.getpwnam(user)
+    return {'user': entry.pw_uid, 'group': entry.pw_gid, 'extra_groups': []}
+
+
+class BotHost:
+    def __init__(self, bot_path, memory_mb=0):
+        self.bot_path = os.path.abspath(bot_path)
+        # Empty working directory, readable (not writable) by a BOT_HOST_USER
+        self.workdir = tempfile.mkdtemp(prefix='bot-host-')
+        os.chmod(self.workdir, 0o755)
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, '-B', '-m', 'poker.bot_host', self.bot_path, str(memory_mb)],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                cwd=self.workdir, close_fds=True, env=_host_env(self.workdir),
+                **_host_user()
+            )
+        except BaseException:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            raise
+        self.next_session = 0
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def send(self, op, session, data=None):
+        try:
+            _write_frame(self.process.stdin, marshal.dumps((op, session, data)))
+        except BaseException:
+            self.kill()
+            raise
+
+    def request(self, op, session, data=None, timeout=None):
+        """Send and wait for the reply; ActionTimeout if none within `timeout` seconds."""
+        self.send(op, session, data)
+        try:
+            # Replies come one per request, so nothing is left buffered to miss
+            if timeout and not select.select([self.process.stdout], [], [], timeout)[0]:
+                raise ActionTimeout()
+            return _read_frame(self.process.stdout)
+        except EOFError:
+            self.kill()
+            raise BotHostError("Bot host exited")
+        except BaseException:
+            # Interrupted mid-reply (e.g. by the watchdog): the pipe is out of sync
+            self.kill()
+            raise
+
+    def kill(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+_hosts = OrderedDict()
+_hosts_lock = threading.Lock()
+
+
+def _forget_hosts():
+    # A forked child (pool worker) must not talk to its parent's hosts
+    global _hosts_lock
+    _hosts.clear()
+    _hosts_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_hosts)
+
+
+def get_host(bot_path):
+    """The live host for this bot file (restarted if the file changed)."""
+    from django.conf import settings
+    stat = os.stat(bot_path)
+    key = (os.path.abspath(bot_path), stat.st_mtime_ns, stat.st_size)
+    with _hosts_lock:
+        host = _hosts.get(key)
+        if host is not None and host.alive():
+            _hosts.move_to_end(key)
+            return host
+        if host is not None:
+            del _hosts[key]
+        host = _hosts[key] = BotHost(key[0], getattr(settings, 'BOT_HOST_MEMORY_MB', 512))
+        limit = getattr(settings, 'BOT_HOST_LIMIT', 16)
+        while len(_hosts) > limit:
+            _, old = _hosts.popitem(last=False)
+            old.kill()
+        return host
+
+
+def close_host(bot_path):
+    """Kill this process's hosts of `bot_path`, whatever version of the file they loaded."""
+    path = os.path.abspath(bot_path)
+    with _hosts_lock:
+        for key in [key for key in _hosts if key[0] == path]:
+            _hosts.pop(key).kill()
+
+
+def shutdown_hosts():
+    with _hosts_lock:
+        for host in _hosts.values():
+            host.kill()
+        _hosts.clear()
+
+
+class RemotePlayer(BasePokerPlayer):
+    """Engine-side proxy for a bot living in a BotHost."""
+
+    def __init__(self, host, name, seed):
+        self.host = host
+        self.session = host.next_session
+        host.next_session += 1
+        self.hole_cards_log = []
+        self.host_cpu = 0.0
+        self.abandoned = False
+        self.reply_timeout = None  # Set per call by TimedPlayer; bounds off-main-thread waits
+        reply = host.request('new', self.session, (name, seed))
+        if reply[0] != STATUS_OK:
+            raise BotHostError(reply[1:].decode(errors='replace'))
+
+    def set_uuid(self, uuid):
+        self.uuid = uuid
+        self.host.send('uuid', self.session, uuid)
+
+    def process_time(self):
+        """CPU seconds used by the host so far, as of its last reply."""
+        return self.host_cpu
+
+    def _request(self, op, data):
+        try:
+            return self.host.request(op, self.session, data, self.reply_timeout)
+        except Exception:
+            raise
+        except BaseException:
+            # Interrupted by the watchdog and the host was killed: the bot
+            # sits out the rest of the match
+            self.abandoned = True
+            raise
+
+    def respond_to_ask(self, message):
+        if self.abandoned:
+            return 'fold', 0
+        reply = self._request('ask', plain_message(message))
+        if reply[0] == ERROR:
+            raise BotHostError(reply[1:].decode(errors='replace'))
+        code, amount, self.host_cpu = ACTION_REPLY.unpack(reply)
+        if code >= len(ACTIONS):
+            return 'fold', 0
+        return ACTIONS[code], int(amount) if amount.is_integer() else amount
+
+    def receive_notification(self, message):
+        if message['message_type'] == 'round_start_message':
+            # Same log CountingBot keeps, for the replay's hole cards
+            self.hole_cards_log.append(message['hole_card'])
+        if self.abandoned:
+            return
+        try:
+            self.host.send('note', self.session, plain_message(message))
+        except Exception:
+            raise
+        except BaseException:
+            self.abandoned = True
+            raise
+
+    def close(self):
+        if not self.abandoned and self.host.alive():
+            self.host.send('close', self.session)
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 0)
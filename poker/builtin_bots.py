@@ -0,0 +1,69 @@
+"""
+Registry of the built-in opponents in bots/.
+
+The directory is scanned and every file validated (it must define `Bot`)
+once, then reused by every test run. A rescan happens at most every
+REFRESH_INTERVAL seconds and only reloads when a file was added, removed or
+changed. Each built-in bot has one shared TestBot row (user=None) instead
+of a copy per user.
+"""
+import os
+import threading
+import time
+from django.conf import settings
+from .models import TestBot
+from .utils import load_bot_class
+
+REFRESH_INTERVAL = 10.0
+SKIP_FILES = ('__init__.py', 'base.py')
+
+_lock = threading.Lock()
+_registry = {'signature': None, 'checked_at': 0.0, 'bots': []}
+
+
+def bots_dir():
+    return os.path.join(settings.BASE_DIR, 'bots')
+
+
+def _scan():
+    """(filename, mtime_ns, size) for each candidate bot file, sorted."""
+    entries = []
+    with os.scandir(bots_dir()) as it:
+        for entry in it:
+            if entry.name.endswith('.py') and entry.name not in SKIP_FILES and entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+def _load(signature):
+    bots = []
+    for filename, _, _ in signature:
+        path = os.path.join(bots_dir(), filename)
+        _, ok = load_bot_class(path)
+        if not ok:
+            continue  # Helper modules such as strategy_base.py
+        name = filename[:-len('.py')]
+        test_bot, _ = TestBot.objects.get_or_create(
+            user=None, name=name, defaults={'file': f'bots/{filename}'}
+        )
+        bots.append({'name': name, 'path': path, 'test_bot': test_bot})
+    return bots
+
+
+def get_builtin_bots():
+    """[{'name', 'path', 'test_bot'}, ...] for every valid built-in bot."""
+    with _lock:
+        now = time.monotonic()
+        if _registry['signature'] is None or now - _registry['checked_at'] >= REFRESH_INTERVAL:
+            signature = _scan()
+            if signature != _registry['signature']:
+                _registry['bots'] = _load(signature)
+                _registry['signature'] = signature
+            _registry['checked_at'] = now
+        return list(_registry['bots'])
+
+
+def reset():
+    with _lock:
+        _registry.update(signature=None, checked_at=0.0, bots=[])
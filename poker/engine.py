@@ -0,0 +1,614 @@
+"""
+Lean Hold'em engine, a drop-in replacement for
+pypokerengine.api.game.start_poker.
+
+It plays by PyPokerEngine's rules (including its quirks: blind and button
+rotation, min-raise, side pots, the round_state layout) and drives the same
+BasePokerPlayer callbacks with the same messages, but:
+
+- table state is a few slotted objects mutated in place, instead of a
+  serialized and deserialized Table per action;
+- paid-this-street, the street's last raise and seat rotations are kept or
+  precomputed instead of rescanned from the action histories;
+- a message is built only when it is delivered, once for all receivers,
+  and nothing is formatted for logs;
+- its round_state is a RoundStateView: a read-only mapping over an O(seats)
+  snapshot that builds each field on first access. A finished street's
+  action history is one shared, immutable segment, encoded at most once.
+
+It consumes the global `random` exactly like PyPokerEngine (100 seat uuids
+per game, one shuffle of a fresh deck per round), so a seeded game deals
+the same cards on both engines and bots see the same game.
+scripts/check_engine_parity.py plays built-in bots on both engines and
+compares every result.
+"""
+import random
+from collections import namedtuple
+from collections.abc import Mapping
+from pypokerengine.engine.card import Card
+from pypokerengine.engine.hand_evaluator import HandEvaluator
+
+PREFLOP, FLOP, TURN, RIVER, SHOWDOWN, FINISHED = range(6)
+STREET_NAMES = ('preflop', 'flop', 'turn', 'river', 'showdown', None)
+HISTORY_STREETS = ('preflop', 'flop', 'turn', 'river')
+
+# Seat states, as PayInfo statuses
+PARTICIPATING, ALLIN, FOLDED = 0, 1, 2
+STATE_NAMES = ('participating', 'allin', 'folded')
+NOT_FOUND = 'not_found'
+
+# PyPokerEngine card ids: rank (ace = 1) + 13 * suit index (C, D, H, S)
+CARDS = [None] + [Card.from_id(card_id) for card_id in range(1, 53)]
+CARD_NAMES = [None] + [str(card) for card in CARDS[1:]]
+UUID_CHARS = [chr(code) for code in range(97, 123)]
+UUID_SIZE = 22
+
+
+class _Seat:
+    __slots__ = ('pos', 'name', 'uuid', 'algorithm', 'stack', 'hole', 'status',
+                 'pay', 'paid', 'histories')
+
+    def __init__(self, pos, name, uuid, algorithm, stack):
+        self.pos = pos
+        self.name = name
+        self.uuid = uuid
+        self.algorithm = algorithm
+        self.stack = stack
+        self.hole = []
+        self.status = PARTICIPATING
+        self.pay = 0                         # Chips put in this round (PayInfo.amount)
+        self.paid = 0                        # Bet this street (Player.paid_sum)
+        self.histories = []                  # This street's actions (append-only)
+
+    def collect(self, amount):
+        if self.stack < amount:
+            raise ValueError("Failed to collect %d chips. Because he has only %d chips" % (amount, self.stack))
+        self.stack -= amount
+        self.pay += amount
+
+    def reset(self):
+        self.hole = []
+        self.status = PARTICIPATING
+        self.pay = 0
+        self.paid = 0
+        self.histories = []
+
+    def snapshot(self):
+        return _SeatState(self.name, self.uuid, self.stack, self.status, self.pay)
+
+    def encode(self):
+        return _encode_seat(self)
+
+
+def _encode_seat(seat):
+    return {'name': seat.name, 'uuid': seat.uuid, 'stack': seat.stack, 'state': STATE_NAMES[seat.status]}
+
+
+def _pots(seats):
+    """[(amount, eligible seats)]: side pots by all-in amount, then the main pot."""
+    pots = []
+    side_total = 0
+    for allin_amount in sorted(seat.pay for seat in seats if seat.status == ALLIN):
+        amount = sum(min(allin_amount, seat.pay) for seat in seats) - side_total
+        pots.append((amount, [seat for seat in seats
+                              if seat.pay >= allin_amount and seat.status != FOLDED]))
+        side_total += amount
+    max_pay = max(seat.pay for seat in seats)
+    pots.append((sum(seat.pay for seat in seats) - side_total,
+                 [seat for seat in seats if seat.pay == max_pay]))
+    return pots
+
+
+def _interleave(histories, order, lengths=None):
+    """One street's actions, round by round in seat `order` (PyPokerEngine's layout)."""
+    if lengths is None:
+        lengths = [len(h) for h in histories]
+    ordered = [(histories[p], lengths[p]) for p in order]
+    longest = max(length for _, length in ordered)
+    return [h[i] for i in range(longest) for h, length in ordered if i < length]
+
+
+# Round state views -------------------------------------------------------------
+
+_SeatState = namedtuple('_SeatState', 'name uuid stack status pay')
+
+
+class _Segment:
+    """A finished street's action histories, encoded once and shared by every later view."""
+    __slots__ = ('histories', 'order', 'encoded')
+
+    def __init__(self, histories, order):
+        self.histories = histories
+        self.order = order
+        self.encoded = None
+
+    def encode(self):
+        if self.encoded is None:
+            self.encoded = _interleave(self.histories, self.order)
+        return self.encoded
+
+
+ROUND_STATE_KEYS = ('street', 'pot', 'community_card', 'dealer_btn', 'next_player',
+                    'small_blind_pos', 'big_blind_pos', 'round_count', 'small_blind_amount',
+                    'seats', 'action_histories')
+_SCALAR_KEYS = {'street': 0, 'dealer_btn': 1, 'next_player': 2, 'small_blind_pos': 3,
+                'big_blind_pos': 4, 'round_count': 5, 'small_blind_amount': 6}
+
+
+class RoundStateView(Mapping):
+    """
+    Read-only round_state, with the keys and values of PyPokerEngine's dict.
+
+    Creating one copies only scalars, one tuple per seat and the lengths of
+    this street's histories; pot, seats, community cards and action
+    histories are built on first access and cached. Values are shared with
+    every receiver of the event (and finished streets' history lists with
+    later events), so bots must not modify them. dict(view) gives a plain copy.
+    """
+    __slots__ = ('_scalars', '_seats', '_community', '_segments', '_current', '_lengths', '_order', '_cache')
+
+    def __init__(self, scalars, seats, community, segments, current, lengths, order):
+        self._scalars = scalars
+        self._seats = seats
+        self._community = community
+        self._segments = segments
+        self._current = current
+        self._lengths = lengths
+        self._order = order
+        self._cache = {}
+
+    def __getitem__(self, key):
+        index = _SCALAR_KEYS.get(key)
+        if index is not None:
+            return self._scalars[index]
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        if key == 'pot':
+            pots = _pots(self._seats)
+            value = {
+                'main': {'amount': pots[0][0]},
+                'side': [{'amount': amount, 'eligibles': [seat.uuid for seat in eligibles]}
+                         for amount, eligibles in pots[1:]]
+            }
+        elif key == 'community_card':
+            value = [CARD_NAMES[card] for card in self._community]
+        elif key == 'seats':
+            value = [_encode_seat(seat) for seat in self._seats]
+        elif key == 'action_histories':
+            streets = [segment.encode() for segment in self._segments]
+            if len(streets) < len(HISTORY_STREETS):
+                streets.append(_interleave(self._current, self._order, self._lengths))
+            value = dict(zip(HISTORY_STREETS, streets))
+        else:
+            raise KeyError(key)
+        self._cache[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(ROUND_STATE_KEYS)
+
+    def __len__(self):
+        return len(ROUND_STATE_KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self):
+        return dict(self)
+
+
+class _ActionHistoriesView(Mapping):
+    """The {'action_histories': ...} entry of ask and game update messages."""
+    __slots__ = ('_round_state',)
+
+    def __init__(self, round_state):
+        self._round_state = round_state
+
+    def __getitem__(self, key):
+        if key != 'action_histories':
+            raise KeyError(key)
+        return self._round_state['action_histories']
+
+    def __iter__(self):
+        return iter(('action_histories',))
+
+    def __len__(self):
+        return 1
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def plain_message(message):
+    """A copy of `message` with its views turned into dicts, for marshal or pickle."""
+    return {key: dict(value) if isinstance(value, (RoundStateView, _ActionHistoriesView)) else value
+            for key, value in message.items()}
+
+
+def _generate_uuid():
+    return ''.join([random.choice(UUID_CHARS) for _ in range(UUID_SIZE)])
+
+
+class Game:
+    def __init__(self, config):
+        config.validation()
+        self.initial_stack = config.initial_stack
+        self.max_round = config.max_round
+        self.small_blind_amount = config.sb_amount
+        self.ante = config.ante or 0
+        self.blind_structure = config.blind_structure
+
+        # Same uuids, drawn the same way, as the PyPokerEngine Dealer
+        uuids = [_generate_uuid() for _ in range(100)]
+        self.seats = []
+        for pos, info in enumerate(config.players_info):
+            seat = _Seat(pos, info['name'], uuids.pop(), info['algorithm'], config.initial_stack)
+            info['algorithm'].set_uuid(seat.uuid)
+            self.seats.append(seat)
+
+        n = len(self.seats)
+        # after[p]: the other seats clockwise from p, then p itself
+        self.after = [[(p + k) % n for k in range(1, n + 1)] for p in range(n)]
+        # from_pos[p]: every seat clockwise starting at p
+        self.from_pos = [[(p + k) % n for k in range(n)] for p in range(n)]
+        self.dealer_btn = 0
+        self.sb_pos = self.bb_pos = None
+
+    # Game ---------------------------------------------------------------------
+
+    def rule(self):
+        return {
+            'initial_stack': self.initial_stack,
+            'max_round': self.max_round,
+            'small_blind_amount': self.small_blind_amount,
+            'ante': self.ante,
+            'blind_structure': self.blind_structure
+        }
+
+    def play(self):
+        self.broadcast({
+            'message_type': 'game_start_message',
+            'game_information': {
+                'player_num': len(self.seats),
+                'rule': self.rule(),
+                'seats': self.encode_seats()
+            }
+        })
+        ante, sb_amount = self.ante, self.small_blind_amount
+        for round_count in range(1, self.max_round + 1):
+            if round_count in self.blind_structure:
+                level = self.blind_structure[round_count]
+                ante, sb_amount = level['ante'], level['small_blind']
+            self.exclude_short_of_money_players(ante, sb_amount)
+            if self.count(lambda seat: seat.status != FOLDED) == 1:
+                break
+            self.play_round(round_count, sb_amount, ante)
+            self.dealer_btn = self.next_active_pos(self.dealer_btn)
+        return {'rule': self.rule(), 'players': self.encode_seats()}
+
+    def exclude_short_of_money_players(self, ante, sb_amount):
+        seats = self.seats
+        for seat in seats:
+            if seat.stack < ante:
+                seat.stack = 0
+        if seats[self.dealer_btn].stack == 0:
+            self.dealer_btn = self.next_active_pos(self.dealer_btn)
+
+        # Small blind: the first seat after the button that can pay it
+        targets = [seats[p] for p in self.after[self.dealer_btn]]
+        sb_index = next(i for i, seat in enumerate(targets) if seat.stack >= sb_amount + ante)
+        for seat in targets[:sb_index]:
+            seat.stack = 0
+        sb_seat = targets[sb_index]
+
+        # Big blind: the first seat after that one that can pay it
+        targets = targets[sb_index + 1:sb_index + len(seats)]
+        bb_index = next((i for i, seat in enumerate(targets) if seat.stack >= sb_amount * 2 + ante), None)
+        if bb_index is None:
+            # Nobody can pay the big blind: everyone but the small blind is out
+            for seat in seats:
+                if seat is not sb_seat:
+                    seat.stack = 0
+            bb_seat = sb_seat
+        else:
+            for seat in targets[:bb_index]:
+                seat.stack = 0
+            bb_seat = targets[bb_index]
+
+        for seat in seats:
+            if seat.stack == 0:
+                seat.status = FOLDED
+        self.sb_pos, self.bb_pos = sb_seat.pos, bb_seat.pos
+        if seats[self.dealer_btn].stack == 0:
+            self.dealer_btn = self.next_active_pos(self.dealer_btn)
+
+    # Round --------------------------------------------------------------------
+
+    def play_round(self, round_count, sb_amount, ante):
+        self.round_count = round_count
+        self.sb_amount = sb_amount
+        self.street = PREFLOP
+        self.community = []
+        self.segments = []  # One _Segment per finished street
+        self.view_seats = None  # Per-seat part of the round_state snapshot, see round_state()
+        self.last_raise = None
+        self.last_raise_pos = None
+        self.deck = list(range(1, 53))
+        random.shuffle(self.deck)
+
+        seats = self.seats
+        if ante:
+            for seat in seats:
+                if seat.status != FOLDED:
+                    seat.collect(ante)
+                    seat.histories.append({'action': 'ANTE', 'amount': ante, 'uuid': seat.uuid})
+        self.post_blind(seats[self.sb_pos], 'SMALLBLIND', sb_amount, sb_amount)
+        self.post_blind(seats[self.bb_pos], 'BIGBLIND', sb_amount * 2, sb_amount)
+        for seat in seats:
+            seat.hole = [self.deck.pop(), self.deck.pop()]
+        for seat in seats:
+            seat.algorithm.receive_notification({
+                'message_type': 'round_start_message',
+                'round_count': round_count,
+                'hole_card': [CARD_NAMES[card] for card in seat.hole],
+                'seats': self.encode_seats()
+            })
+
+        self.start_street()
+        while self.street != FINISHED:
+            seat = seats[self.next_player]
+            action, amount = seat.algorithm.respond_to_ask(self.ask_message(seat))
+            self.apply_action(action, amount)
+
+    def post_blind(self, seat, action, amount, sb_amount):
+        seat.collect(amount)
+        seat.paid = amount
+        history = {'action': action, 'amount': amount, 'add_amount': sb_amount, 'uuid': seat.uuid}
+        seat.histories.append(history)
+        self.record_raise(seat.pos, history)
+
+    def start_street(self):
+        while True:
+            self.next_player = self.next_waiting_pos(self.sb_pos - 1)
+            if self.street == PREFLOP:
+                for _ in range(2):
+                    self.next_player = self.next_waiting_pos(self.next_player)
+            elif self.street == FLOP:
+                self.community += [self.deck.pop() for _ in range(3)]
+            elif self.street in (TURN, RIVER):
+                self.community.append(self.deck.pop())
+            else:
+                self.showdown()
+                return
+
+            if self.count(lambda seat: seat.status != FOLDED) != 1:
+                self.broadcast({
+                    'message_type': 'street_start_message',
+                    'round_state': self.round_state(),
+                    'street': STREET_NAMES[self.street]
+                })
+            if self.count(lambda seat: seat.status == PARTICIPATING) > 1:
+                return  # The main loop asks next_player
+            self.street += 1
+
+    def apply_action(self, declared_action, declared_amount):
+        seat = self.seats[self.next_player]
+        action, amount = self.correct_action(seat, declared_action, declared_amount)
+        if self.is_allin(seat, action, amount):
+            seat.status = ALLIN
+
+        if action == 'call':
+            paid = amount - seat.paid
+            seat.collect(paid)
+            seat.histories.append({'action': 'CALL', 'amount': amount, 'paid': paid, 'uuid': seat.uuid})
+            seat.paid = amount
+        elif action == 'raise':
+            paid = amount - seat.paid
+            seat.collect(paid)
+            history = {'action': 'RAISE', 'amount': amount, 'paid': paid,
+                       'add_amount': amount - self.agree_amount(), 'uuid': seat.uuid}
+            seat.histories.append(history)
+            seat.paid = amount
+            self.record_raise(seat.pos, history)
+        elif action == 'fold':
+            seat.histories.append({'action': 'FOLD', 'uuid': seat.uuid})
+            seat.status = FOLDED
+        else:
+            raise ValueError("Unexpected action %s received" % action)
+        self.touch(seat)
+
+        # Like PyPokerEngine, report the action as declared, not as corrected
+        round_state = self.round_state()
+        self.broadcast({
+            'message_type': 'game_update_message',
+            'action': {'player_uuid': seat.uuid, 'action': declared_action, 'amount': declared_amount},
+            'round_state': round_state,
+            'action_histories': _ActionHistoriesView(round_state)
+        })
+
+        if self.is_everyone_agreed():
+            # The street's lists are never appended to again; views share them
+            self.segments.append(_Segment([each.histories for each in self.seats], self.from_pos[self.sb_pos]))
+            for each in self.seats:
+                each.histories = []
+                each.paid = 0
+            self.view_seats = None
+            self.last_raise = self.last_raise_pos = None
+            self.street += 1
+            self.start_street()
+        else:
+            self.next_player = self.next_waiting_pos(self.next_player)
+
+    def is_everyone_agreed(self):
+        seats = self.seats
+        max_pay = max(seat.paid for seat in seats)
+        preflop = self.street == PREFLOP
+
+        def agreed(seat):
+            if seat.status != PARTICIPATING:
+                return True
+            histories = seat.histories
+            # The big blind is asked at least once before the flop
+            bb_unasked = preflop and len(histories) == 1 and histories[0]['action'] == 'BIGBLIND'
+            return not bb_unasked and seat.paid == max_pay and len(histories) != 0
+
+        if all(agreed(seat) for seat in seats):
+            return True
+        if self.count(lambda seat: seat.status != FOLDED) == 1:
+            return True
+        if self.count(lambda seat: seat.status == PARTICIPATING) == 1:
+            next_pos = self.next_waiting_pos(self.next_player)
+            return next_pos != NOT_FOUND and seats[next_pos].paid == max_pay
+        return False
+
+    def showdown(self):
+        seats = self.seats
+        community = [CARDS[card] for card in self.community]
+        scores = {}
+
+        def winners_from(candidates):
+            active = [seat for seat in candidates if seat.status != FOLDED]
+            for seat in active:
+                if seat.pos not in scores:
+                    scores[seat.pos] = HandEvaluator.eval_hand([CARDS[card] for card in seat.hole], community)
+            best = max(scores[seat.pos] for seat in active)
+            return [seat for seat in active if scores[seat.pos] == best]
+
+        winners = winners_from(seats)
+        active = [seat for seat in seats if seat.status != FOLDED]
+        hand_info = [] if len(active) == 1 else [
+            {'uuid': seat.uuid,
+             'hand': HandEvaluator.gen_hand_rank_info([CARDS[card] for card in seat.hole], community)}
+            for seat in active
+        ]
+        prizes = [0] * len(seats)
+        for amount, eligibles in _pots(seats):
+            pot_winners = winners_from(eligibles)
+            prize = int(amount / len(pot_winners))
+            for seat in pot_winners:
+                prizes[seat.pos] += prize
+        for seat, prize in zip(seats, prizes):
+            seat.stack += prize
+        self.view_seats = None
+
+        self.broadcast({
+            'message_type': 'round_result_message',
+            'round_count': self.round_count,
+            'hand_info': hand_info,
+            'round_state': self.round_state(),
+            'winners': [seat.encode() for seat in winners]
+        })
+        for seat in seats:
+            seat.reset()
+        self.community = []
+        self.street = FINISHED
+
+    # Rules --------------------------------------------------------------------
+
+    def record_raise(self, pos, history):
+        # The street's last raise is its largest bet; on a tie, the one
+        # PyPokerEngine would find first scanning seats in order
+        best = self.last_raise
+        if (best is None or history['amount'] > best['amount'] or
+                (history['amount'] == best['amount'] and pos < self.last_raise_pos)):
+            self.last_raise, self.last_raise_pos = history, pos
+
+    def agree_amount(self):
+        return self.last_raise['amount'] if self.last_raise else 0
+
+    def min_raise_amount(self):
+        if self.last_raise:
+            return self.last_raise['amount'] + self.last_raise['add_amount']
+        return self.sb_amount * 2
+
+    def is_allin(self, seat, action, amount):
+        if action == 'call':
+            return amount >= seat.stack + seat.paid
+        if action == 'raise':
+            return amount == seat.stack + seat.paid
+        return False
+
+    def correct_action(self, seat, action, amount):
+        if self.is_allin(seat, action, amount):
+            return action, seat.stack + seat.paid
+        if action == 'call':
+            illegal = seat.stack < amount - seat.paid or amount != self.agree_amount()
+        elif action == 'raise':
+            illegal = seat.stack < amount - seat.paid or self.min_raise_amount() > amount
+        else:
+            illegal = False
+        return ('fold', 0) if illegal else (action, amount)
+
+    def legal_actions(self, seat):
+        min_raise = self.min_raise_amount()
+        max_raise = seat.stack + seat.paid
+        if max_raise < min_raise:
+            min_raise = max_raise = -1
+        return [
+            {'action': 'fold', 'amount': 0},
+            {'action': 'call', 'amount': self.agree_amount()},
+            {'action': 'raise', 'amount': {'min': min_raise, 'max': max_raise}}
+        ]
+
+    # Seats --------------------------------------------------------------------
+
+    def count(self, check):
+        return sum(1 for seat in self.seats if check(seat))
+
+    def next_active_pos(self, start):
+        seats = self.seats
+        return next((p for p in self.after[start]
+                     if seats[p].status != FOLDED and seats[p].stack != 0), NOT_FOUND)
+
+    def next_waiting_pos(self, start):
+        seats = self.seats
+        return next((p for p in self.after[start] if seats[p].status == PARTICIPATING), NOT_FOUND)
+
+    # Messages -----------------------------------------------------------------
+
+    def broadcast(self, message):
+        for seat in self.seats:
+            seat.algorithm.receive_notification(message)
+
+    def encode_seats(self):
+        return [seat.encode() for seat in self.seats]
+
+    def round_state(self):
+        # Seat states and this street's history lengths are kept between
+        # events and patched for the one seat that acted (touch)
+        if self.view_seats is None:
+            seats = self.seats
+            self.view_seats = (tuple(seat.snapshot() for seat in seats),
+                               tuple(seat.histories for seat in seats),
+                               tuple(len(seat.histories) for seat in seats))
+        states, current, lengths = self.view_seats
+        return RoundStateView(
+            (STREET_NAMES[self.street], self.dealer_btn, self.next_player, self.sb_pos,
+             self.bb_pos, self.round_count, self.sb_amount),
+            states, tuple(self.community), tuple(self.segments), current, lengths,
+            self.from_pos[self.sb_pos]
+        )
+
+    def touch(self, seat):
+        if self.view_seats is not None:
+            states, current, lengths = self.view_seats
+            pos = seat.pos
+            self.view_seats = (states[:pos] + (seat.snapshot(),) + states[pos + 1:], current,
+                               lengths[:pos] + (len(seat.histories),) + lengths[pos + 1:])
+
+    def ask_message(self, seat):
+        round_state = self.round_state()
+        return {
+            'message_type': 'ask_message',
+            'hole_card': [CARD_NAMES[card] for card in seat.hole],
+            'valid_actions': self.legal_actions(seat),
+            'round_state': round_state,
+            'action_histories': _ActionHistoriesView(round_state)
+        }
+
+
+def start_poker(config, verbose=0):
+    """Play a game set up with pypokerengine's setup_config; same result as its start_poker."""
+    return Game(config).play()
@@ -0,0 +1,276 @@
+"""
+DB-backed queue for test runs.
+
+`test_run` only saves the uploaded bot and queues a TestRunJob; a worker
+claims queued jobs, runs the tournament, saves the best/worst matches and
+stats, and stores the results on the job. The results page polls the job's
+status until it is done.
+
+Workers:
+- settings.TEST_RUN_WORKER == 'thread' (default): a daemon thread inside the
+  web process, started when the server loads the WSGI/ASGI application
+  (pokermania/wsgi.py, asgi.py), so jobs left queued by a restart are picked
+  up without a new submission.
+- settings.TEST_RUN_WORKER == 'external': run `python manage.py run_test_jobs`
+  alongside the web server.
+
+A job whose worker died (crash or restart mid-job) would stay running
+forever; workers fail running jobs older than TEST_RUN_STALE_AFTER seconds,
+on startup and then every STALE_SWEEP_INTERVAL seconds.
+"""
+import os
+import threading
+import time
+import traceback
+from django.conf import settings
+from datetime import timedelta
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+from .models import Bot, TestMatch, TestRunJob
+from .tournament_runner import deal_winner, run_tournament
+from .sequential import SequentialStop
+from .stats import apply_participant_stats
+from .builtin_bots import get_builtin_bots
+
+POLL_INTERVAL = 1.0
+STALE_SWEEP_INTERVAL = 60.0
+
+_wakeup = threading.Event()
+_worker_thread = None
+_worker_lock = threading.Lock()
+
+
+class TestRunError(Exception):
+    """Expected failure of a test run; the message is shown to the user."""
+
+
+def submit_test_run(user, test_bot, iterations=50):
+    job = TestRunJob.objects.create(user=user, test_bot=test_bot, iterations=iterations)
+    if getattr(settings, 'TEST_RUN_WORKER', 'thread') == 'thread':
+        # Start the worker once the job row is visible to other connections
+        transaction.on_commit(ensure_worker_thread)
+    return job
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running, or return None."""
+    while True:
+        job = TestRunJob.objects.filter(status=TestRunJob.QUEUED).order_by('created_at', 'id').first()
+        if job is None:
+            return None
+        # Conditional update so two workers never claim the same job
+        claimed = TestRunJob.objects.filter(id=job.id, status=TestRunJob.QUEUED).update(
+            status=TestRunJob.RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def fail_stale_jobs():
+    """Fail running jobs whose worker must have died; returns how many."""
+    stale_after = getattr(settings, 'TEST_RUN_STALE_AFTER', 1800)
+    if not stale_after:
+        return 0
+    now = timezone.now()
+    return TestRunJob.objects.filter(
+        status=TestRunJob.RUNNING, started_at__lt=now - timedelta(seconds=stale_after)
+    ).update(
+        status=TestRunJob.FAILED, finished_at=now,
+        error="The test run was interrupted (server restart?). Please run it again."
+    )
+
+
+def run_job(job):
+    try:
+        results = run_test_run(job)
+    except TestRunError as e:
+        _finish(job, TestRunJob.FAILED, error=str(e))
+    except Exception as e:
+        traceback.print_exc()
+        _finish(job, TestRunJob.FAILED, error=f"Unexpected error occurred: {str(e)}")
+    else:
+        _finish(job, TestRunJob.DONE, results=results)
+
+
+def _finish(job, status, results=None, error=""):
+    TestRunJob.objects.filter(id=job.id).update(
+        status=status, results=results, error=error, finished_at=timezone.now()
+    )
+
+
+def _games(user_bot_name, metadata):
+    """
+    (players, winner) of each game played. In duplicate mode the seat
+    rotations of one deal are a single game, won by the bot with the most
+    chips summed over them.
+    """
+    deals = {}
+    for m in metadata:
+        deals.setdefault(m.get('deal', m['iteration']), []).append(m)
+    for matches in deals.values():
+        yield [user_bot_name] + matches[0]['opponents'], deal_winner(user_bot_name, matches)
+
+
+def run_test_run(job):
+    user = job.user
+    new_test_bot = job.test_bot
+
+    # 1. Built-in bots, from the registry (shared TestBot rows)
+    builtin_opponents = []
+    test_bot_objects = {}
+    for builtin in get_builtin_bots():
+        builtin_opponents.append({'name': builtin['name'], 'path': builtin['path']})
+        test_bot_objects[builtin['name']] = builtin['test_bot']
+
+    # 2. Collect permanently uploaded bots from other users
+    permanent_opponents = [
+        {'name': name, 'path': path}
+        for name, path in Bot.objects.exclude(user=user).values_list('name', 'path')
+        if os.path.exists(path)
+    ]
+
+    def report_progress(done, total):
+        # In deals (job.iterations), however many seat rotations each has
+        TestRunJob.objects.filter(id=job.id).update(progress=done * job.iterations // total)
+
+    # job.iterations is the cap; clear-cut runs stop once the win rate is pinned down
+    stop = None
+    if settings.TEST_RUN_WIN_RATE_MARGIN:
+        stop = SequentialStop(
+            win_rate_margin=settings.TEST_RUN_WIN_RATE_MARGIN,
+            min_matches=settings.TEST_RUN_MIN_MATCHES
+        )
+
+    try:
+        best_match, worst_match, metadata = run_tournament(
+            new_test_bot, builtin_opponents, permanent_opponents,
+            iterations=job.iterations, num_workers=settings.TOURNAMENT_WORKERS,
+            progress=report_progress, seed=settings.TOURNAMENT_SEED,
+            duplicate=settings.TOURNAMENT_DUPLICATE, stop=stop
+        )
+    except Exception as e:
+        raise TestRunError(f"Error executing match: {str(e)}")
+
+    if not best_match or not worst_match:
+        raise TestRunError("Error executing tournament")
+
+    def get_match_players(match_info):
+        # Seat order of the match, so the replay lines up with the rounds
+        players = []
+        for name in match_info['seat_order']:
+            if name == new_test_bot.name:
+                players.append(new_test_bot)
+            elif name in test_bot_objects:
+                players.append(test_bot_objects[name])
+        return players
+
+    # Prepare results
+    participant_stats = {}
+    for all_players, winner in _games(new_test_bot.name, metadata):
+        for p_name in all_players:
+            if p_name not in participant_stats:
+                participant_stats[p_name] = {'wins': 0, 'games': 0}
+            participant_stats[p_name]['games'] += 1
+            if winner == p_name:
+                participant_stats[p_name]['wins'] += 1
+
+    # Only the writes run in a transaction, not the tournament itself
+    with transaction.atomic():
+        try:
+            best_players = get_match_players(best_match)
+            best_test_match = TestMatch.objects.create(
+                winner=best_match['winner'],
+                rounds=best_match['rounds_data'],
+                player_order=[b.id for b in best_players]
+            )
+            best_test_match.players.set(best_players)
+
+            worst_players = get_match_players(worst_match)
+            worst_test_match = TestMatch.objects.create(
+                winner=worst_match['winner'],
+                rounds=worst_match['rounds_data'],
+                player_order=[b.id for b in worst_players]
+            )
+            worst_test_match.players.set(worst_players)
+
+        except Exception as e:
+            raise TestRunError(f"Error saving match results: {str(e)}")
+
+        # Update all involved bots (permanent and test), one UPDATE per table
+        apply_participant_stats(participant_stats)
+
+    # Safe extraction of current bot's session stats
+    curr_stats = participant_stats.get(new_test_bot.name, {'wins': 0, 'games': 1})
+    wins = curr_stats['wins']
+    total_games = curr_stats['games']
+    win_rate = round((wins / total_games) * 100, 2) if total_games > 0 else 0
+    losses = total_games - wins
+    timeouts = sum(m.get('timeouts', {}).get(new_test_bot.name, 0) for m in metadata)
+
+    return {
+        'best_match_id': best_test_match.id,
+        'worst_match_id': worst_test_match.id,
+        'opponents': [op['name'] for op in (builtin_opponents + permanent_opponents)],
+        'best_winner': best_match['winner'],
+        'best_user_stack': best_match['stack'],
+        'worst_winner': worst_match['winner'],
+        'worst_user_stack': worst_match['stack'],
+        # Per-match summaries; the rounds of the best/worst match are saved as TestMatch
+        'metadata': [{key: value for key, value in m.items() if key != 'rounds_data'} for m in metadata],
+        'wins': wins,
+        'losses': losses,
+        'win_rate': win_rate,
+        'total_games': total_games,
+        'timeouts': timeouts,
+        'precision': stop.summary() if stop else None
+    }
+
+
+def work(stop_when_idle=False):
+    """Worker loop: run queued jobs one at a time, polling when idle."""
+    last_sweep = None
+    while True:
+        close_old_connections()
+        try:
+            if last_sweep is None:
+                get_builtin_bots()  # Load the registry up front, not on the first job
+            if last_sweep is None or time.monotonic() - last_sweep >= STALE_SWEEP_INTERVAL:
+                fail_stale_jobs()
+                last_sweep = time.monotonic()
+            job = claim_next_job()
+        except DatabaseError:
+            # e.g. the server started before migrations were applied
+            if stop_when_idle:
+                raise
+            _wakeup.wait(POLL_INTERVAL)
+            _wakeup.clear()
+            continue
+        if job is None:
+            if stop_when_idle:
+                return
+            _wakeup.wait(POLL_INTERVAL)
+            _wakeup.clear()
+            continue
+        run_job(job)
+
+
+def ensure_worker_thread():
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=work, name="test-run-worker", daemon=True)
+            _worker_thread.start()
+    _wakeup.set()
+
+
+def start_worker_on_startup():
+    """
+    Called by pokermania/wsgi.py and asgi.py: start the thread worker in web
+    server processes (runserver loads the WSGI application too). Management
+    commands and scripts that only call django.setup() don't get one; their
+    tournaments would otherwise fork pool workers while this thread imports
+    bot files, and a fork taken mid-import deadlocks the child.
+    """
+    if getattr(settings, 'TEST_RUN_WORKER', 'thread') == 'thread':
+        ensure_worker_thread()
@@ -0,0 +1,45 @@
+"""
+Materialized leaderboard snapshot.
+
+The ranked rows are built with one query (bots joined to their owners, read
+in (-win_rate, -wins) order through the bot_leaderboard_idx index) and kept
+in Django's cache, so the public page is served from memory. Anything that
+writes bot stats calls `invalidate_leaderboard()` once the write has
+committed (`transaction.on_commit`); LEADERBOARD_CACHE_SECONDS
+bounds how stale a snapshot can get when another process did the writing
+and the cache backend is not shared between processes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from .models import Bot
+
+CACHE_KEY = 'poker:leaderboard'
+
+
+def build_leaderboard():
+    bots = (Bot.objects.select_related('user')
+            .only('name', 'wins', 'chips_won', 'win_rate', 'user__username')
+            .order_by('-win_rate', '-wins'))
+    return [
+        {
+            'rank': i + 1,
+            'botName': bot.name,
+            'owner': bot.user.username,
+            'wins': bot.wins,
+            'earnings': bot.chips_won,
+            'win_rate': bot.win_rate
+        }
+        for i, bot in enumerate(bots)
+    ]
+
+
+def get_leaderboard():
+    data = cache.get(CACHE_KEY)
+    if data is None:
+        data = build_leaderboard()
+        cache.set(CACHE_KEY, data, settings.LEADERBOARD_CACHE_SECONDS)
+    return data
+
+
+def invalidate_leaderboard():
+    cache.delete(CACHE_KEY)
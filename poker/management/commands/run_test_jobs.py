@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from poker.jobs import work
+
+
+class Command(BaseCommand):
+    help = "Run queued test-run jobs (use with TEST_RUN_WORKER=external)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Exit when the queue is empty instead of polling")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Waiting for test-run jobs...")
+        work(stop_when_idle=options['once'])
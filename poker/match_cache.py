@@ -0,0 +1,133 @@
+"""
+Result cache for tournament matches.
+
+The same built-in and permanent bots meet again and again across test runs.
+A seeded match is deterministic (see poker/rng.py), so its outcome depends
+only on:
+
+- the bots in their seats: name and a hash of the file contents
+- the shared helper code the bots import (bots/base.py, bots/strategy_base.py
+  and everything in bots/utils/, tables included), as one hash
+- the match seed and seat rotation
+- the engine configuration (rounds, stacks, blinds, time budgets), the
+  engine itself (settings.POKER_ENGINE) and CACHE_VERSION
+
+`match_key` turns those into a key and the cache maps it to the match result
+from run_single_match. Editing a bot file changes its hash, so old results
+are never served for it again; they simply age out. Entries are kept in LRU
+order and bounded by MATCH_CACHE_SIZE, with rounds_data stored packed by
+round_codec to keep them small.
+
+Only seeded tournaments use the cache: unseeded ones deal fresh decks every
+match, so nothing repeats. Test runs are seeded when TOURNAMENT_SEED is set.
+"""
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from glob import glob
+from django.conf import settings
+from .round_codec import encode_rounds, decode_rounds
+
+# Bump when the match result format or anything else affecting outcomes changes
+CACHE_VERSION = 2
+
+_results = OrderedDict()
+_results_stats = {'hits': 0, 'misses': 0}
+_results_lock = threading.Lock()
+
+# File hashes keyed by path, reused while (mtime, size) are unchanged; LRU,
+# at most FILE_HASH_CACHE_SIZE files
+FILE_HASH_CACHE_SIZE = 1024
+_file_hashes = OrderedDict()
+_file_hashes_lock = threading.Lock()
+
+
+def file_hash(path):
+    stat = os.stat(path)
+    path = os.path.abspath(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _file_hashes_lock:
+        cached = _file_hashes.get(path)
+        if cached and cached[0] == signature:
+            _file_hashes.move_to_end(path)
+            return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with _file_hashes_lock:
+        _file_hashes[path] = (signature, digest)
+        _file_hashes.move_to_end(path)
+        while len(_file_hashes) > FILE_HASH_CACHE_SIZE:
+            _file_hashes.popitem(last=False)
+    return digest
+
+
+def helper_paths():
+    bots_dir = os.path.join(str(settings.BASE_DIR), 'bots')
+    paths = [os.path.join(bots_dir, 'base.py'), os.path.join(bots_dir, 'strategy_base.py')]
+    paths += [path for path in glob(os.path.join(bots_dir, 'utils', '*')) if os.path.isfile(path)]
+    return sorted(path for path in paths if os.path.exists(path))
+
+
+def helpers_hash():
+    """One hash over the helper files; changes whenever any of them does."""
+    digest = hashlib.sha256()
+    for path in helper_paths():
+        digest.update(f'{os.path.basename(path)}:{file_hash(path)};'.encode())
+    return digest.hexdigest()
+
+
+def match_key(seated_bots, seed, engine_config, rotation=0):
+    """seated_bots: [{'name', 'path'}, ...] in seat order."""
+    seats = tuple((bot['name'], file_hash(bot['path'])) for bot in seated_bots)
+    engine = getattr(settings, 'POKER_ENGINE', 'fast')
+    return (CACHE_VERSION, seats, helpers_hash(), seed, rotation, tuple(engine_config), engine)
+
+
+def cache_size():
+    return getattr(settings, 'MATCH_CACHE_SIZE', 500)
+
+
+def get(key):
+    with _results_lock:
+        entry = _results.get(key)
+        if entry is None:
+            _results_stats['misses'] += 1
+            return None
+        _results_stats['hits'] += 1
+        _results.move_to_end(key)
+    result, packed_rounds = entry
+    result = copy.deepcopy(result)
+    result['rounds_data'] = decode_rounds(packed_rounds)
+    return result
+
+
+def put(key, result):
+    maxsize = cache_size()
+    if maxsize <= 0:
+        return
+    stored = {k: v for k, v in result.items() if k != 'rounds_data'}
+    entry = (copy.deepcopy(stored), encode_rounds(result['rounds_data']))
+    with _results_lock:
+        _results[key] = entry
+        _results.move_to_end(key)
+        while len(_results) > maxsize:
+            _results.popitem(last=False)
+
+
+def cache_info():
+    return {
+        'hits': _results_stats['hits'],
+        'misses': _results_stats['misses'],
+        'size': len(_results),
+        'maxsize': cache_size(),
+    }
+
+
+def clear():
+    with _results_lock:
+        _results.clear()
+        _results_stats['hits'] = _results_stats['misses'] = 0
+    with _file_hashes_lock:
+        _file_hashes.clear()
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:10
+
+from django.db import migrations, models
+
+from poker.migrations._round_codec_v1 import encode_rounds, decode_rounds
+
+
+def pack_rounds(apps, schema_editor):
+    for model_name in ('Match', 'TestMatch'):
+        model = apps.get_model('poker', model_name)
+        for match in model.objects.filter(rounds_blob__isnull=True).iterator():
+            rounds = match.rounds_data
+            if not isinstance(rounds, list) or not rounds:
+                continue
+            try:
+                blob = encode_rounds(rounds)
+                # Only convert rows that survive a lossless round trip
+                if decode_rounds(blob) != rounds:
+                    continue
+            except (KeyError, TypeError, ValueError):
+                continue
+            match.rounds_blob = blob
+            match.rounds_data = []
+            match.save(update_fields=['rounds_blob', 'rounds_data'])
+
+
+def unpack_rounds(apps, schema_editor):
+    for model_name in ('Match', 'TestMatch'):
+        model = apps.get_model('poker', model_name)
+        for match in model.objects.filter(rounds_blob__isnull=False).iterator():
+            match.rounds_data = decode_rounds(match.rounds_blob)
+            match.rounds_blob = None
+            match.save(update_fields=['rounds_blob', 'rounds_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poker', '0009_bot_win_rate_testbot_win_rate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='rounds_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testmatch',
+            name='rounds_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='rounds_data',
+            field=models.JSONField(blank=True, default=list, max_length=100000),
+        ),
+        migrations.AlterField(
+            model_name='testmatch',
+            name='rounds_data',
+            field=models.JSONField(blank=True, default=list, max_length=100000),
+        ),
+        migrations.RunPython(pack_rounds, unpack_rounds),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poker', '0010_packed_rounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRunJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('iterations', models.IntegerField(default=50)),
+                ('progress', models.IntegerField(default=0)),
+                ('results', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('test_bot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='poker.testbot')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='poker_testr_status_abdd3a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poker', '0011_testrunjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bot',
+            index=models.Index(fields=['-win_rate', '-wins'], name='bot_leaderboard_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('poker', '0012_bot_leaderboard_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='testbot',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
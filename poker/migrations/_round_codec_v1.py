@@ -0,0 +1,272 @@
+"""
+Frozen copy of poker/round_codec.py (codec version 1) as of migration 0010,
+which packs existing rounds with it. Do not edit: migrations must keep doing
+what they did when they were written, whatever later happens to the live
+codec.
+
+Compact columnar encoding for match `rounds_data`.
+
+The replay format (see `poker.rounds.RoundProcessor`) repeats player names,
+action names, card strings and full stack dicts in every round. This module
+packs a list of such rounds into columns:
+
+- player names and action names are stored once and referenced by index
+- cards are small integers (suit * 13 + rank)
+- stacks are delta-encoded against the previous round that had stacks
+- the whole payload is zstd-compressed
+
+`decode_rounds(encode_rounds(rounds)) == rounds` for any rounds produced by
+the round processor.
+"""
+import json
+import zstandard
+
+CODEC_VERSION = 1
+COMPRESSION_LEVEL = 10
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+BOARD_STREETS = STREETS[1:]
+
+SUITS = "CDHS"
+RANKS = "23456789TJQKA"
+CARD_TO_INT = {suit + rank: s * 13 + r for s, suit in enumerate(SUITS) for r, rank in enumerate(RANKS)}
+INT_TO_CARD = {value: card for card, value in CARD_TO_INT.items()}
+
+DEFAULT_ACTIONS = ["fold", "call", "raise", "smallblind", "bigblind", "ante"]
+NO_ONE = -1
+
+
+class _Dictionary:
+    """Assigns stable small indexes to strings in order of first use."""
+
+    def __init__(self, initial=()):
+        self.values = []
+        self.index = {}
+        for value in initial:
+            self.add(value)
+
+    def add(self, value):
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+def _encode_cards(cards):
+    return [CARD_TO_INT[card] for card in cards]
+
+
+def _decode_cards(values):
+    return [INT_TO_CARD[value] for value in values]
+
+
+def encode_rounds(rounds):
+    """Pack a list of replay rounds into compressed bytes."""
+    # Fix the player table up front (seat order of the stack dicts first) so
+    # every stack row has the same width.
+    players = _Dictionary()
+    for round_data in rounds:
+        for name in round_data.get('stacks') or ():
+            players.add(name)
+    for round_data in rounds:
+        for street in STREETS:
+            for name in round_data['actions'][street]['name']:
+                players.add(name)
+    actions = _Dictionary(DEFAULT_ACTIONS)
+
+    hole = []
+    street_mask = []
+    action_counts = []
+    action_players = []
+    action_kinds = []
+    action_amounts = []
+    boards = []
+    board_streets = []
+    chips = []
+    winners = []
+    winner_strings = {}
+    stack_present = []
+    stack_deltas = []
+    stack_sparse = {}
+
+    previous = [0] * len(players.values)
+    for i, round_data in enumerate(rounds):
+        hole.append([_encode_cards(cards) for cards in round_data['hole_cards']])
+
+        mask = 0
+        for bit, street in enumerate(STREETS):
+            if street in round_data['street']:
+                mask |= 1 << bit
+        street_mask.append(mask)
+
+        counts = []
+        for street in STREETS:
+            street_actions = round_data['actions'][street]
+            names = street_actions['name']
+            counts.append(len(names))
+            action_players.extend(players.index[name] for name in names)
+            action_kinds.extend(actions.add(kind) for kind in street_actions['action'])
+            action_amounts.extend(street_actions['amount'])
+        action_counts.append(counts)
+
+        # Board cards only grow street by street, so store the longest board
+        # and how many of flop/turn/river were dealt.
+        communitycards = round_data['communitycards']
+        board = []
+        dealt = 0
+        for street in BOARD_STREETS:
+            cards = communitycards.get(street) or []
+            if cards:
+                if cards[:len(board)] != board:
+                    raise ValueError(f"Round {i}: board is not cumulative")
+                board = cards
+                dealt += 1
+            elif dealt:
+                break
+        if any(communitycards.get(street) for street in BOARD_STREETS[dealt:]):
+            raise ValueError(f"Round {i}: board has gaps")
+        boards.append(_encode_cards(board))
+        board_streets.append(dealt)
+
+        chips.append(round_data['chips_exchanged'])
+
+        winner = round_data['winner']
+        if winner == "No one":
+            winners.append(NO_ONE)
+        elif winner in players.index:
+            winners.append(players.index[winner])
+        else:
+            # Ties ("A, B") and anything else unusual are kept verbatim
+            winners.append(NO_ONE)
+            winner_strings[i] = winner
+
+        stacks = round_data.get('stacks') or {}
+        if not stacks:
+            stack_present.append(0)
+            continue
+        if len(stacks) == len(players.values) and all(name in stacks for name in players.values):
+            current = [stacks[name] for name in players.values]
+            stack_deltas.extend(value - before for value, before in zip(current, previous))
+            previous = current
+            stack_present.append(1)
+        else:
+            stack_sparse[i] = [[players.index[name], value] for name, value in stacks.items()]
+            stack_present.append(2)
+
+    payload = {
+        "v": CODEC_VERSION,
+        "n": len(rounds),
+        "players": players.values,
+        "actions": actions.values,
+        "hole": hole,
+        "streets": street_mask,
+        "act_n": action_counts,
+        "act_p": action_players,
+        "act_k": action_kinds,
+        "act_a": action_amounts,
+        "board": boards,
+        "board_n": board_streets,
+        "chips": chips,
+        "winner": winners,
+        "winner_str": winner_strings,
+        "stk_present": stack_present,
+        "stk": stack_deltas,
+        "stk_sparse": stack_sparse,
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(raw)
+
+
+def load_payload(blob):
+    """Decompress and parse the columns without building any rounds."""
+    payload = json.loads(zstandard.ZstdDecompressor().decompress(bytes(blob)))
+    if payload.get("v") != CODEC_VERSION:
+        raise ValueError(f"Unsupported rounds codec version {payload.get('v')}")
+    return payload
+
+
+def decode_payload(payload, start=0, stop=None):
+    """
+    Build rounds `start` to `stop` (exclusive) from a loaded payload.
+
+    Only the requested rounds are materialized; earlier rounds are skipped by
+    summing their action counts and stack deltas.
+    """
+    players = payload["players"]
+    action_names = payload["actions"]
+    act_p, act_k, act_a = payload["act_p"], payload["act_k"], payload["act_a"]
+    winner_strings = payload["winner_str"]
+    stack_sparse = payload["stk_sparse"]
+    stack_deltas = payload["stk"]
+    width = len(players)
+
+    total = payload["n"]
+    stop = total if stop is None else min(stop, total)
+    start = max(0, min(start, stop))
+
+    # Fast-forward the running positions and stacks to `start`
+    action_pos = sum(sum(counts) for counts in payload["act_n"][:start])
+    stack_pos = 0
+    previous = [0] * width
+    for present in payload["stk_present"][:start]:
+        if present == 1:
+            previous = [before + delta for before, delta in
+                        zip(previous, stack_deltas[stack_pos:stack_pos + width])]
+            stack_pos += width
+
+    rounds = []
+    for i in range(start, stop):
+        mask = payload["streets"][i]
+        actions = {}
+        for street, count in zip(STREETS, payload["act_n"][i]):
+            end = action_pos + count
+            actions[street] = {
+                "name": [players[p] for p in act_p[action_pos:end]],
+                "action": [action_names[k] for k in act_k[action_pos:end]],
+                "amount": act_a[action_pos:end],
+            }
+            action_pos = end
+
+        board = _decode_cards(payload["board"][i])
+        dealt = payload["board_n"][i]
+        communitycards = {'preflop': []}
+        for n, (street, size) in enumerate(zip(BOARD_STREETS, (3, 4, 5))):
+            communitycards[street] = board[:size] if n < dealt else []
+
+        key = str(i)
+        winner_idx = payload["winner"][i]
+        if key in winner_strings:
+            winner = winner_strings[key]
+        elif winner_idx == NO_ONE:
+            winner = "No one"
+        else:
+            winner = players[winner_idx]
+
+        present = payload["stk_present"][i]
+        if present == 1:
+            current = [before + delta for before, delta in
+                       zip(previous, stack_deltas[stack_pos:stack_pos + width])]
+            stack_pos += width
+            previous = current
+            stacks = dict(zip(players, current))
+        elif present == 2:
+            stacks = {players[p]: value for p, value in stack_sparse[key]}
+        else:
+            stacks = {}
+
+        rounds.append({
+            'hole_cards': [_decode_cards(cards) for cards in payload["hole"][i]],
+            'street': [street for bit, street in enumerate(STREETS) if mask & (1 << bit)],
+            'actions': actions,
+            'communitycards': communitycards,
+            'chips_exchanged': payload["chips"][i],
+            'winner': winner,
+            'stacks': stacks,
+        })
+    return rounds
+
+
+def decode_rounds(blob, start=0, stop=None):
+    """Unpack bytes produced by `encode_rounds` back into replay rounds."""
+    return decode_payload(load_payload(blob), start, stop)
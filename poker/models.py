@@ -1,5 +1,12 @@
+from collections import OrderedDict
 from django.db import models
 from django.contrib.auth.models import AbstractUser, Group, Permission
+from .round_codec import encode_rounds, decode_rounds, load_payload, decode_payload
+
+# Parsed (still columnar) payloads of recently replayed matches, so paging
+# through a replay decompresses the blob once rather than once per page.
+_payload_cache = OrderedDict()
+PAYLOAD_CACHE_SIZE = 8
 
 
 class User(AbstractUser):
@@ -20,6 +27,55 @@ class User(AbstractUser):
     )
 
 
+class PackedRoundsMixin:
+    """
+    Transparent access to rounds stored in the compact `rounds_blob` column.
+    `rounds` returns the usual list of round dicts; rows written before the
+    compact format existed keep working through `rounds_data`.
+    """
+
+    @property
+    def rounds(self):
+        if not self.rounds_blob:
+            return self.rounds_data
+        cached = getattr(self, '_rounds_cache', None)
+        if cached is None:
+            cached = self._rounds_cache = decode_rounds(self.rounds_blob)
+        return cached
+
+    @rounds.setter
+    def rounds(self, value):
+        self.rounds_blob = encode_rounds(value)
+        self.rounds_data = []
+        self._rounds_cache = value
+
+    def _rounds_payload(self):
+        key = (self._meta.label, self.pk, len(self.rounds_blob))
+        payload = _payload_cache.get(key)
+        if payload is None:
+            payload = load_payload(self.rounds_blob)
+            _payload_cache[key] = payload
+            if len(_payload_cache) > PAYLOAD_CACHE_SIZE:
+                _payload_cache.popitem(last=False)
+        else:
+            _payload_cache.move_to_end(key)
+        return payload
+
+    @property
+    def rounds_total(self):
+        if getattr(self, '_rounds_cache', None) is not None:
+            return len(self._rounds_cache)
+        if not self.rounds_blob:
+            return len(self.rounds_data)
+        return self._rounds_payload()["n"]
+
+    def rounds_page(self, start, count):
+        """Rounds `start` .. `start + count - 1`, decoding only that slice."""
+        if getattr(self, '_rounds_cache', None) is not None or not self.rounds_blob:
+            return self.rounds[start:start + count]
+        return decode_payload(self._rounds_payload(), start, start + count)
+
+
 class Bot(models.Model):
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey('poker.User', on_delete=models.CASCADE)
@@ -32,16 +88,23 @@ class Bot(models.Model):
     chips_won = models.IntegerField(default=0)
     win_rate = models.FloatField(default=0.0)
 
+    class Meta:
+        indexes = [
+            # Leaderboard order
+            models.Index(fields=['-win_rate', '-wins'], name='bot_leaderboard_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} (by {self.user.username})"
 
 
-class Match(models.Model):
+class Match(PackedRoundsMixin, models.Model):
     id = models.AutoField(primary_key=True)
     players = models.ManyToManyField(Bot, related_name="matches") 
     winner = models.TextField()
     played_at = models.DateTimeField(auto_now_add=True)
-    rounds_data = models.JSONField(max_length=100000)
+    rounds_data = models.JSONField(max_length=100000, default=list, blank=True)
+    rounds_blob = models.BinaryField(null=True, blank=True)
 
     class Meta:
         ordering = ['-played_at']
@@ -53,7 +116,8 @@ class Match(models.Model):
 
 
 class TestBot(models.Model):
-    user = models.ForeignKey('poker.User', on_delete=models.CASCADE)
+    # Built-in bots share one row with no user (see poker/builtin_bots.py)
+    user = models.ForeignKey('poker.User', on_delete=models.CASCADE, null=True, blank=True)
     name = models.TextField()
     file = models.FileField(upload_to='test_bots/') 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -69,7 +133,7 @@ class TestBot(models.Model):
         return f"Test Bot: {self.name}"
 
 
-class TestMatch(models.Model):
+class TestMatch(PackedRoundsMixin, models.Model):
     id = models.AutoField(primary_key=True)
     bot1 = models.ForeignKey(
         TestBot,
@@ -84,7 +148,8 @@ class TestMatch(models.Model):
     player_order = models.JSONField(default=list)  # Store order explicitly
     winner = models.TextField()
     played_at = models.DateTimeField(auto_now_add=True)
-    rounds_data = models.JSONField(max_length=100000)
+    rounds_data = models.JSONField(max_length=100000, default=list, blank=True)
+    rounds_blob = models.BinaryField(null=True, blank=True)
 
     class Meta:
         ordering = ['-played_at']
@@ -92,3 +157,35 @@ class TestMatch(models.Model):
     def __str__(self):
         return f"Test Match: {self.bot1.name} vs {self.players.count() - 1} opponents"
 
+
+
+class TestRunJob(models.Model):
+    """A queued test-run tournament, picked up by a worker (see poker/jobs.py)."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey('poker.User', on_delete=models.CASCADE)
+    test_bot = models.ForeignKey(TestBot, on_delete=models.CASCADE, related_name='jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    iterations = models.IntegerField(default=50)
+    progress = models.IntegerField(default=0)  # Finished tournament iterations
+    results = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"Test run #{self.id}: {self.test_bot.name} ({self.status})"
@@ -0,0 +1,94 @@
+from pypokerengine.players import BasePokerPlayer
+
+
+class MatchRecorder(BasePokerPlayer):
+    """
+    Transparent proxy around one seated player that records the match as
+    structured round records while the game runs.
+
+    Every player receives every notification, so wrapping a single seat is
+    enough to see all rounds, streets, actions and winners. The records have
+    the same shape as the output of `parse_poker_output_to_json`, without
+    going through stdout, string formatting and regex parsing.
+    """
+
+    def __init__(self, player):
+        self.player = player
+        self.rounds = []
+        self.current_round = None
+        self.current_street = None
+        self.names_by_uuid = {}
+
+    def set_uuid(self, uuid):
+        self.uuid = uuid
+        self.player.set_uuid(uuid)
+
+    def respond_to_ask(self, message):
+        return self.player.respond_to_ask(message)
+
+    def receive_notification(self, message):
+        # Record first, then forward so the wrapped bot sees the same message
+        super().receive_notification(message)
+        self.player.receive_notification(message)
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        return self.player.declare_action(valid_actions, hole_card, round_state)
+
+    def receive_game_start_message(self, game_info):
+        for seat in game_info["seats"]:
+            self.names_by_uuid[seat["uuid"]] = seat["name"]
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        if self.current_round:
+            self.rounds.append(self.current_round)
+        for seat in seats:
+            self.names_by_uuid[seat["uuid"]] = seat["name"]
+        self.current_round = {
+            "round_number": round_count,
+            "actions": {"preflop": [], "flop": [], "turn": [], "river": []},
+            "community_cards": {"preflop": [], "flop": [], "turn": [], "river": []},
+            "winner": None,
+            "stacks": {}
+        }
+        self.current_street = "preflop"
+
+    def receive_street_start_message(self, street, round_state):
+        if not self.current_round:
+            return
+        self.current_street = street
+        self.current_round["community_cards"][street] = list(round_state["community_card"])
+        if street not in self.current_round["actions"]:
+            self.current_round["actions"][street] = []
+
+    def receive_game_update_message(self, new_action, round_state):
+        if not self.current_round:
+            return
+        amount = new_action["amount"]
+        # The engine reports the declared action, and folds anything it cannot
+        # accept. Declarations with a non-integer or negative amount never made
+        # it into the replay log, so they are skipped here as well.
+        if not isinstance(amount, int) or amount < 0:
+            return
+        self.current_round["actions"][self.current_street].append({
+            "name": self.names_by_uuid.get(new_action["player_uuid"]),
+            "action": new_action["action"],
+            "amount": amount
+        })
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        if not self.current_round:
+            return
+        self.current_round["stacks"] = {seat["name"]: seat["stack"] for seat in round_state["seats"]}
+        winner_list = [winner["name"] for winner in winners]
+        if len(winner_list) == 1:
+            self.current_round["winner"] = winner_list[0]
+        elif len(winner_list) > 1:
+            # Multiple winners (tie) - store as comma-separated string
+            self.current_round["winner"] = ", ".join(winner_list)
+            self.current_round["winners_list"] = winner_list  # Also store as list
+
+    def replay_data(self):
+        rounds = list(self.rounds)
+        if self.current_round:
+            rounds.append(self.current_round)
+        return {"rounds": rounds}
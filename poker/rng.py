@@ -0,0 +1,43 @@
+import random
+from pypokerengine.players import BasePokerPlayer
+
+
+class PrivateRandomPlayer(BasePokerPlayer):
+    """
+    Gives one seated bot its own stream of the global `random` module.
+
+    PyPokerEngine shuffles the deck with the global `random`, and so do bots
+    like random_bot. Left alone, every bot decision shifts the deck sequence
+    of later rounds. This proxy swaps in the bot's private generator state
+    for the duration of each callback and restores the engine's state
+    afterwards. The deck sequence then depends only on the match seed, and a
+    bot's choices only on its own seed.
+    """
+
+    def __init__(self, player, seed):
+        self.player = player
+        self.random_state = random.Random(seed).getstate()
+
+    def _call(self, method, message):
+        engine_state = random.getstate()
+        random.setstate(self.random_state)
+        try:
+            return method(message)
+        finally:
+            self.random_state = random.getstate()
+            random.setstate(engine_state)
+
+    def set_uuid(self, uuid):
+        self.uuid = uuid
+        self.player.set_uuid(uuid)
+
+    def respond_to_ask(self, message):
+        return self._call(self.player.respond_to_ask, message)
+
+    def receive_notification(self, message):
+        return self._call(self.player.receive_notification, message)
+
+
+def bot_seed(match_seed, name):
+    # String seeds hash deterministically (independent of PYTHONHASHSEED)
+    return f"{match_seed}:{name}"
@@ -0,0 +1,91 @@
+STREETS = ('preflop', 'flop', 'turn', 'river')
+BOARD_STREETS = STREETS[1:]
+
+
+class RoundProcessor:
+    """
+    Shapes raw recorded rounds into the replay format stored on matches.
+
+    One instance per match: it keeps the previous round's stacks so
+    `chips_exchanged` can be computed, and it reads hole cards from the bots'
+    `hole_cards_log`. Each round is handled in a single walk over its actions.
+
+    Usable as a generator stage:
+
+        processor = RoundProcessor(names, hole_card_logs)
+        rounds_data = list(processor.iter_rounds(replay_data["rounds"]))
+        final_stacks = processor.previous_stack
+    """
+
+    def __init__(self, players, hole_card_logs, initial_stack=10000):
+        self.players = [str(name) for name in players]
+        self.hole_card_logs = hole_card_logs
+        self.previous_stack = {name: initial_stack for name in self.players}
+
+    def iter_rounds(self, raw_rounds):
+        for round_num, round_data in enumerate(raw_rounds):
+            if not round_data:
+                continue  # Skip if no data for the current round
+            yield self.process(round_num, round_data)
+
+    def process(self, round_num, round_data):
+        raw_actions = round_data.get("actions", {})
+        raw_cards = round_data.get("community_cards", {})
+        actions = {}
+        streets = []  # Streets that actually had actions
+        active_players = set()
+
+        for street in STREETS:
+            street_actions = raw_actions.get(street) or ()
+            names, kinds, amounts = [], [], []
+            for action in street_actions:
+                names.append(action['name'])
+                kinds.append(action['action'])
+                amounts.append(action['amount'])
+            if names:
+                streets.append(street)
+                active_players.update(names)
+            actions[street] = {"name": names, "action": kinds, "amount": amounts}
+
+        communitycards = {'preflop': []}
+        for street in BOARD_STREETS:
+            communitycards[street] = raw_cards.get(street, [])
+
+        winner = round_data.get("winner")
+        stacks = round_data.get("stacks") or {}
+        if winner and winner != "No one":
+            # Ties carry the full list; single winners are a plain name
+            active_players.update(round_data.get("winners_list") or (winner,))
+
+        hole_cards = []
+        for name, log in zip(self.players, self.hole_card_logs):
+            if name in active_players:
+                hole_cards.append(log[round_num] if round_num < len(log) else [])
+
+        chips_exchanged = 0
+        if winner is None or not stacks:  # No winner info provided
+            winner = "No one"
+            stacks = {}
+        else:
+            stacks = dict(stacks)
+            previous_stack = self.previous_stack
+            for name in self.players:
+                if name in active_players:
+                    before = previous_stack.get(name, 0)
+                    chips_exchanged += abs(stacks.get(name, before) - before)
+            chips_exchanged /= 2
+            self.previous_stack = stacks
+
+        return {
+            'hole_cards': hole_cards,
+            'street': streets,
+            'actions': actions,
+            'communitycards': communitycards,
+            'chips_exchanged': chips_exchanged,
+            'winner': winner,
+            'stacks': stacks
+        }
+
+    def match_winner(self):
+        # Player with most chips after the last decided round
+        return max(self.previous_stack, key=self.previous_stack.get, default="No one")
@@ -0,0 +1,95 @@
+import math
+from statistics import NormalDist
+
+
+class SequentialStop:
+    """
+    Early-stopping rule for run_tournament.
+
+    Tracks the user bot's win rate and chip delta (final stack minus the
+    starting stack) as deals finish (one sample per deal, however many seat
+    rotations it was played in), with normal-approximation confidence
+    intervals (Wilson for the win rate). The tournament stops once every
+    requested interval is narrower than its target, after at least
+    `min_matches`; run_tournament's `iterations` is the maximum.
+
+    win_rate_margin: target half-width of the win-rate interval (0.1 = +/-10 points)
+    chip_margin: target half-width of the chip-delta interval, in chips (None = ignore)
+    """
+
+    def __init__(self, win_rate_margin=0.1, chip_margin=None, confidence=0.95, min_matches=10):
+        self.win_rate_margin = win_rate_margin
+        self.chip_margin = chip_margin
+        self.confidence = confidence
+        self.min_matches = min_matches
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.matches = 0
+        self.wins = 0
+        # Welford running mean / sum of squared deviations of the chip delta
+        self.chip_mean = 0.0
+        self._chip_m2 = 0.0
+        self.stopped_early = False
+
+    def add(self, won, chip_delta):
+        self.matches += 1
+        if won:
+            self.wins += 1
+        diff = chip_delta - self.chip_mean
+        self.chip_mean += diff / self.matches
+        self._chip_m2 += diff * (chip_delta - self.chip_mean)
+
+    @property
+    def win_rate(self):
+        return self.wins / self.matches if self.matches else 0.0
+
+    def win_rate_interval(self):
+        n = self.matches
+        if not n:
+            return 0.0, 1.0
+        p = self.win_rate
+        z2 = self.z * self.z
+        center = (p + z2 / (2 * n)) / (1 + z2 / n)
+        half = self.z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+        return max(0.0, center - half), min(1.0, center + half)
+
+    def chip_interval(self):
+        if self.matches < 2:
+            return -math.inf, math.inf
+        std_err = math.sqrt(self._chip_m2 / (self.matches - 1) / self.matches)
+        return self.chip_mean - self.z * std_err, self.chip_mean + self.z * std_err
+
+    def win_rate_precision(self):
+        low, high = self.win_rate_interval()
+        return (high - low) / 2
+
+    def chip_precision(self):
+        low, high = self.chip_interval()
+        return (high - low) / 2
+
+    def should_stop(self):
+        if self.matches < self.min_matches:
+            return False
+        if self.win_rate_margin is not None and self.win_rate_precision() > self.win_rate_margin:
+            return False
+        if self.chip_margin is not None and self.chip_precision() > self.chip_margin:
+            return False
+        return True
+
+    def summary(self):
+        """Achieved precision, for the test-run results."""
+        win_low, win_high = self.win_rate_interval()
+        chip_low, chip_high = self.chip_interval()
+        chip_precision = self.chip_precision()
+        return {
+            'matches': self.matches,
+            'stopped_early': self.stopped_early,
+            'confidence': self.confidence,
+            'win_rate': round(self.win_rate * 100, 2),
+            'win_rate_low': round(win_low * 100, 2),
+            'win_rate_high': round(win_high * 100, 2),
+            'win_rate_margin': round(self.win_rate_precision() * 100, 2),
+            'chip_delta': round(self.chip_mean, 1),
+            'chip_delta_margin': round(chip_precision, 1) if math.isfinite(chip_precision) else None,
+            'chip_delta_low': round(chip_low, 1) if math.isfinite(chip_low) else None,
+            'chip_delta_high': round(chip_high, 1) if math.isfinite(chip_high) else None,
+        }
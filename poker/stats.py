@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.db.models.functions import Cast, Round
+from .models import Bot, TestBot
+from .leaderboard import invalidate_leaderboard
+
+
+def _per_name(participant_stats, field):
+    """CASE name WHEN ... THEN <participant_stats[name][field]> END"""
+    return Case(
+        *[When(name=name, then=Value(stats[field])) for name, stats in participant_stats.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
+
+
+def apply_participant_stats(participant_stats):
+    """
+    Add a tournament's {name: {'wins', 'games'}} to every Bot and TestBot with
+    that name and recompute win_rate, with a single UPDATE per table.
+
+    The new win_rate is computed from the incremented values in the same
+    statement, so no rows are read back into Python.
+    """
+    if not participant_stats:
+        return
+    names = list(participant_stats)
+    for model in (Bot, TestBot):
+        new_wins = F('wins') + _per_name(participant_stats, 'wins')
+        new_games = F('total_games') + _per_name(participant_stats, 'games')
+        model.objects.filter(name__in=names).update(
+            wins=new_wins,
+            total_games=new_games,
+            # Every participant played at least once, so new_games > 0
+            win_rate=Round(Cast(new_wins, FloatField()) * 100.0 / new_games, 2)
+        )
+    # After the commit, so a leaderboard read in between can't re-cache old rows
+    transaction.on_commit(invalidate_leaderboard)
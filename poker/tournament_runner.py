@@ -2,152 +2,421 @@ import sys
 import random
 import glob
 import os
-from multiprocessing import Pool, cpu_count
-from .utils import load_bot, redirect_stdout_to_memory, read_output_from_memory
+import atexit
+import itertools
+import threading
+from multiprocessing import Barrier, Pool, Value, cpu_count
+from threading import BrokenBarrierError
+from .utils import load_bot, load_bot_class, run_recorded_match
+from .rounds import RoundProcessor
+from .rng import PrivateRandomPlayer, bot_seed
+from .watchdog import TimedPlayer, limits
+from .bot_host import BotHostError, RemotePlayer, close_host, get_host, shutdown_hosts
+from . import match_cache
+from django.conf import settings
 from pypokerengine.api.game import setup_config
 
+# Engine configuration for every tournament match
+MAX_ROUND = 10
+INITIAL_STACK = 10000
+SMALL_BLIND = 250
+ENGINE_CONFIG = (MAX_ROUND, INITIAL_STACK, SMALL_BLIND)
+
+# Persistent pool shared by every tournament in this process.
+_pool = None
+_pool_size = 0
+
+# Each tournament gets a number; pool tasks carry it. A tournament that
+# stops early writes its number to _cancelled (shared with the workers), and
+# workers skip its remaining queued matches instead of playing them.
+_tournament_ids = itertools.count(1)
+_cancelled = None
+
+# Lets one task reach every worker: each close task waits here until all
+# workers hold one (see _close_pool_hosts)
+_barrier = None
+CLOSE_WAIT = 60
+
+
+def _init_worker(bot_paths, cancelled, barrier):
+    """Pool initializer: compile every distinct in-process bot file once per worker."""
+    global _cancelled, _barrier
+    _cancelled = cancelled
+    _barrier = barrier
+    for path in set(bot_paths):
+        if not _hosted(path):
+            load_bot_class(path)
+
+
+def _hosted(path):
+    """
+    Uploaded bots run in a bot host process (poker/bot_host.py); the built-in
+    bots in bots/ are trusted and run in the engine's process.
+    """
+    if getattr(settings, 'BOT_ISOLATION', 'hosts') != 'hosts':
+        return False
+    builtin_dir = os.path.join(str(settings.BASE_DIR), 'bots')
+    return os.path.dirname(os.path.abspath(path)) != builtin_dir
+
+
+def load_players(bots_info, seed):
+    """
+    Players for bots_info ({'name', 'path'} dicts), in order: RemotePlayer
+    proxies for hosted bots, in-process instances for the rest. Returns
+    (players, errors); if any bot fails to load, players is None and the
+    host sessions already opened are closed.
+    """
+    players, errors = [], []
+    for bot_info in bots_info:
+        if _hosted(bot_info['path']):
+            try:
+                players.append(RemotePlayer(get_host(bot_info['path']), bot_info['name'],
+                                            bot_seed(seed, bot_info['name'])))
+            except (BotHostError, OSError) as e:
+                errors.append(str(e))
+        else:
+            # load_bot reuses the class cached for this file's (path, mtime, size)
+            instance, chk = load_bot(bot_info['path'], bot_info['name'])
+            if chk:
+                players.append(instance)
+            else:
+                errors.append(instance)
+    if errors:
+        close_players(players)
+        return None, errors
+    return players, []
+
+
+def _get_pool(num_processes, bot_paths):
+    global _pool, _pool_size, _cancelled, _barrier
+    if _pool is not None and _pool_size != num_processes:
+        shutdown_pool()
+    if _pool is None:
+        if _cancelled is None:
+            _cancelled = Value('q', 0, lock=False)
+        _barrier = Barrier(num_processes)
+        _pool = Pool(processes=num_processes, initializer=_init_worker,
+                     initargs=(bot_paths, _cancelled, _barrier))
+        _pool_size = num_processes
+    return _pool
+
+
+def _close_host_task(bot_path):
+    """Pool task: close this worker's hosts of bot_path, then wait for the other workers."""
+    close_host(bot_path)
+    try:
+        _barrier.wait(timeout=CLOSE_WAIT)
+    except BrokenBarrierError:
+        pass
+
+
+def _close_pool_hosts(bot_path):
+    """
+    Close the hosts of bot_path in this process and in every pool worker.
+    Each of the _pool_size tasks blocks its worker at the barrier, so no
+    worker can take two of them.
+    """
+    close_host(bot_path)
+    if _pool is not None:
+        _barrier.reset()
+        _pool.map(_close_host_task, [bot_path] * _pool_size, chunksize=1)
+
+
+def _run_pooled(task):
+    """Pool entry point: run_single_match, unless the tournament was cancelled."""
+    tournament_id, args = task
+    if _cancelled is not None and _cancelled.value == tournament_id:
+        return None
+    return run_single_match(args)
+
+
+def shutdown_pool():
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+        _pool_size = 0
+
+
+atexit.register(shutdown_pool)
+atexit.register(shutdown_hosts)
+
+
+def resolve_num_workers(num_workers=None):
+    """0/None means one worker per spare core; 1 means run serially."""
+    if not num_workers:
+        return max(1, cpu_count() - 1)
+    return max(1, int(num_workers))
+
+
+def _seated_bots(args):
+    """Bot infos of a match in seat order (see run_single_match args)."""
+    _, user_bot_info, selected_opponents_info, _, rotation = args
+    bots = [user_bot_info] + selected_opponents_info
+    rotation %= len(bots)
+    return bots[rotation:] + bots[:rotation]
+
+
+def _match_cache_key(args):
+    try:
+        return match_cache.match_key(_seated_bots(args), args[3], ENGINE_CONFIG + limits(), args[4])
+    except OSError:
+        return None
+
+
+def _run_batch(batch, play, use_cache):
+    """
+    Results for `batch` in order. Cached matches are served from the match
+    cache; the rest go through play(list_of_args), which yields in order.
+    """
+    keys = [_match_cache_key(args) if use_cache else None for args in batch]
+    cached = [match_cache.get(key) if key else None for key in keys]
+    played = play([args for args, hit in zip(batch, cached) if hit is None])
+    for args, key, result in zip(batch, keys, cached):
+        if result is None:
+            result = next(played)
+            if result is not None and key is not None:
+                match_cache.put(key, result)
+        else:
+            result['iteration'] = args[0] + 1
+        yield result
+
+
+def register_players(config, bots_info, players, seed, budget_scale=1):
+    """
+    Register each player under the watchdog (poker/watchdog.py); in-process
+    bots also get their private random stream. The per-match time budgets
+    are sized for MAX_ROUND rounds and multiplied by budget_scale.
+    Returns the TimedPlayers in seat order.
+    """
+    action_timeout, match_budget, cpu_budget = limits()
+    timed_players = []
+    for bot_info, instance in zip(bots_info, players):
+        # Time budgets inside, so time spent swapping random state isn't charged to the bot
+        timed = TimedPlayer(instance, action_timeout, match_budget * budget_scale, cpu_budget * budget_scale)
+        timed_players.append(timed)
+        if isinstance(instance, RemotePlayer):
+            player = timed  # The host keeps the bot's private random state
+        else:
+            player = PrivateRandomPlayer(timed, bot_seed(seed, bot_info['name']))
+        config.register_player(name=bot_info['name'], algorithm=player)
+    return timed_players
+
+
+def close_players(bot_instances):
+    for instance in bot_instances:
+        if isinstance(instance, RemotePlayer):
+            try:
+                instance.close()
+            except OSError:
+                pass
+
+
 def run_single_match(args):
     """
     Function to run a single match iteration in a separate process.
-    args: tuple (iteration_index, user_bot_info, selected_opponents_info)
-    """
-    iteration_index, user_bot_info, selected_opponents_info = args
-    
-    current_match_bots = [user_bot_info] + selected_opponents_info
-    bot_instances = []
-    
-    # Load bots in the child process
-    for bot_info in current_match_bots:
-        instance, chk = load_bot(bot_info['path'], bot_info['name'])
-        if not chk:
-            return None # Skip if bot fails to load
-        bot_instances.append(instance)
-
-    config = setup_config(max_round=10, initial_stack=10000, small_blind_amount=250)
-    for bot_info, instance in zip(current_match_bots, bot_instances):
-        config.register_player(name=bot_info['name'], algorithm=instance)
-
-    # Use in-memory redirection to avoid file I/O and process conflicts
-    result, output_content, success = redirect_stdout_to_memory(config)
-    if not success:
-        return None
+    args: tuple (iteration_index, user_bot_info, selected_opponents_info, seed, rotation)
+
+    The same seed always deals the same deck sequence; rotation shifts every
+    bot `rotation` seats to the left so duplicate deals can replay it.
+    """
+    iteration_index, user_bot_info, selected_opponents_info, seed, rotation = args
+
+    # The seed drives the engine (deck shuffles); each bot gets its own
+    # stream derived from it, so bots cannot perturb the deck or each other.
+    random.seed(seed)
+
+    current_match_bots = _seated_bots(args)
+    rotation %= len(current_match_bots)
+    # Local bot instances, or RemotePlayer proxies of hosted bots
+    bot_instances, _ = load_players(current_match_bots, seed)
+    if bot_instances is None:
+        return None # Skip if bot fails to load
 
-    replay_data, error = read_output_from_memory(output_content)
-    if replay_data == "Invalid amount":
+    config = setup_config(max_round=MAX_ROUND, initial_stack=INITIAL_STACK, small_blind_amount=SMALL_BLIND)
+    timed_players = register_players(config, current_match_bots, bot_instances, seed)
+
+    # Record structured round events directly instead of scraping stdout
+    result, replay_data, success = run_recorded_match(config)
+    close_players(bot_instances)
+    if not success:
         return None
 
-    rounds_data = []
-    previous_stack = {b['name']: 10000 for b in current_match_bots}
     final_stacks = {}
-    
+
     if isinstance(result, dict) and "players" in result:
         for player in result["players"]:
             final_stacks[player["name"]] = player["stack"]
-    
+
     current_match_winner = max(final_stacks, key=final_stacks.get) if final_stacks else "No one"
-    
+
     # Process rounds for replay and stats
-    for round_num in range(len(replay_data["rounds"])):
-        round_data = replay_data["rounds"][round_num]
-        if not round_data: continue
-
-        actions = {street: {"name": [], "action": [], "amount": []} for street in ['preflop', 'flop', 'turn', 'river']}
-        communitycards = {street: [] for street in ['preflop', 'flop', 'turn', 'river']}
-        streets = []
-
-        for street in ['preflop', 'flop', 'turn', 'river']:
-            street_actions = round_data.get("actions", {}).get(street, [])
-            if street_actions:
-                streets.append(street)
-                actions[street]['name'] = [action['name'] for action in street_actions]
-                actions[street]['action'] = [action['action'] for action in street_actions]
-                actions[street]['amount'] = [action['amount'] for action in street_actions]
-            if street != 'preflop':
-                communitycards[street] = round_data.get("community_cards", {}).get(street, [])
-
-        winner = round_data.get("winner")
-        stacks = round_data.get("stacks", {})
-        active_players = set()
-        for street, a in replay_data["rounds"][round_num]["actions"].items():
-            for action in a:
-                active_players.add(action["name"])
-        if winner and winner != "No one":
-            active_players.add(winner)
-
-        hole_cards = []
-        for k, bot_info in enumerate(current_match_bots):
-            if str(bot_info['name']) in active_players:
-                if round_num < len(bot_instances[k].hole_cards_log):
-                    hole_cards.append(bot_instances[k].hole_cards_log[round_num])
-                else:
-                    hole_cards.append([])
-
-        stacks_array = {name: value for name, value in stacks.items()}
-        chips_exchanged = 0
-        if stacks_array:
-            for bot_info in current_match_bots:
-                if bot_info['name'] in active_players:
-                    chips_exchanged += abs(stacks_array.get(bot_info['name'], 10000) - previous_stack.get(bot_info['name'], 10000))
-            chips_exchanged /= 2
-            previous_stack = stacks_array
-
-        rounds_data.append({
-            'hole_cards': hole_cards,
-            'street': streets,
-            'actions': actions,
-            'communitycards': communitycards,
-            'chips_exchanged': chips_exchanged,
-            'winner': winner or "No one",
-            'stacks': stacks_array
-        })
+    processor = RoundProcessor(
+        [bot_info['name'] for bot_info in current_match_bots],
+        [instance.hole_cards_log for instance in bot_instances],
+        initial_stack=INITIAL_STACK
+    )
+    rounds_data = list(processor.iter_rounds(replay_data["rounds"]))
 
     user_stack = final_stacks.get(user_bot_info['name'], 0)
-    
+
     return {
         'iteration': iteration_index + 1,
         'winner': current_match_winner,
         'user_stack': user_stack,
         'opponents': [opp['name'] for opp in selected_opponents_info],
         'rounds_data': rounds_data,
-        'stack': user_stack
+        'stack': user_stack,
+        'seat_order': [bot_info['name'] for bot_info in current_match_bots],
+        'stacks': final_stacks,
+        'seed': seed,
+        'rotation': rotation,
+        'timeouts': {bot_info['name']: timed.timeouts for bot_info, timed in zip(current_match_bots, timed_players)}
     }
 
-def run_tournament(user_bot, builtin_opponents, permanent_opponents, iterations=100):
+def deal_winner(user_bot_name, matches):
+    """
+    Winner of one deal: its only match's winner, or in duplicate mode the
+    bot with the most chips summed over the deal's seat rotations.
+    """
+    if len(matches) == 1:
+        return matches[0]['winner']
+    totals = dict.fromkeys([user_bot_name] + matches[0]['opponents'], 0)
+    for m in matches:
+        for name, stack in m['stacks'].items():
+            totals[name] = totals.get(name, 0) + stack
+    return max(totals, key=totals.get)
+
+
+def run_tournament(user_bot, builtin_opponents, permanent_opponents, iterations=100, num_workers=None, chunksize=None, progress=None, seed=None, duplicate=False, stop=None):
+    """
+    progress: optional callable(finished, total), called as matches complete.
+    seed: makes opponent selection and every match's deal reproducible.
+    duplicate: play each of the `iterations` deals once per seat rotation
+    (iterations * seats matches), so every bot plays every seat's cards.
+    Every result carries its deal number in 'deal'.
+    stop: optional SequentialStop (poker/sequential.py). It gets one sample
+    per finished deal, in deal order: won as in deal_winner, with the user
+    bot's chip delta averaged over the deal's matches, so duplicate
+    rotations don't count as separate (correlated) samples. The tournament
+    ends as soon as it is satisfied; `iterations` is then the maximum.
+
+    Seeded tournaments reuse earlier results of identical matches from
+    poker/match_cache.py; set MATCH_CACHE_SIZE = 0 to disable. Unseeded
+    ones (TOURNAMENT_SEED unset, the default) never use the cache.
+    """
     user_bot_info = {'name': user_bot.name, 'path': user_bot.file.path}
-    
+    rng = random.Random(seed)
+
     match_args = []
+    match_deals = []  # Deal number of each match
+    deal_ends = set()  # len(results) values at which a whole deal is in
     for i in range(iterations):
-        # PRIORITY SELECTION: 
+        # PRIORITY SELECTION:
         # Always try to pick at least 3 permanent bots if they exist
         num_perm_to_pick = min(3, len(permanent_opponents))
-        selected_perm = random.sample(permanent_opponents, num_perm_to_pick)
-        
+        selected_perm = rng.sample(permanent_opponents, num_perm_to_pick)
+
         # Fill the remaining 5 slots with builtin bots
         num_builtin_needed = 5 - num_perm_to_pick
         num_builtin_to_pick = min(num_builtin_needed, len(builtin_opponents))
-        selected_builtin = random.sample(builtin_opponents, num_builtin_to_pick)
-        
+        selected_builtin = rng.sample(builtin_opponents, num_builtin_to_pick)
+
         # If we still have slots (e.g. not enough builtins), pick more from permanent if possible
         if len(selected_perm) + len(selected_builtin) < 5:
             remaining_perm = [p for p in permanent_opponents if p not in selected_perm]
             extra_perm_needed = 5 - (len(selected_perm) + len(selected_builtin))
-            extra_perm = random.sample(remaining_perm, min(extra_perm_needed, len(remaining_perm)))
+            extra_perm = rng.sample(remaining_perm, min(extra_perm_needed, len(remaining_perm)))
             selected_perm.extend(extra_perm)
 
         selected_opponents = selected_perm + selected_builtin
-        match_args.append((i, user_bot_info, selected_opponents))
+        match_seed = rng.getrandbits(32)
+        rotations = range(len(selected_opponents) + 1) if duplicate else (0,)
+        for rotation in rotations:
+            match_args.append((len(match_args), user_bot_info, selected_opponents, match_seed, rotation))
+            match_deals.append(i + 1)
+        deal_ends.add(len(match_args))
 
-    num_processes = max(1, cpu_count() - 1)
+    num_processes = min(resolve_num_workers(num_workers), max(1, len(match_args)))
+    tournament_id = next(_tournament_ids)
 
     results = []
-    for i in range (0, len(match_args)): 
-        results.append(run_single_match(match_args[i]))
-        
-    # with Pool(processes=num_processes) as pool:
-    #     results = pool.map(run_single_match, match_args)
+    deal_results = []  # Results of the deal in progress, for the stop rule
+
+    def collect(result):
+        """Store one result; True once the stop rule says we are done."""
+        results.append(result)
+        if progress:
+            progress(len(results), len(match_args))
+        if stop is None:
+            return False
+        if result is not None:
+            deal_results.append(result)
+        if len(results) not in deal_ends:
+            return False
+        if deal_results:
+            average_stack = sum(r['user_stack'] for r in deal_results) / len(deal_results)
+            stop.add(deal_winner(user_bot.name, deal_results) == user_bot.name, average_stack - INITIAL_STACK)
+            deal_results.clear()
+        return stop.should_stop()
 
+    # Without a seed every match gets a fresh deal, so nothing would repeat
+    use_cache = seed is not None and match_cache.cache_size() > 0
+
+    # Serial play needs the main thread for the watchdog's timers; elsewhere
+    # (the in-process job worker) a one-process pool takes its place.
+    if num_processes == 1 and threading.current_thread() is threading.main_thread():
+        play = lambda todo: map(run_single_match, todo)
+        batch_size = len(match_args)
+    else:
+        # Built-in and permanent opponents are preloaded by the initializer;
+        # the user's freshly uploaded bot is loaded lazily on first use.
+        opponent_paths = [opp['path'] for opp in builtin_opponents + permanent_opponents]
+        if not chunksize:
+            # imap() yields a chunk only once all of it is played, so a stop
+            # rule gets results one match at a time
+            chunksize = 1 if stop is not None else max(1, len(match_args) // (num_processes * 4))
+
+        def play(todo):
+            if not todo:
+                return iter(())
+            pool = _get_pool(num_processes, opponent_paths)
+            # imap() keeps results in iteration order regardless of which worker ran them
+            return pool.imap(_run_pooled, [(tournament_id, args) for args in todo], chunksize=chunksize)
+
+        # With a stop rule, hand out work in batches so little is queued once
+        # it is satisfied, and cancel what is; results past the stopping
+        # point are discarded, so where a run stops does not depend on the
+        # number of workers.
+        batch_size = num_processes * chunksize * 2 if stop is not None else len(match_args)
+
+    done = False
+    for batch_start in range(0, len(match_args), max(1, batch_size)):
+        batch = match_args[batch_start:batch_start + batch_size]
+        for result in _run_batch(batch, play, use_cache):
+            if collect(result):
+                done = True
+                break
+        if done:
+            break
+
+    if done and _cancelled is not None:
+        # Workers skip this tournament's matches still queued in the pool
+        _cancelled.value = tournament_id
+
+    if stop is not None:
+        stop.stopped_early = len(results) < len(match_args)
+
+    if _hosted(user_bot_info['path']):
+        # The tested bot is usually not played again; don't keep its hosts idle
+        _close_pool_hosts(user_bot_info['path'])
+
+    for result, deal in zip(results, match_deals):
+        if result is not None:
+            result['deal'] = deal
     all_matches_metadata = [r for r in results if r is not None]
-    
+
     if not all_matches_metadata:
         return None, None, []
 
@@ -12,11 +12,15 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('replay/<int:match_id>/', views.replay, name='replay'),
+    path('replay/<int:match_id>/rounds/', views.replay_rounds, name='replay_rounds'),
     path('deploy_bot/', views.deploy_bot, name='deploy_bot'),
     path('contact_us/', views.contact_us, name='contact_us'),
     path('documentation/', views.documentation, name='documentation'),
     path('test_run/',views.test_run,name="test_run"),
+    path('test_run/<int:job_id>/', views.test_run_job, name='test_run_job'),
+    path('test_run/<int:job_id>/status/', views.test_run_status, name='test_run_status'),
     path('test_replay/<int:match_id>/', views.test_replay, name='test_replay'),
+    path('test_replay/<int:match_id>/rounds/', views.test_replay_rounds, name='test_replay_rounds'),
     path('test_match_results/<int:match_id>/', views.test_match_results, name='test_run_response2'),
     path('admin_panel/', views.admin_panel, name='admin_panel'),
     path('leaderboard/', views.leaderboard, name='leaderboard'),
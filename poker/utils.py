@@ -1,37 +1,139 @@
 import sys
 import io
+import os
+import random
+import threading
+from collections import OrderedDict
 from pypokerengine.api.game import setup_config, start_poker
 import importlib.util
 import re
-
-def load_bot(filepath,bot_name=None):
+import ast
+from .recorder import MatchRecorder
+from . import engine
+from .rounds import RoundProcessor
+
+# Compiled bot classes keyed by (path, mtime, size): each bot file is
+# executed once and every match gets fresh instances of the cached class.
+# Editing or re-uploading a file changes the key, so stale classes are never
+# reused; least recently used entries are evicted past BOT_CACHE_SIZE.
+BOT_CACHE_SIZE = 64
+_bot_class_cache = OrderedDict()
+_bot_cache_stats = {'hits': 0, 'misses': 0}
+_bot_cache_lock = threading.Lock()
+
+
+def load_bot_class(filepath):
     try:
+        stat = os.stat(filepath)
+        key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+        with _bot_cache_lock:
+            bot_class = _bot_class_cache.get(key)
+            if bot_class is not None:
+                _bot_cache_stats['hits'] += 1
+                _bot_class_cache.move_to_end(key)
+                return bot_class, True
+            _bot_cache_stats['misses'] += 1
+
         spec = importlib.util.spec_from_file_location("Bot", filepath)
         bot = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(bot)
-        if hasattr(bot, 'Bot'):
-            return bot.Bot(bot_name=bot_name), True
-        else:
+        if not hasattr(bot, 'Bot'):
             return "The 'Bot' class is not found in the module.", False
+
+        with _bot_cache_lock:
+            _bot_class_cache[key] = bot.Bot
+            if len(_bot_class_cache) > BOT_CACHE_SIZE:
+                _bot_class_cache.popitem(last=False)
+        return bot.Bot, True
     except Exception as e:
         return str(e), False
 
 
-def parse_poker_output_to_json(content):
-    rounds = []
-    round_pattern = re.compile(r"Started the round (\d+)")
-    street_pattern = re.compile(r'Street "([^"]+)" started\. \(community card = \[(.*?)\]\)')
-    action_pattern = re.compile(r'"([^"]+)" declared "([^:]+):(\d+)"')
-    winner_pattern = re.compile(r'''"(\[.+?\])" won the round (\d+) \(stack = (\{.*\})\)''')
+def load_bot(filepath,bot_name=None):
+    bot_class, chk = load_bot_class(filepath)
+    if not chk:
+        return bot_class, False
+    try:
+        return bot_class(bot_name=bot_name), True
+    except Exception as e:
+        return str(e), False
+
+
+def bot_cache_info():
+    return {
+        'hits': _bot_cache_stats['hits'],
+        'misses': _bot_cache_stats['misses'],
+        'size': len(_bot_class_cache),
+        'maxsize': BOT_CACHE_SIZE,
+    }
+
+
+def clear_bot_cache():
+    with _bot_cache_lock:
+        _bot_class_cache.clear()
+        _bot_cache_stats['hits'] = _bot_cache_stats['misses'] = 0
+
 
+ROUND_PATTERN = re.compile(r"Started the round (\d+)")
+STREET_PATTERN = re.compile(r'Street "([^"]+)" started\. \(community card = \[(.*?)\]\)')
+ACTION_PATTERN = re.compile(r'"([^"]+)" declared "([^:]+):(\d+)"')
+WINNER_PATTERN = re.compile(r'''"(\[.+?\])" won the round (\d+) \(stack = (\{.*\})\)''')
+
+
+# Python repr() of a str: single-quoted unless the text contains a single quote
+STR_LITERAL = r"(?:'[^'\\\n]*(?:\\.[^'\\\n]*)*'" r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*")'
+NAME_LIST_PATTERN = re.compile(r"\[(?:{0}(?:, {0})*)?\]".format(STR_LITERAL))
+STACK_DICT_PATTERN = re.compile(r"\{{(?:{0}: -?\d+(?:, {0}: -?\d+)*)?\}}".format(STR_LITERAL))
+STR_TOKEN_PATTERN = re.compile(STR_LITERAL)
+STACK_ENTRY_PATTERN = re.compile(r"({0}): (-?\d+)".format(STR_LITERAL))
+
+
+def _str_value(token):
+    if "\\" in token:
+        # Rare: names with escapes. literal_eval only ever builds a str here.
+        return ast.literal_eval(token)
+    return token[1:-1]
+
+
+def parse_name_list(text):
+    """Parse the repr of a list of names, e.g. "['Bot1', 'Bot2']", without eval()."""
+    if not NAME_LIST_PATTERN.fullmatch(text):
+        raise ValueError(f"Malformed name list: {text!r}")
+    return [_str_value(token) for token in STR_TOKEN_PATTERN.findall(text)]
+
+
+def parse_stack_dict(text):
+    """Parse the repr of a name -> stack dict, e.g. "{'Bot1': 9500}", without eval()."""
+    if not STACK_DICT_PATTERN.fullmatch(text):
+        raise ValueError(f"Malformed stack dict: {text!r}")
+    return {_str_value(name): int(amount) for name, amount in STACK_ENTRY_PATTERN.findall(text)}
+
+
+class InvalidAmountError(ValueError):
+    def __init__(self, amount, action, name):
+        super().__init__(f"Invalid amount {amount} for {action} by {name}")
+        self.amount = amount
+        self.action = action
+        self.name = name
+
+
+def iter_poker_rounds(lines):
+    """
+    Incrementally parse engine log lines, yielding each round as soon as the
+    next one starts (and the last one at the end of input).
+
+    `lines` can be a file object, a list of lines or any line iterator; only
+    the round currently being parsed is held in memory, so this works on logs
+    of any length. Raises InvalidAmountError on a malformed action amount.
+    """
     current_round = None
     current_street = None
 
-    for line in content.splitlines():
-        round_match = round_pattern.search(line)
+    for line in lines:
+        round_match = ROUND_PATTERN.search(line)
         if round_match:
             if current_round:
-                rounds.append(current_round)
+                yield current_round
             current_round = {
                 "round_number": int(round_match.group(1)),
                 "actions": {"preflop": [], "flop": [], "turn": [], "river": []},
@@ -43,7 +145,7 @@ def parse_poker_output_to_json(content):
             continue
 
         if current_round:
-            street_match = street_pattern.search(line)
+            street_match = STREET_PATTERN.search(line)
             if street_match:
                 street_name = street_match.group(1)
                 current_street = street_name
@@ -53,176 +155,116 @@ def parse_poker_output_to_json(content):
                     current_round["actions"][street_name] = []
                 continue
 
-            action_match = action_pattern.search(line)
+            action_match = ACTION_PATTERN.search(line)
             if action_match:
                 name, action, amount = action_match.groups()
 
                 if not amount.isdigit():
-                    return "Invalid amount" , {amount , action , name}
-        
+                    raise InvalidAmountError(amount, action, name)
+
                 current_round["actions"][current_street].append({"name": name, "action": action, "amount": int(amount)})
                 continue
 
-            winner_match = winner_pattern.search(line)
+            winner_match = WINNER_PATTERN.search(line)
 
             if winner_match:
                 winner_list_str = winner_match.group(1)  # e.g. "['Bot1', 'Bot2']"
-                stack_info = eval(winner_match.group(3))
+                stack_info = parse_stack_dict(winner_match.group(3))
                 current_round["stacks"] = stack_info
-                
+
                 # Parse winner list
                 try:
-                    winner_list = eval(winner_list_str)
-                    if isinstance(winner_list, list) and len(winner_list) > 0:
+                    winner_list = parse_name_list(winner_list_str)
+                    if len(winner_list) > 0:
                         if len(winner_list) == 1:
                             current_round["winner"] = winner_list[0]
                         else:
                             # Multiple winners (tie) - store as comma-separated string
                             current_round["winner"] = ", ".join(winner_list)
                             current_round["winners_list"] = winner_list  # Also store as list
-                except:
+                except ValueError:
                     pass
                 continue
 
     if current_round:
-        rounds.append(current_round)
-
-    return {"rounds": rounds} , None
+        yield current_round
 
 
-def play_match(bot_paths, bots):
+def parse_poker_output_to_json(content):
+    # Accept a whole log string as before, or any line iterator / file object
+    lines = io.StringIO(content) if isinstance(content, str) else content
+    try:
+        return {"rounds": list(iter_poker_rounds(lines))}, None
+    except InvalidAmountError as e:
+        return "Invalid amount" , {e.amount , e.action , e.name}
 
-    bot_instances = []
-    checks = []
-    for bot, path in zip(bots, bot_paths):
-        instance, chk = load_bot(path, bot.name)
-        bot_instances.append(instance)
-        checks.append(chk)
 
-    if not all(checks):
-        return bot_instances, None, None
+def play_match(bot_paths, bots):
+    return _play_and_process(bot_paths, bots, max_round=100000)
 
-    bot_wins = {bot.name: 0 for bot in bots}
-    rounds_data = []
-    previous_stack = {bot.name: 10000 for bot in bots}
 
-    config = setup_config(max_round=100000, initial_stack=10000, small_blind_amount=250)
-    for bot, instance in zip(bots, bot_instances):
-        config.register_player(name=bot.name, algorithm=instance)
+def _play_and_process(bot_paths, bots, max_round):
+    # Seated like tournament matches: uploaded bots play from bot hosts,
+    # every bot under the watchdog with budgets scaled to max_round
+    from .tournament_runner import MAX_ROUND, close_players, load_players, register_players
 
-    output_file = "poker_output.txt"
+    bots_info = [{'name': bot.name, 'path': path} for bot, path in zip(bots, bot_paths)]
+    seed = random.getrandbits(32)
+    bot_instances, errors = load_players(bots_info, seed)
+    if errors:
+        return errors, None, None
 
-    result, success = redirect_stdout_to_file(config, output_file)
+    config = setup_config(max_round=max_round, initial_stack=10000, small_blind_amount=250)
+    register_players(config, bots_info, bot_instances, seed, max(1, max_round / MAX_ROUND))
 
-    # Read and parse the output file
-    replay_data,error= read_output_file_and_parse(output_file)
+    # Record rounds as structured events while the game runs
+    try:
+        result, replay_data, success = run_recorded_match(config)
+    finally:
+        close_players(bot_instances)
 
-    if replay_data == "Invalid amount":
-        
-        return f"Invalid Action({error[0]}) with Amount({error[1]}) check ur code player {str(error[2])}",None
     # Break down the replay data into individual rounds
-
-    for round_num in range(len(replay_data["rounds"])):
-        round_data = replay_data["rounds"][round_num] if round_num < len(replay_data["rounds"]) else {}
-
-        if not round_data:
-            continue  # Skip if no data for the current round
-
-        # Initialize structures
-        actions = {street: {"name": [], "action": [], "amount": []} for street in ['preflop', 'flop', 'turn', 'river']}
-
-        communitycards = {street: [] for street in ['preflop', 'flop', 'turn', 'river']}
-        streets = []  # Will store the streets that actually happened
-
-        # Process each street
-        for street in ['preflop', 'flop', 'turn', 'river']:
-            street_actions = round_data.get("actions", {}).get(street, [])
-            if street_actions:  # If actions exist for the street
-                streets.append(street)
-                actions[street]['name'] = [action['name'] for action in street_actions]
-                actions[street]['action'] = [action['action'] for action in street_actions]
-                actions[street]['amount'] = [action['amount'] for action in street_actions]
-
-                # Update community cards
-            if street != 'preflop':
-                communitycards[street] = round_data.get("community_cards", {}).get(street, [])
-
-        # Assemble round data in the desired format
-
-        # Accessing the round result
-        winner = round_data.get("winner")
-        stacks = round_data.get("stacks", {})
-
-        # Determine active players for the round
-        active_players = set()
-
-        # Extract players from actions
-        for street, a in replay_data["rounds"][round_num]["actions"].items():
-            for action in a:
-                active_players.add(action["name"])
-        # Extract the round winner (if not already included)
-        winner = replay_data["rounds"][round_num]["winner"]
-        if winner and winner != "No one":
-            # Handle multiple winners (tie scenario)
-            if ", " in str(winner):
-                for winner_name in winner.split(", "):
-                    active_players.add(winner_name.strip())
-            else:
-                active_players.add(winner)
-
-        hole_cards = []
-        for i, bot in enumerate(bots):
-            if str(bot.name) in active_players:
-                hole_cards.append(bot_instances[i].hole_cards_log[round_num])
-
-        if winner is None or stacks == {}:  # No winner info provided
-            rounds_data.append({
-                'hole_cards':hole_cards,
-                'street': streets,
-                'actions': actions,
-                'communitycards': communitycards,
-                'chips_exchanged': 0,
-                'total_chips_exchanged': 0,
-                'winner': "No one"
-            })
-        else:
-            stacks_array = {name: value for name, value in stacks.items()}
-            chips_exchanged = 0
-            for bot in bots:
-                if bot.name in active_players:
-                    chips_exchanged += abs(stacks_array[bot.name] - previous_stack[bot.name])
-            chips_exchanged/=2
-            previous_stack = stacks_array
-
-            # if winner in bot_wins:
-            #     bot_wins[winner] += 1
-
-            rounds_data.append({
-                'hole_cards': hole_cards,
-                'street': streets,
-                'actions': actions,
-                'communitycards': communitycards,
-                'chips_exchanged': chips_exchanged,
-                'winner': winner,
-                'stacks': stacks_array
-            })
+    processor = RoundProcessor(
+        [bot.name for bot in bots],
+        [instance.hole_cards_log for instance in bot_instances],
+        initial_stack=10000
+    )
+    rounds_data = list(processor.iter_rounds(replay_data["rounds"]))
 
     # Determine match winner - player with most chips at end
-    if previous_stack:
-        match_winner = max(previous_stack, key=previous_stack.get, default="No one")
-    else:
-        match_winner = "No one"
-
-    # Update bot statistics
-    # update_bot_stats(
-    #     bots, match_winner, 
-    #     abs(result["players"][0]["stack"] - result["rule"]["initial_stack"]),
-    #     bot_wins, num_rounds
-    # )
+    match_winner = processor.match_winner()
 
     return match_winner,rounds_data
 
 
+def get_engine():
+    """
+    start_poker of the engine selected by settings.POKER_ENGINE: 'fast'
+    (poker/engine.py) or 'pypokerengine'. Outside Django, the fast engine.
+    """
+    from django.conf import settings
+    name = 'fast'
+    if settings.configured or os.environ.get('DJANGO_SETTINGS_MODULE'):
+        name = getattr(settings, 'POKER_ENGINE', name)
+    return start_poker if name == 'pypokerengine' else engine.start_poker
+
+
+def run_recorded_match(config):
+    """
+    Run the game with a MatchRecorder wrapped around the first seat.
+    Returns (result, replay_data, success); replay_data has the same shape as
+    parse_poker_output_to_json output and holds whatever was played before
+    an error. No stdout redirection is involved, so this is thread-safe.
+    """
+    recorder = MatchRecorder(config.players_info[0]["algorithm"])
+    config.players_info[0]["algorithm"] = recorder
+    try:
+        result = get_engine()(config, verbose=0)
+        return result, recorder.replay_data(), True
+    except Exception as e:
+        return str(e), recorder.replay_data(), False
+
+
 def redirect_stdout_to_file(config, output_file):
     with open(output_file, "w") as file:
         original_stdout = sys.stdout
@@ -259,8 +301,13 @@ def read_output_from_memory(output_content):
 
 def read_output_file_and_parse(input_file):
     with open(input_file, "r") as file:
-        content = file.read()
-    return parse_poker_output_to_json(content)
+        return parse_poker_output_to_json(file)
+
+
+def iter_output_file_rounds(input_file):
+    """Stream rounds from a log file one at a time without loading it whole."""
+    with open(input_file, "r") as file:
+        yield from iter_poker_rounds(file)
 
 
 # def update_bot_stats(bots, winner_name, chips_exchanged, bot_wins, num_rounds):
@@ -278,133 +325,4 @@ def read_output_file_and_parse(input_file):
 
 
 def play_test_match(bot_paths, bots):
-
-    bot_instances = []
-    checks = []
-    for bot, path in zip(bots, bot_paths):
-        instance, chk = load_bot(path, bot.name)
-        bot_instances.append(instance)
-        checks.append(chk)
-
-    if not all(checks):
-        return bot_instances, None, None
-
-    bot_wins = {bot.name: 0 for bot in bots}
-    rounds_data = []
-    previous_stack = {bot.name: 10000 for bot in bots}
-
-    config = setup_config(max_round=3, initial_stack=10000, small_blind_amount=250)
-    for bot, instance in zip(bots, bot_instances):
-        config.register_player(name=bot.name, algorithm=instance)
-
-    output_file = "poker_output.txt"
-
-    result, success = redirect_stdout_to_file(config, output_file)
-
-    # Read and parse the output file
-    replay_data,error= read_output_file_and_parse(output_file)
-
-    if replay_data == "Invalid amount":
-        
-        return f"Invalid Action({error[0]}) with Amount({error[1]}) check ur code player {str(error[2])}",None
-    # Break down the replay data into individual rounds
-
-    for round_num in range(len(replay_data["rounds"])):
-        round_data = replay_data["rounds"][round_num] if round_num < len(replay_data["rounds"]) else {}
-
-        if not round_data:
-            continue  # Skip if no data for the current round
-
-        # Initialize structures
-        actions = {street: {"name": [], "action": [], "amount": []} for street in ['preflop', 'flop', 'turn', 'river']}
-
-        communitycards = {street: [] for street in ['preflop', 'flop', 'turn', 'river']}
-        streets = []  # Will store the streets that actually happened
-
-        # Process each street
-        for street in ['preflop', 'flop', 'turn', 'river']:
-            street_actions = round_data.get("actions", {}).get(street, [])
-            if street_actions:  # If actions exist for the street
-                streets.append(street)
-                actions[street]['name'] = [action['name'] for action in street_actions]
-                actions[street]['action'] = [action['action'] for action in street_actions]
-                actions[street]['amount'] = [action['amount'] for action in street_actions]
-
-                # Update community cards
-            if street != 'preflop':
-                communitycards[street] = round_data.get("community_cards", {}).get(street, [])
-
-        # Assemble round data in the desired format
-
-        # Accessing the round result
-        winner = round_data.get("winner")
-        stacks = round_data.get("stacks", {})
-
-        # Determine active players for the round
-        active_players = set()
-
-        # Extract players from actions
-        for street, a in replay_data["rounds"][round_num]["actions"].items():
-            for action in a:
-                active_players.add(action["name"])
-        # Extract the round winner (if not already included)
-        winner = replay_data["rounds"][round_num]["winner"]
-        if winner and winner != "No one":
-            # Handle multiple winners (tie scenario)
-            if ", " in str(winner):
-                for winner_name in winner.split(", "):
-                    active_players.add(winner_name.strip())
-            else:
-                active_players.add(winner)
-
-        hole_cards = []
-        for i, bot in enumerate(bots):
-            if str(bot.name) in active_players:
-                hole_cards.append(bot_instances[i].hole_cards_log[round_num])
-
-        if winner is None or stacks == {}:  # No winner info provided
-            rounds_data.append({
-                'hole_cards':hole_cards,
-                'street': streets,
-                'actions': actions,
-                'communitycards': communitycards,
-                'chips_exchanged': 0,
-                'total_chips_exchanged': 0,
-                'winner': "No one"
-            })
-        else:
-            stacks_array = {name: value for name, value in stacks.items()}
-            chips_exchanged = 0
-            for bot in bots:
-                if bot.name in active_players:
-                    chips_exchanged += abs(stacks_array[bot.name] - previous_stack[bot.name])
-            chips_exchanged/=2
-            previous_stack = stacks_array
-
-            # if winner in bot_wins:
-            #     bot_wins[winner] += 1
-
-            rounds_data.append({
-                'hole_cards': hole_cards,
-                'street': streets,
-                'actions': actions,
-                'communitycards': communitycards,
-                'chips_exchanged': chips_exchanged,
-                'winner': winner,
-                'stacks': stacks_array
-            })
-
-    # Determine match winner - player with most chips at end
-    if previous_stack:
-        match_winner = max(previous_stack, key=previous_stack.get, default="No one")
-    else:
-        match_winner = "No one"
-
-    # Update bot statistics
-    # update_bot_stats(
-    #     bots, match_winner, 
-    #     abs(result["players"][0]["stack"] - result["rule"]["initial_stack"]),
-    #     bot_wins, num_rounds
-    # )
-
-    return match_winner,rounds_data
\ No newline at end of file
+    return _play_and_process(bot_paths, bots, max_round=3)
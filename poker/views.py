@@ -1,17 +1,17 @@
 import traceback
-import glob
-import os
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponseNotModified
 from django.contrib import messages
 from django.contrib.auth import get_user_model, logout, authenticate, login
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect ,get_object_or_404
-from django.db import transaction
+from django.core.paginator import Paginator
 from django.core.exceptions import ValidationError, PermissionDenied, ObjectDoesNotExist
+from django.db import transaction
 import re
-from .models import Bot, Match, TestBot, TestMatch
-from .utils import play_match,play_test_match
-from .tournament_runner import run_tournament
+from .models import Bot, Match, TestBot, TestMatch, TestRunJob
+from .utils import play_match
+from .jobs import submit_test_run
+from .leaderboard import get_leaderboard, invalidate_leaderboard
 
 User = get_user_model()
 
@@ -130,6 +130,7 @@ def upload_bot(request):
             wins=int(wins),
             total_games=int(total_games)
         )
+        transaction.on_commit(invalidate_leaderboard)
         
         messages.success(request, f"Bot '{bot_name}' uploaded successfully!")
     
@@ -141,7 +142,6 @@ def upload_bot(request):
     return redirect('deploy_bot')
 
 @login_required
-@transaction.atomic
 def test_run(request):
     try:
         user = request.user
@@ -166,156 +166,97 @@ def test_run(request):
             messages.error(request, f"Error saving bot file: {str(e)}")
             return redirect('/deploy_bot/')
 
-        # 1. Collect built-in bots
-        bot_files = glob.glob('bots/*.py')
-        builtin_opponents = []
-        test_bot_objects = {}
-
-        for file_path in bot_files:
-            filename = os.path.basename(file_path)
-            if filename in ['base.py', '__init__.py']:
-                continue
-            name = filename.replace('.py', '') 
-            try:
-                bot, _ = TestBot.objects.get_or_create(
-                    user=user,
-                    name=name,
-                    defaults={'file': file_path}
-                )
-                builtin_opponents.append({'name': name, 'path': file_path})
-                test_bot_objects[name] = bot
-            except Exception:
-                continue
-
-        # 2. Collect permanently uploaded bots from other users
-        permanent_opponents = []
-        permanent_bots = Bot.objects.exclude(user=user)
-        for p_bot in permanent_bots:
-            if os.path.exists(p_bot.path):
-                permanent_opponents.append({'name': p_bot.name, 'path': p_bot.path})
-        
-        try:
-            best_match, worst_match, metadata = run_tournament(new_test_bot, builtin_opponents, permanent_opponents, iterations=50)
-            
-            if not best_match or not worst_match:
-                 messages.error(request, "Error executing tournament")
-                 return redirect('/deploy_bot/')
-                 
-        except Exception as e:
-            messages.error(request, f"Error executing match: {str(e)}")
-            return redirect('/deploy_bot/')
+        # The tournament runs on a worker; the job page polls for its result
+        job = submit_test_run(user, new_test_bot, iterations=50)
+        return redirect('test_run_job', job_id=job.id)
 
-        def get_match_players(match_info):
-            players = [new_test_bot]
-            for opp_name in match_info['opponents']:
-                if opp_name in test_bot_objects:
-                    players.append(test_bot_objects[opp_name])
-            return players
+    except Exception as e:
+        messages.error(request, f"Unexpected error occurred: {str(e)}")
+        return redirect('/deploy_bot/')
 
-        try:
-            best_players = get_match_players(best_match)
-            best_test_match = TestMatch.objects.create(
-                winner=best_match['winner'],
-                rounds_data=best_match['rounds_data'],
-                player_order=[b.id for b in best_players]
-            )
-            best_test_match.players.set(best_players)
-            
-            worst_players = get_match_players(worst_match)
-            worst_test_match = TestMatch.objects.create(
-                winner=worst_match['winner'],
-                rounds_data=worst_match['rounds_data'],
-                player_order=[b.id for b in worst_players]
-            )
-            worst_test_match.players.set(worst_players)
 
-        except Exception as e:
-            messages.error(request, f"Error saving match results: {str(e)}")
-            return redirect('/deploy_bot/')
+@login_required
+def test_run_job(request, job_id):
+    job = get_object_or_404(TestRunJob, id=job_id, user=request.user)
 
-        # Prepare results
-        participant_stats = {}
-        for m in metadata:
-            all_players = [new_test_bot.name] + m['opponents']
-            for p_name in all_players:
-                if p_name not in participant_stats:
-                    participant_stats[p_name] = {'wins': 0, 'games': 0}
-                participant_stats[p_name]['games'] += 1
-                if m['winner'] == p_name:
-                    participant_stats[p_name]['wins'] += 1
-
-        # Update all involved bots (permanent and test)
-        from django.db.models import F
-        for p_name, stats in participant_stats.items():
-            # 1. Update permanent bots table (Leaderboard)
-            Bot.objects.filter(name=p_name).update(
-                wins=F('wins') + stats['wins'],
-                total_games=F('total_games') + stats['games']
-            )
-            # Recalculate win_rate for any permanent bot updated
-            for b in Bot.objects.filter(name=p_name):
-                if b.total_games > 0:
-                    b.win_rate = round((b.wins / b.total_games) * 100, 2)
-                    b.save(update_fields=['win_rate'])
-
-            # 2. Update all TestBot records with this name (across all users)
-            TestBot.objects.filter(name=p_name).update(
-                wins=F('wins') + stats['wins'],
-                total_games=F('total_games') + stats['games']
-            )
-            # Recalculate win_rate for test bots
-            for tb in TestBot.objects.filter(name=p_name):
-                if tb.total_games > 0:
-                    tb.win_rate = round((tb.wins / tb.total_games) * 100, 2)
-                    tb.save(update_fields=['win_rate'])
-
-        # Get final stats for the current new_test_bot specifically
-        new_test_bot.refresh_from_db()
-        
-        # Safe extraction of current bot's session stats
-        curr_stats = participant_stats.get(new_test_bot.name, {'wins': 0, 'games': 1})
-        wins = curr_stats['wins']
-        total_games = curr_stats['games']
-        win_rate = round((wins / total_games) * 100, 2) if total_games > 0 else 0
-        losses = total_games - wins
-
-        results = {
-            'best_match_id': best_test_match.id,
-            'worst_match_id': worst_test_match.id,
-            'opponents': [op['name'] for op in (builtin_opponents + permanent_opponents)],
-            'best_winner': best_match['winner'],
-            'best_user_stack': best_match['stack'],
-            'worst_winner': worst_match['winner'],
-            'worst_user_stack': worst_match['stack'],
-            'metadata': metadata,
-            'wins': wins,
-            'losses': losses,
-            'win_rate': win_rate,
-            'total_games': total_games
-        }
+    if job.status == TestRunJob.FAILED:
+        messages.error(request, job.error)
+        return redirect('/deploy_bot/')
 
+    if job.status == TestRunJob.DONE:
         return render(request, 'test_run_Response.html', {
-            'results': results,
-            'testbot': new_test_bot
+            'results': job.results,
+            'testbot': job.test_bot
         })
 
-    except Exception as e:
-        messages.error(request, f"Unexpected error occurred: {str(e)}")
-        return redirect('/deploy_bot/')
+    return render(request, 'test_run_pending.html', {'job': job})
+
+
+@login_required
+def test_run_status(request, job_id):
+    job = get_object_or_404(TestRunJob, id=job_id, user=request.user)
+    return JsonResponse({
+        'status': job.status,
+        'progress': job.progress,
+        'total': job.iterations,
+    })
     
 @login_required
 def test_replay(request, match_id):
     match = get_object_or_404(TestMatch, id=match_id)
     ordered_players = [TestBot.objects.get(id=bot_id).name for bot_id in match.player_order]
     
+    # Rounds are fetched page by page from test_replay_rounds
     return render(request, 'test_multigame.html', {
-        'rounds_data': match.rounds_data,
+        'total_rounds': match.rounds_total,
         'players': ordered_players,  # Correct order
         'match': match,
         'bot_id': match.bot1.id
     })
 
 
+REPLAY_PAGE_SIZE = 50
+REPLAY_MAX_PAGE_SIZE = 500
+
+
+def _rounds_range_response(request, model, match_id):
+    """
+    JSON page of a match's rounds: ?start=<first round index>&count=<n>.
+    The ETag names the row (id, played_at, number of rounds) and the page, so
+    a deleted match 404s and a reused id gets a different tag; repeated
+    fetches of the same page are answered with 304 without decoding it.
+    """
+    try:
+        start = max(0, int(request.GET.get('start', 0)))
+        count = int(request.GET.get('count', REPLAY_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'error': 'start and count must be integers'}, status=400)
+    count = min(max(count, 1), REPLAY_MAX_PAGE_SIZE)
+
+    match = get_object_or_404(model, id=match_id)
+    total = match.rounds_total
+    etag = f'"{model._meta.model_name}-{match_id}-{match.played_at.timestamp():.6f}-{total}-{start}-{count}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    response = JsonResponse({
+        'start': start,
+        'count': count,
+        'total': total,
+        'rounds': match.rounds_page(start, count) if start < total else [],
+    })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=86400'
+    return response
+
+
+@login_required
+def test_replay_rounds(request, match_id):
+    return _rounds_range_response(request, TestMatch, match_id)
+
+
 
 def test_match_results(request, match_id):
     try:
@@ -329,7 +270,7 @@ def test_match_results(request, match_id):
             return redirect('deploy_bot')  # Redirect to appropriate page
 
         # Validate match data integrity
-        if not all(hasattr(match, attr) for attr in ['winner', 'played_at', 'rounds_data']):
+        if not all(hasattr(match, attr) for attr in ['winner', 'played_at', 'rounds']):
             messages.error(request, "Invalid match data structure")
             return redirect('deploy_bot')
 
@@ -341,7 +282,7 @@ def test_match_results(request, match_id):
             return redirect('deploy_bot')
         
         # Validate rounds data format
-        if not isinstance(match.rounds_data, list):
+        if not isinstance(match.rounds, list):
             messages.error(request, "Invalid round data format")
             return redirect('deploy_bot')
 
@@ -352,7 +293,7 @@ def test_match_results(request, match_id):
                 'opponents': opponents,
                 'winner': match.winner,
                 'played_at': match.played_at,
-                'rounds_data': match.rounds_data,
+                'rounds_data': match.rounds,
             }]
         except KeyError as e:
             messages.error(request, f"Missing key in match data: {str(e)}")
@@ -412,7 +353,7 @@ def admin_panel(request):
         try:            
             match = Match.objects.create(
                 winner=winner_name,
-                rounds_data=rounds_data
+                rounds=rounds_data
             )
             match.players.add(*selected_bots)
         
@@ -437,21 +378,22 @@ def replay(request, match_id):
     
     match = get_object_or_404(Match,id=match_id)
     players = [bot.name for bot in match.players.all()]
+    # Rounds are fetched page by page from replay_rounds
     return render(request, 'multigame.html',{
-        'rounds_data': match.rounds_data,
+        'total_rounds': match.rounds_total,
         'players': players,
+        'match': match,
     })
 
+def replay_rounds(request, match_id):
+    if not request.user.is_staff and not request.user.is_superuser:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    return _rounds_range_response(request, Match, match_id)
+
+LEADERBOARD_PAGE_SIZE = 50
+
 def leaderboard(request):
-    bots = Bot.objects.all().order_by('-win_rate', '-wins')
-    data = []
-    for i, bot in enumerate(bots):
-        data.append({
-            'rank': i + 1,
-            'botName': bot.name,
-            'owner': bot.user.username,
-            'wins': bot.wins,
-            'earnings': bot.chips_won,
-            'win_rate': bot.win_rate
-        })
-    return render(request, 'leaderboard.html', {'data': data})
+    # Ranked rows come from the cached snapshot, not a query per request
+    paginator = Paginator(get_leaderboard(), LEADERBOARD_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('page'))
+    return render(request, 'leaderboard.html', {'data': page.object_list, 'page': page})
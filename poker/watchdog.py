@@ -0,0 +1,145 @@
+"""
+Time budgets for seated bots.
+
+TimedPlayer wraps one bot and bounds how long it may think:
+
+- per call (BOT_ACTION_TIMEOUT seconds of wall time): a SIGALRM timer
+  interrupts the bot. A declare_action that runs out is answered with a
+  fold; a notification handler that runs out is abandoned.
+- per match (BOT_MATCH_TIME_BUDGET seconds of wall time, BOT_MATCH_CPU_BUDGET
+  seconds of CPU time): once a bot has used up either, it is no longer
+  called and folds every remaining action.
+
+Each interrupted call and each call skipped for an exhausted budget counts as
+a timeout. The count per bot ends up in the match result.
+
+A bot is abandoned after its first interrupted call: it is not called again
+and folds every remaining action. Until the interrupted call returns, the
+timer keeps firing every REARM_INTERVAL seconds, so a bot that catches the
+timeout (bare `except:`) and carries on is interrupted again. A bot that
+catches it in a loop forever can still hang its match. Only trusted code
+should run inline; uploaded bots run in host processes
+(BOT_ISOLATION = 'hosts', see poker/bot_host.py), where the interrupt lands
+in the engine's pipe read and the host is killed.
+
+Signals can only be delivered to the main thread, so run_tournament always
+plays matches on a main thread (its own, or a pool worker's). Hosted bots
+are bounded on any thread: TimedPlayer hands the timeout to the RemotePlayer,
+which stops waiting for the host's reply. Elsewhere (in-process bots off the
+main thread, e.g. admin matches in a threaded server) calls cannot be
+interrupted: an overlong call is still counted as a timeout and a
+declare_action answer that came too late is replaced by a fold.
+"""
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from pypokerengine.players import BasePokerPlayer
+
+
+REARM_INTERVAL = 0.05
+
+
+class ActionTimeout(BaseException):
+    """
+    Raised inside a bot that overran its time. Not an Exception, so
+    `except Exception` in a bot does not catch it (a bare `except:` does).
+    """
+
+
+def limits():
+    """(action timeout, match wall budget, match CPU budget) in seconds; 0 = unlimited."""
+    return (
+        getattr(settings, 'BOT_ACTION_TIMEOUT', 1.0),
+        getattr(settings, 'BOT_MATCH_TIME_BUDGET', 60.0),
+        getattr(settings, 'BOT_MATCH_CPU_BUDGET', 30.0),
+    )
+
+
+@contextmanager
+def _alarm(seconds):
+    """
+    Raise ActionTimeout in this thread after `seconds`, and again every
+    REARM_INTERVAL until the block exits, if signals are usable here.
+    Yields a list whose first item becomes True once the timer has fired.
+    """
+    fired = [False]
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield fired
+        return
+
+    def raise_timeout(signum, frame):
+        fired[0] = True
+        raise ActionTimeout()
+
+    previous = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds, REARM_INTERVAL)
+    try:
+        yield fired
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class TimedPlayer(BasePokerPlayer):
+    def __init__(self, player, action_timeout=None, match_budget=None, cpu_budget=None):
+        default_action, default_match, default_cpu = limits()
+        self.player = player
+        self.action_timeout = default_action if action_timeout is None else action_timeout
+        self.match_budget = default_match if match_budget is None else match_budget
+        self.cpu_budget = default_cpu if cpu_budget is None else cpu_budget
+        self.wall_used = 0.0
+        self.cpu_used = 0.0
+        self.timeouts = 0
+        self.abandoned = False  # Interrupted once; never called again
+        # Bots in a host process (poker/bot_host.py) report their own CPU time
+        self.clock = getattr(player, 'process_time', time.process_time)
+
+    def out_of_time(self):
+        return ((self.match_budget and self.wall_used >= self.match_budget) or
+                (self.cpu_budget and self.cpu_used >= self.cpu_budget))
+
+    def _call(self, method, message):
+        """(timed_out, result) of method(message) under the budgets."""
+        if self.abandoned or self.out_of_time():
+            self.timeouts += 1
+            return True, None
+        # Never let a single call run past what is left of the match budget
+        timeout = self.action_timeout
+        if self.match_budget:
+            remaining = self.match_budget - self.wall_used
+            timeout = min(timeout, remaining) if timeout else remaining
+        if hasattr(self.player, 'reply_timeout'):
+            self.player.reply_timeout = timeout
+        started, cpu_started = time.perf_counter(), self.clock()
+        fired = [False]
+        try:
+            with _alarm(timeout) as fired:
+                result = method(message)
+        except ActionTimeout:
+            result, timed_out = None, True
+            self.abandoned = True
+        else:
+            timed_out = bool(timeout) and time.perf_counter() - started > timeout
+        if fired[0]:
+            # Even if the bot swallowed the interrupt and returned normally
+            self.abandoned = timed_out = True
+        self.wall_used += time.perf_counter() - started
+        self.cpu_used += self.clock() - cpu_started
+        if timed_out:
+            self.timeouts += 1
+        return timed_out, result
+
+    def set_uuid(self, uuid):
+        self.uuid = uuid
+        self.player.set_uuid(uuid)
+
+    def respond_to_ask(self, message):
+        timed_out, result = self._call(self.player.respond_to_ask, message)
+        if timed_out:
+            return 'fold', 0
+        return result
+
+    def receive_notification(self, message):
+        self._call(self.player.receive_notification, message)
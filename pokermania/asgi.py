@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pokermania.settings')
 
 application = get_asgi_application()
+
+# Test-run jobs (poker/jobs.py) run on a worker thread of the server process
+from poker.jobs import start_worker_on_startup
+
+start_worker_on_startup()
@@ -188,6 +188,58 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Tournament execution
+# 0 = one worker process per spare CPU core, 1 = run matches serially
+TOURNAMENT_WORKERS = config('TOURNAMENT_WORKERS', default=0, cast=int)
+# Fixed seed for reproducible test runs (opponents, decks, bot randomness);
+# unset = a fresh seed per run
+TOURNAMENT_SEED = config('TOURNAMENT_SEED', default=None, cast=lambda v: int(v) if v not in (None, '') else None)
+# Results of seeded matches kept for reuse by later tournaments (0 = off).
+# Only seeded matches repeat, so the cache is used only when TOURNAMENT_SEED
+# is set; with the default (unset) every match is played.
+MATCH_CACHE_SIZE = config('MATCH_CACHE_SIZE', default=500, cast=int)
+# Duplicate deals: play each test-run deal once per seat rotation, so every
+# bot gets every seat's cards (iterations x seats matches); the rotations of
+# a deal count as one game in the stats
+TOURNAMENT_DUPLICATE = config('TOURNAMENT_DUPLICATE', default=False, cast=bool)
+# Game engine for recorded matches: 'fast' (poker/engine.py) or
+# 'pypokerengine'; both play seeded games identically
+POKER_ENGINE = config('POKER_ENGINE', default='fast')
+
+# Bot time budgets in seconds (0 = unlimited): wall time per action, and
+# wall / CPU time per match after which a bot folds everything (poker/watchdog.py)
+BOT_ACTION_TIMEOUT = config('BOT_ACTION_TIMEOUT', default=1.0, cast=float)
+BOT_MATCH_TIME_BUDGET = config('BOT_MATCH_TIME_BUDGET', default=60.0, cast=float)
+BOT_MATCH_CPU_BUDGET = config('BOT_MATCH_CPU_BUDGET', default=30.0, cast=float)
+
+# Uploaded bots run in long-lived host processes ('hosts') instead of the
+# engine's process ('inline'); built-in bots always run inline
+BOT_ISOLATION = config('BOT_ISOLATION', default='hosts')
+BOT_HOST_MEMORY_MB = config('BOT_HOST_MEMORY_MB', default=512, cast=int)
+BOT_HOST_LIMIT = config('BOT_HOST_LIMIT', default=16, cast=int)
+# Account (name or uid) hosts run as; set it to a dedicated user without access
+# to .env, the database or other users' bots (needs the server to run as root).
+# Empty = same user as the server.
+BOT_HOST_USER = config('BOT_HOST_USER', default='')
+
+# Test runs are queued and executed by a worker: 'thread' runs one inside the
+# web process, 'external' expects `python manage.py run_test_jobs`.
+TEST_RUN_WORKER = config('TEST_RUN_WORKER', default='thread')
+# Running jobs older than this many seconds are failed as abandoned by a
+# worker that died mid-job (0 = never)
+TEST_RUN_STALE_AFTER = config('TEST_RUN_STALE_AFTER', default=1800, cast=int)
+# Test runs stop early once the 95% win-rate interval is within +/- this
+# margin (0 = always play every iteration), after at least TEST_RUN_MIN_MATCHES.
+# Matches needed grow with 1/margin^2: at 0.15 a bot winning 50% of its
+# matches stops after ~40, one winning 1 in 6 after ~25; at 0.1 they need
+# ~95 and ~55, more than the 50 iterations of a test run.
+TEST_RUN_WIN_RATE_MARGIN = config('TEST_RUN_WIN_RATE_MARGIN', default=0.15, cast=float)
+TEST_RUN_MIN_MATCHES = config('TEST_RUN_MIN_MATCHES', default=10, cast=int)
+
+# Leaderboard snapshot lifetime; stats writes also invalidate it directly.
+# Point CACHES at a shared backend (e.g. Redis) to share it between processes.
+LEADERBOARD_CACHE_SECONDS = config('LEADERBOARD_CACHE_SECONDS', default=60, cast=int)
+
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 LOGIN_URL = '/login/'
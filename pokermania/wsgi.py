@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pokermania.settings')
 
 application = get_wsgi_application()
+
+# Test-run jobs (poker/jobs.py) run on a worker thread of the server process
+from poker.jobs import start_worker_on_startup
+
+start_worker_on_startup()
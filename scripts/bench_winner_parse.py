@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: eval() vs the dedicated literal parser for the winner/stack
+fragments of "won the round" log lines.
+
+Usage:
+    python scripts/bench_winner_parse.py [captured_log.txt] [--rounds N]
+
+Without a log file, a match is played with the built-in bots and its verbose
+output captured to a temporary file first.
+"""
+import os
+import sys
+import random
+import tempfile
+import timeit
+
+# Ensure project root is on path
+sys.path.insert(0, os.getcwd())
+
+from poker.utils import WINNER_PATTERN, parse_name_list, parse_stack_dict
+
+
+def capture_log(path, rounds):
+    from pypokerengine.api.game import setup_config
+    from poker.utils import load_bot, redirect_stdout_to_file
+
+    names = ["aggressive_bot", "always_call_bot", "random_bot", "probability_based_bot", "observant_bot"]
+    random.seed(0)
+    config = setup_config(max_round=rounds, initial_stack=10000, small_blind_amount=250)
+    for name in names:
+        instance, chk = load_bot(f"bots/{name}.py", name)
+        if not chk:
+            sys.exit(f"Could not load {name}: {instance}")
+        config.register_player(name=name, algorithm=instance)
+    redirect_stdout_to_file(config, path)
+
+
+def main():
+    args = sys.argv[1:]
+    rounds = 2000
+    if "--rounds" in args:
+        idx = args.index("--rounds")
+        rounds = int(args[idx + 1])
+        del args[idx:idx + 2]
+
+    if args:
+        log_path = args[0]
+    else:
+        log_path = os.path.join(tempfile.gettempdir(), "bench_poker_output.txt")
+        print(f"Capturing a {rounds}-round match to {log_path} ...")
+        capture_log(log_path, rounds)
+
+    fragments = []
+    with open(log_path, "r") as file:
+        for line in file:
+            match = WINNER_PATTERN.search(line)
+            if match:
+                fragments.append((match.group(1), match.group(3)))
+
+    if not fragments:
+        sys.exit("No winner lines found in log")
+
+    def eval_path():
+        return [(eval(names), eval(stacks)) for names, stacks in fragments]
+
+    def literal_path():
+        return [(parse_name_list(names), parse_stack_dict(stacks)) for names, stacks in fragments]
+
+    if eval_path() != literal_path():
+        sys.exit("Mismatch between eval() and literal parser output")
+
+    repeat = 5
+    eval_time = min(timeit.repeat(eval_path, number=1, repeat=repeat))
+    literal_time = min(timeit.repeat(literal_path, number=1, repeat=repeat))
+
+    print(f"Winner lines: {len(fragments)}")
+    print(f"eval():         {eval_time * 1000:.1f} ms ({eval_time / len(fragments) * 1e6:.2f} us/line)")
+    print(f"literal parser: {literal_time * 1000:.1f} ms ({literal_time / len(fragments) * 1e6:.2f} us/line)")
+    print(f"Speed-up:       {eval_time / literal_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
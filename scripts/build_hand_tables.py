@@ -0,0 +1,36 @@
+"""
+Build bots/utils/hand_tables.bin (see bots/utils/lookup_evaluator.py for the layout).
+
+The tables are always computed from scratch with lookup_evaluator's
+builders, never copied from an existing file.
+
+Usage:
+    python scripts/build_hand_tables.py
+"""
+import os
+import sys
+import struct
+import time
+
+# Ensure project root is on path
+sys.path.insert(0, os.getcwd())
+
+from bots.utils import lookup_evaluator as lookup
+
+
+def main():
+    start = time.time()
+    flush = lookup.build_flush_table()
+    nonflush = lookup.build_nonflush_table()
+    keys = sorted(nonflush)
+
+    with open(lookup.TABLE_PATH, "wb") as file:
+        file.write(lookup.HEADER.pack(lookup.MAGIC, lookup.VERSION, len(flush), len(keys)))
+        file.write(struct.pack(f"<{len(flush)}I", *flush))
+        file.write(struct.pack(f"<{len(keys)}Q", *keys))
+        file.write(struct.pack(f"<{len(keys)}I", *[nonflush[key] for key in keys]))
+    print(f"Wrote {lookup.TABLE_PATH} ({time.time() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
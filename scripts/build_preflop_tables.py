@@ -0,0 +1,66 @@
+"""
+Build bots/utils/preflop_tables.bin (see bots/utils/preflop.py for the layout).
+
+Preflop equities are Monte Carlo estimates from bots.utils.equity (with the
+table shortcut off, so the old file is never read), one canonical combo per
+class, with a fixed seed so rebuilding is reproducible.
+
+Usage:
+    python scripts/build_preflop_tables.py [--samples N] [--max-opponents N]
+"""
+import os
+import sys
+import struct
+import time
+
+# Ensure project root is on path
+sys.path.insert(0, os.getcwd())
+
+from bots.utils import preflop
+from bots.utils.equity import estimate_equity
+
+
+def combo_classes():
+    table = bytearray([preflop.NO_CLASS]) * (52 * 52)
+    for a in range(52):
+        for b in range(52):
+            if a != b:
+                table[a * 52 + b] = preflop.class_index(a >> 2, b >> 2, (a & 3) == (b & 3))
+    return table
+
+
+def canonical_combo(key):
+    high, low = key[0], key[1]
+    if len(key) == 2 or key[2] == "o":
+        return ["S" + high, "H" + low]
+    return ["S" + high, "S" + low]
+
+
+def main():
+    args = sys.argv[1:]
+    samples = 20000
+    max_opponents = 9
+    if "--samples" in args:
+        samples = int(args[args.index("--samples") + 1])
+    if "--max-opponents" in args:
+        max_opponents = int(args[args.index("--max-opponents") + 1])
+
+    start = time.time()
+    equities = []
+    for index, key in enumerate(preflop.HAND_KEYS):
+        hole_card = canonical_combo(key)
+        for opponents in range(1, max_opponents + 1):
+            equities.append(estimate_equity(hole_card, [], opponents, samples=samples,
+                                            seed=index * 100 + opponents, use_tables=False))
+        if index % 13 == 12:
+            print(f"{index + 1}/{preflop.NUM_CLASSES} classes ({time.time() - start:.0f}s)")
+
+    with open(preflop.TABLE_PATH, "wb") as file:
+        file.write(preflop.HEADER.pack(preflop.MAGIC, preflop.VERSION, preflop.NUM_CLASSES, max_opponents))
+        file.write(combo_classes())
+        file.write(struct.pack(f"<{len(equities)}f", *equities))
+    print(f"Wrote {preflop.TABLE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Parity check for the fast engine (poker/engine.py) against PyPokerEngine.
+
+Plays the same seeded games on both engines, with random tables of the
+built-in bots plus a "chaos" bot that sends illegal, short, all-in and
+oversized actions, and requires identical:
+
+1. start_poker results (final stacks, states, uuids),
+2. every message each seat received and every action it answered,
+3. MatchRecorder replays.
+
+A few configurations with short stacks, antes and blind levels exercise
+eliminations, side pots and blind skipping. Prints per-engine timings
+(which include the transcript recording).
+
+Usage:
+    python scripts/check_engine_parity.py [--games N] [--seed S]
+"""
+import os
+import sys
+import hashlib
+import contextlib
+import io
+import random
+import argparse
+import time
+
+# Ensure project root is on path
+sys.path.insert(0, os.getcwd())
+
+from pypokerengine.api.game import setup_config, start_poker
+from pypokerengine.players import BasePokerPlayer
+from poker import engine
+from poker.recorder import MatchRecorder
+from poker.rng import PrivateRandomPlayer, bot_seed
+from poker.utils import load_bot, load_bot_class
+
+SKIP_FILES = ('__init__.py', 'base.py')
+
+# (max_round, initial_stack, small_blind, ante, blind_structure)
+CONFIGS = [
+    (10, 10000, 250, 0, {}),
+    (60, 1500, 50, 0, {}),
+    (60, 800, 25, 10, {}),
+    (80, 1000, 10, 0, {5: {'ante': 5, 'small_blind': 40}, 20: {'ante': 20, 'small_blind': 120}}),
+]
+
+
+class ChaosBot(BasePokerPlayer):
+    """Random legal and illegal actions, to exercise action correction."""
+
+    def __init__(self, bot_name=None):
+        self.bot_name = bot_name
+
+    def declare_action(self, valid_actions, hole_card, round_state):
+        call = valid_actions[1]['amount']
+        low, high = valid_actions[2]['amount']['min'], valid_actions[2]['amount']['max']
+        choice = random.random()
+        if choice < 0.15:
+            return 'fold', 0
+        if choice < 0.45:
+            return 'call', call
+        if choice < 0.5:
+            # Wrong amount. (Both engines loop forever on a call above the
+            # call amount that puts the caller all-in, so none is sent.)
+            return 'call', call - 1
+        if choice < 0.65:
+            return 'raise', high  # All-in (or -1)
+        if choice < 0.7:
+            return 'raise', max(low - 1, 0)  # Below the minimum
+        if choice < 0.75:
+            return 'raise', high + 1  # More than the stack
+        if choice < 0.8:
+            return 'raise', float(low)
+        if low > 0:
+            return 'raise', random.randint(low, high)
+        return 'call', call
+
+    def receive_game_start_message(self, game_info):
+        pass
+
+    def receive_round_start_message(self, round_count, hole_card, seats):
+        pass
+
+    def receive_street_start_message(self, street, round_state):
+        pass
+
+    def receive_game_update_message(self, action, round_state):
+        pass
+
+    def receive_round_result_message(self, winners, hand_info, round_state):
+        pass
+
+
+class Transcript(BasePokerPlayer):
+    """
+    Records a digest of every message a seat gets and every action it sends,
+    and the full text of entry `keep` (to show a known difference).
+    """
+
+    def __init__(self, player, log, keep=None):
+        self.player = player
+        self.log = log
+        self.keep = keep
+        self.kept = None
+
+    def record(self, kind, data):
+        text = f"{kind} {data!r}"
+        if len(self.log) == self.keep:
+            self.kept = text
+        self.log.append(hashlib.sha1(text.encode()).digest())
+
+    def set_uuid(self, uuid):
+        self.uuid = uuid
+        self.record('uuid', uuid)
+        self.player.set_uuid(uuid)
+
+    def respond_to_ask(self, message):
+        self.record('ask', message)
+        action = self.player.respond_to_ask(message)
+        self.record('action', action)
+        return action
+
+    def receive_notification(self, message):
+        self.record('note', message)
+        self.player.receive_notification(message)
+
+
+def builtin_bots():
+    bots_dir = os.path.join(os.getcwd(), 'bots')
+    bots = []
+    for filename in sorted(os.listdir(bots_dir)):
+        if filename.endswith('.py') and filename not in SKIP_FILES:
+            path = os.path.join(bots_dir, filename)
+            if load_bot_class(path)[1]:
+                bots.append((filename[:-len('.py')], path))
+    return bots
+
+
+def play(start, seed, table, game_config, keep=None):
+    max_round, initial_stack, small_blind, ante, blind_structure = game_config
+    random.seed(seed)
+    config = setup_config(max_round=max_round, initial_stack=initial_stack,
+                          small_blind_amount=small_blind, ante=ante)
+    config.set_blind_structure(blind_structure)
+    logs = []
+    transcripts = []
+    for name, path in table:
+        if path is None:
+            instance = ChaosBot(bot_name=name)
+        else:
+            instance, ok = load_bot(path, name)
+            assert ok, instance
+        log = []
+        logs.append(log)
+        transcripts.append(Transcript(PrivateRandomPlayer(instance, bot_seed(seed, name)), log, keep))
+        config.register_player(name=name, algorithm=transcripts[-1])
+    recorder = MatchRecorder(config.players_info[0]['algorithm'])
+    config.players_info[0]['algorithm'] = recorder
+    started = time.perf_counter()
+    try:
+        # PyPokerEngine prints blind level changes even with verbose=0
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = start(config, verbose=0)
+    except Exception as e:
+        result = ('error', type(e).__name__, str(e))
+    elapsed = time.perf_counter() - started
+    if keep is not None:
+        return [transcript.kept for transcript in transcripts]
+    return result, logs, recorder.replay_data(), elapsed
+
+
+def first_difference(a, b):
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    bots = builtin_bots()
+    rng = random.Random(args.seed)
+    timings = {'pypokerengine': 0.0, 'fast': 0.0}
+    failures = 0
+    rounds = 0
+    for game in range(args.games):
+        game_config = CONFIGS[game % len(CONFIGS)]
+        table = rng.sample(bots, rng.randint(1, min(7, len(bots))))
+        for i in range(rng.randint(0, 2)):
+            table.insert(rng.randrange(len(table) + 1), (f'chaos_{i}', None))
+        if len(table) < 2:
+            table.append(('chaos_x', None))
+        seed = rng.randrange(2 ** 32)
+
+        reference, reference_logs, reference_replay, elapsed = play(start_poker, seed, table, game_config)
+        timings['pypokerengine'] += elapsed
+        result, logs, replay, elapsed = play(engine.start_poker, seed, table, game_config)
+        timings['fast'] += elapsed
+        rounds += len(reference_replay['rounds'])
+
+        problem = None
+        if result != reference:
+            problem = f"result {result} != {reference}"
+        elif replay != reference_replay:
+            problem = "replay differs"
+        else:
+            for seat, (log, reference_log) in enumerate(zip(logs, reference_logs)):
+                if log != reference_log:
+                    # Replay both games to show the first differing entry
+                    index = first_difference(log, reference_log)
+                    expected = play(start_poker, seed, table, game_config, keep=index)[seat]
+                    got = play(engine.start_poker, seed, table, game_config, keep=index)[seat]
+                    problem = f"{table[seat][0]} entry {index}:\n  fast: {got}\n  pypokerengine: {expected}"
+                    break
+        if problem:
+            failures += 1
+            print(f"MISMATCH game {game} seed {seed} config {game_config[:4]} "
+                  f"table {[name for name, _ in table]}: {problem}")
+
+    print(f"{args.games} games, {rounds} rounds, {failures} mismatches")
+    for name, seconds in timings.items():
+        print(f"  {name:14s} {seconds:8.2f}s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Correctness check for the lookup-table hand evaluator.
+
+1. Every one of the 2,598,960 five-card hands: HandEvaluator.evaluate_hole_cards
+   (lookup tables) must equal evaluate_hole_cards_reference (combination
+   loop), and the lookup evaluator must produce the textbook category counts
+   and 7462 distinct hand values.
+2. Random 6- and 7-card hands, partly drawn from flush/straight-heavy decks:
+   same comparison against the reference, and evaluate(cards) must equal the
+   best evaluate() over its 5-card subsets.
+
+Usage:
+    python scripts/check_hand_evaluator.py [--samples N] [--seed S] [--skip-five]
+"""
+import os
+import sys
+import random
+import time
+from itertools import combinations
+from collections import Counter
+
+# Ensure project root is on path
+sys.path.insert(0, os.getcwd())
+
+from bots.utils import lookup_evaluator as lookup
+from bots.utils.hand_evaluator import HandEvaluator
+
+FIVE_CARD_COUNTS = {
+    lookup.STRAIGHT_FLUSH: 40,
+    lookup.FOUR_OF_A_KIND: 624,
+    lookup.FULL_HOUSE: 3744,
+    lookup.FLUSH: 5108,
+    lookup.STRAIGHT: 10200,
+    lookup.THREE_OF_A_KIND: 54912,
+    lookup.TWO_PAIR: 123552,
+    lookup.ONE_PAIR: 1098240,
+    lookup.HIGH_CARD: 1302540,
+}
+
+
+def check_five():
+    names = [lookup.INT_TO_CARD[card] for card in range(52)]
+    categories = Counter()
+    values = set()
+    mismatches = 0
+    for hand in combinations(range(52), 5):
+        value = lookup.evaluate(hand)
+        categories[lookup.category(value)] += 1
+        values.add(value)
+        cards = [names[card] for card in hand]
+        fast = HandEvaluator.evaluate_hole_cards(cards[:2], cards[2:])
+        slow = HandEvaluator.evaluate_hole_cards_reference(cards[:2], cards[2:])
+        if fast != slow:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  mismatch {cards}: {fast} != {slow}")
+    ok = mismatches == 0
+    if dict(categories) != FIVE_CARD_COUNTS:
+        print(f"  category counts differ: {dict(categories)}")
+        ok = False
+    if len(values) != 7462:
+        print(f"  {len(values)} distinct hand values, expected 7462")
+        ok = False
+    return ok
+
+
+def sample_deck(rng):
+    # Mix in decks that make flushes, straight flushes and wheels common
+    kind = rng.randrange(3)
+    if kind == 0:
+        return range(52)
+    if kind == 1:
+        suits = rng.sample(range(4), 2)
+        return [card for card in range(52) if card & 3 in suits]
+    ranks = (12, 0, 1, 2, 3, 4, 8, 9, 10, 11)  # A-6 and T-K
+    return [card for card in range(52) if card >> 2 in ranks]
+
+
+def check_sampled(size, samples, rng):
+    names = [lookup.INT_TO_CARD[card] for card in range(52)]
+    mismatches = 0
+    for _ in range(samples):
+        hand = rng.sample(sample_deck(rng), size)
+        best = max(lookup.evaluate(five) for five in combinations(hand, 5))
+        cards = [names[card] for card in hand]
+        fast = HandEvaluator.evaluate_hole_cards(cards[:2], cards[2:])
+        slow = HandEvaluator.evaluate_hole_cards_reference(cards[:2], cards[2:])
+        if lookup.evaluate(hand) != best or fast != slow:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  mismatch {cards}: {fast} != {slow}")
+    return mismatches == 0
+
+
+def main():
+    args = sys.argv[1:]
+    samples = 200000
+    seed = 0
+    if "--samples" in args:
+        samples = int(args[args.index("--samples") + 1])
+    if "--seed" in args:
+        seed = int(args[args.index("--seed") + 1])
+    rng = random.Random(seed)
+
+    ok = True
+    if "--skip-five" not in args:
+        start = time.time()
+        passed = check_five()
+        print(f"5-card exhaustive: {'ok' if passed else 'FAILED'} ({time.time() - start:.0f}s)")
+        ok = ok and passed
+    for size in (6, 7):
+        start = time.time()
+        passed = check_sampled(size, samples, rng)
+        print(f"{size}-card, {samples} samples: {'ok' if passed else 'FAILED'} ({time.time() - start:.0f}s)")
+        ok = ok and passed
+
+    # Speed comparison on random 7-card hands
+    hands = [rng.sample(range(52), 7) for _ in range(20000)]
+    hands = [[lookup.INT_TO_CARD[card] for card in hand] for hand in hands]
+    start = time.time()
+    for cards in hands:
+        HandEvaluator.evaluate_hole_cards_reference(cards[:2], cards[2:])
+    slow = time.time() - start
+    start = time.time()
+    for cards in hands:
+        HandEvaluator.evaluate_hole_cards(cards[:2], cards[2:])
+    fast = time.time() - start
+    print(f"7-card hands: reference {slow / len(hands) * 1e6:.1f} us, lookup {fast / len(hands) * 1e6:.1f} us ({slow / fast:.1f}x)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
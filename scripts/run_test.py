@@ -18,17 +18,6 @@ bot_files = [
 bots = [SimpleNamespace(name="Aggressive"), SimpleNamespace(name="Always_Call"), SimpleNamespace(name="Cautious_bot"), SimpleNamespace(name="Probability_based_bot"), SimpleNamespace(name="Random_bot")]
 bot_paths = [os.path.join(os.getcwd(), p) for p in bot_files]
 
-if os.path.exists("poker_output.txt"):
-    try:
-        os.remove("poker_output.txt")
-    except Exception:
-        pass
-
 result = play_test_match(bot_paths, bots)
 print("PLAY_TEST_MATCH RESULT:\n", result)
 
-if os.path.exists("poker_output.txt"):
-    with open("poker_output.txt", "r", encoding="utf-8", errors="ignore") as f:
-        content = f.read()
-    print("\n--- poker_output.txt (last 2000 chars) ---\n")
-    print(content[-2000:])